@@ -2,23 +2,75 @@
 API client for Equipment Status Tracker API operations
 """
 
-import requests
-import json
-from typing import Dict, Any, Optional
+from __future__ import annotations
+
+import re
+import time
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 from config.endpoints import get_config, ENDPOINTS, DEFAULT_HEADERS
+from api_client.json_codec import get_json_codec
+from api_client.json_stream import StreamedArray
+from api_client.metrics import MetricsRegistry, get_metrics_registry
+from api_client.rate_limiter import RateLimiter, get_rate_limiter
+from api_client.single_flight import SingleFlight
+from api_client.transports import create_session
+from api_client.models import (
+    Equipment,
+    HistoryEntry,
+    HistoryPage,
+    equipment_list_from_response,
+    status_update_from_response
+)
+from helpers.lazy_import import lazy_import
+from helpers.tracing import get_tracer
+
+# Imported when the first client is created, not when tests are collected
+requests = lazy_import("requests")
+
+# Collapse equipment IDs so metric label sets stay bounded
+EQUIPMENT_ID_SEGMENT = re.compile(r"^/api/equipment/[^/]+(?=/)")
 
 class EquipmentAPIClient:
     """Client for Equipment Status Tracker API operations"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None, metrics: Optional[MetricsRegistry] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
+        """
+        Args:
+            session: Existing session to reuse, e.g. a warm connection pool; by default one is
+                created for the configured transport
+            metrics: Registry to record request metrics in, the process-wide one by default
+            rate_limiter: Limiter pacing requests, the process-wide one (if configured) by default
+        """
         self.config = get_config()
         self.base_url = self.config["base_url"]
         self.timeout = self.config["timeout"]
-        self.session = requests.Session()
+        self.codec = get_json_codec(self.config["json_codec"])
+        self.session = session or create_session(self.config["transport"])
         self.session.headers.update(DEFAULT_HEADERS)
+        # Called with (response, decoded data) for every decoded response
+        self.observers: List[Callable[[requests.Response, Any], None]] = []
+        self.metrics = metrics or get_metrics_registry()
+        self._requests_total = self.metrics.counter(
+            "api_requests", "HTTP requests completed, by response status", ["method", "endpoint", "status"])
+        self._request_errors = self.metrics.counter(
+            "api_request_errors", "HTTP requests that failed without a response", ["method", "endpoint", "error"])
+        self._request_duration = self.metrics.histogram(
+            "api_request_duration_seconds", "Time until response headers were received", ["method", "endpoint"])
+        self._requests_in_flight = self.metrics.gauge(
+            "api_requests_in_flight", "HTTP requests awaiting a response", ["method", "endpoint"])
+        self._rate_limit_wait = self.metrics.counter(
+            "api_rate_limit_wait_seconds", "Time spent waiting for the rate limiter", ["method", "endpoint"])
+        self._coalesced_requests = self.metrics.counter(
+            "api_coalesced_requests", "GET requests answered by an identical request already in flight",
+            ["method", "endpoint"])
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.coalesce_gets = self.config["coalesce_gets"]
+        self._single_flight = SingleFlight()
     
     def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, 
-                     params: Optional[Dict] = None) -> requests.Response:
+                     params: Optional[Dict] = None, stream: bool = False,
+                     raw_body: Optional[bytes] = None) -> requests.Response:
         """
         Make HTTP request with error handling
         Args:
@@ -26,22 +78,139 @@ class EquipmentAPIClient:
             endpoint: API endpoint
             data: Request payload
             params: Query parameters
+            stream: Defer downloading the body until it is read
+            raw_body: Payload sent as is instead of encoding data, e.g. malformed JSON
         Returns:
-            Response object
+            Response object; concurrent identical GETs share one response, which callers
+            must treat as read-only
         """
         url = f"{self.base_url}{endpoint}"
+        # Encode with the client's codec; DEFAULT_HEADERS already set the JSON content type
+        body = raw_body if raw_body is not None else self.codec.dumps(data) if data is not None else None
+        labels = {"method": method, "endpoint": EQUIPMENT_ID_SEGMENT.sub("/api/equipment/{id}", endpoint)}
         
-        try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                json=data,
-                params=params,
-                timeout=self.timeout
-            )
+        if method == "GET" and not stream and self.coalesce_gets:
+            flight_key = (url, tuple(sorted((str(name), str(value)) for name, value in (params or {}).items())))
+            response, shared = self._single_flight.do(
+                flight_key, lambda: self._paced_send(method, url, body, params, stream, labels))
+            if shared:
+                self._coalesced_requests.inc(**labels)
             return response
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"API request failed: {str(e)}")
+        return self._paced_send(method, url, body, params, stream, labels)
+    
+    def _paced_send(self, method: str, url: str, body: Optional[bytes], params: Optional[Dict],
+                    stream: bool, labels: Dict[str, str]) -> requests.Response:
+        """
+        Send a request through the rate limiter if one is configured
+        Args:
+            method: HTTP method
+            url: Full URL
+            body: Encoded request payload
+            params: Query parameters
+            stream: Defer downloading the body until it is read
+            labels: Metric labels (method and endpoint with IDs collapsed)
+        Returns:
+            Response object; throttled (429) requests are retried up to retry_attempts
+            times before the last response is returned
+        """
+        if self.rate_limiter is None:
+            return self._send(method, url, body, params, stream, labels)
+        
+        key = f"{method} {labels['endpoint']}"
+        attempts = 1 + max(self.config["retry_attempts"], 0)
+        for attempt in range(attempts):
+            waited = self.rate_limiter.acquire(key)
+            if waited:
+                self._rate_limit_wait.inc(waited, **labels)
+            response = self._send(method, url, body, params, stream, labels)
+            throttled = self.rate_limiter.record_response(key, response.status_code, response.headers.get("Retry-After"))
+            if not throttled or attempt == attempts - 1:
+                return response
+            response.close()
+    
+    def _send(self, method: str, url: str, body: Optional[bytes], params: Optional[Dict],
+              stream: bool, labels: Dict[str, str]) -> requests.Response:
+        """
+        Send one HTTP request, recording metrics and a trace span
+        Args:
+            method: HTTP method
+            url: Full URL
+            body: Encoded request payload
+            params: Query parameters
+            stream: Defer downloading the body until it is read
+            labels: Metric labels (method and endpoint with IDs collapsed)
+        Returns:
+            Response object
+        """
+        self._requests_in_flight.inc(**labels)
+        started = time.perf_counter()
+        with get_tracer().span(f"{method} {labels['endpoint']}", "http",
+                               **{"http.method": method, "http.url": url}) as span:
+            try:
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    data=body,
+                    params=params,
+                    timeout=self.timeout,
+                    stream=stream
+                )
+            except requests.exceptions.RequestException as e:
+                self._request_errors.inc(error=type(e).__name__, **labels)
+                raise Exception(f"API request failed: {str(e)}")
+            finally:
+                self._requests_in_flight.dec(**labels)
+                self._request_duration.observe(time.perf_counter() - started, **labels)
+            span.set_attribute("http.status_code", response.status_code)
+        self._requests_total.inc(status=str(response.status_code), **labels)
+        return response
+    
+    def _decode(self, response: requests.Response) -> Any:
+        """
+        Decode a JSON response body with the client's codec
+        Args:
+            response: Response object
+        Returns:
+            Decoded JSON data
+        """
+        data = self.codec.loads(response.content)
+        for observer in self.observers:
+            observer(response, data)
+        return data
+    
+    def add_observer(self, observer: Callable[[requests.Response, Any], None]) -> None:
+        """
+        Register a callback for decoded responses
+        Args:
+            observer: Called with (response, decoded data); streamed lists are not observed
+        """
+        self.observers.append(observer)
+    
+    def attach_replica(self, path: str = ":memory:"):
+        """
+        Feed a local SQLite replica from this client's responses
+        Args:
+            path: SQLite database file; in-memory by default
+        Returns:
+            EquipmentReplica
+        """
+        from api_client.replica import EquipmentReplica
+        replica = EquipmentReplica(path)
+        self.add_observer(replica)
+        return replica
+    
+    def attach_expectations(self, strict: bool = False):
+        """
+        Check every response against the expected per-equipment state
+        Args:
+            strict: Raise on the first violation instead of collecting it
+        Returns:
+            ExpectedStateModel
+        """
+        from api_client.expectations import ExpectedStateModel
+        model = ExpectedStateModel(strict)
+        self.add_observer(model)
+        return model
     
     def add_equipment(self, equipment_data: Dict[str, str]) -> Dict[str, Any]:
         """
@@ -55,7 +224,7 @@ class EquipmentAPIClient:
         response = self._make_request("POST", endpoint, data=equipment_data)
         
         if response.status_code == 201:
-            return response.json()
+            return self._decode(response)
         else:
             raise Exception(f"Failed to add equipment. Status: {response.status_code}, Response: {response.text}")
     
@@ -71,7 +240,7 @@ class EquipmentAPIClient:
         response = self._make_request("POST", endpoint, data=equipment_data)
         
         if response.status_code == 201:
-            return response, response.json()
+            return response, self._decode(response)
         else:
             raise Exception(f"Failed to add equipment. Status: {response.status_code}, Response: {response.text}")
     
@@ -85,7 +254,7 @@ class EquipmentAPIClient:
         response = self._make_request("GET", endpoint)
         
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         else:
             raise Exception(f"Failed to get equipment. Status: {response.status_code}, Response: {response.text}")
     
@@ -99,10 +268,27 @@ class EquipmentAPIClient:
         response = self._make_request("GET", endpoint)
         
         if response.status_code == 200:
-            return response, response.json()
+            return response, self._decode(response)
         else:
             return response, {}
     
+    def iter_all_equipment(self, chunk_size: int = 65536) -> StreamedArray:
+        """
+        Stream all equipment without loading the whole response into memory
+        Args:
+            chunk_size: Bytes read from the socket at a time
+        Returns:
+            Iterable of equipment dictionaries; its envelope holds success and count
+            once iteration has finished
+        """
+        endpoint = ENDPOINTS["get_equipment"]
+        response = self._make_request("GET", endpoint, stream=True)
+        
+        if response.status_code == 200:
+            return StreamedArray(response.iter_content(chunk_size=chunk_size), "data", on_close=response.close)
+        else:
+            raise Exception(f"Failed to get equipment. Status: {response.status_code}, Response: {response.text}")
+    
     def update_equipment_status(self, equipment_id: str, status: str) -> Dict[str, Any]:
         """
         Update equipment status
@@ -117,7 +303,7 @@ class EquipmentAPIClient:
         response = self._make_request("POST", endpoint, data=data)
         
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         else:
             raise Exception(f"Failed to update status. Status: {response.status_code}, Response: {response.text}")
     
@@ -134,7 +320,7 @@ class EquipmentAPIClient:
         response = self._make_request("POST", endpoint, data=status_data)
         
         if response.status_code == 200:
-            return response, response.json()
+            return response, self._decode(response)
         else:
             return response, {}
     
@@ -150,7 +336,7 @@ class EquipmentAPIClient:
         response = self._make_request("GET", endpoint)
         
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         else:
             raise Exception(f"Failed to get history. Status: {response.status_code}, Response: {response.text}")
     
@@ -167,18 +353,71 @@ class EquipmentAPIClient:
         response = self._make_request("GET", endpoint, params=params)
         
         if response.status_code == 200:
-            return response, response.json()
+            return response, self._decode(response)
         else:
             return response, {}
     
     def health_check(self) -> bool:
         """
-        Check if API is accessible
+        Check if API is healthy with a cheap probe (one history entry of unknown equipment)
+        Returns:
+            True if the probe got the API's JSON answer (see api_client.health.probe)
+        """
+        from api_client.health import probe
+        return probe(self).healthy
+    
+    def add_equipment_model(self, equipment_data: Dict[str, str]) -> Equipment:
+        """
+        Add new equipment and return it as a validated model
+        Args:
+            equipment_data: Equipment data (name, status, location)
+        Returns:
+            Created Equipment
+        """
+        return Equipment.from_response(self.add_equipment(equipment_data))
+    
+    def get_all_equipment_models(self) -> List[Equipment]:
+        """
+        Get all equipment as validated models
+        Returns:
+            List of Equipment
+        """
+        return equipment_list_from_response(self.get_all_equipment())
+    
+    def iter_equipment_models(self, chunk_size: int = 65536) -> Iterator[Equipment]:
+        """
+        Stream all equipment as validated models, one record at a time
+        Args:
+            chunk_size: Bytes read from the socket at a time
+        Returns:
+            Iterator of Equipment
+        """
+        return (Equipment.from_dict(record) for record in self.iter_all_equipment(chunk_size))
+    
+    def update_equipment_status_models(self, equipment_id: str, status_data: Dict[str, Any]) -> Tuple[Equipment, HistoryEntry]:
+        """
+        Update equipment status and return the validated result
+        Args:
+            equipment_id: Equipment ID
+            status_data: Status update data (status, changedBy)
+        Returns:
+            Tuple of (updated Equipment, new HistoryEntry)
+        """
+        response, response_data = self.update_equipment_status_with_response(equipment_id, status_data)
+        if response.status_code != 200:
+            raise Exception(f"Failed to update status. Status: {response.status_code}, Response: {response.text}")
+        return status_update_from_response(response_data)
+    
+    def get_equipment_history_page(self, equipment_id: str, params: Optional[Dict] = None) -> HistoryPage:
+        """
+        Get one page of equipment status history as a validated model
+        Args:
+            equipment_id: Equipment ID
+            params: Query parameters (limit, offset)
         Returns:
-            True if API is accessible
+            HistoryPage
         """
-        try:
-            response = self._make_request("GET", "/api/equipment")
-            return response.status_code in [200, 404, 500]  # 404 is acceptable for empty list, 500 for server issues
-        except:
-            return False
+        response, response_data = self.get_equipment_history_with_response(equipment_id, params)
+        if response.status_code != 200:
+            raise Exception(f"Failed to get history. Status: {response.status_code}, Response: {response.text}")
+        return HistoryPage.from_response(response_data)
@@ -0,0 +1,200 @@
+"""
+Client-side expected state model for equipment status verification
+Every mutating call records the state it asked for, and each response and history page
+is checked against the expected state as it arrives, without any extra requests
+"""
+
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from api_client.models import parse_timestamp
+from api_client.replica import EQUIPMENT_PATH, HISTORY_PATH, STATUS_PATH
+from helpers.validations import ISO_TIMESTAMP_PATTERN
+
+# Sort key for entries without a usable timestamp
+EARLIEST = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _parse(timestamp: Any) -> Optional[datetime]:
+    """Parse an API timestamp; milliseconds are optional, so the strings do not sort reliably"""
+    if not isinstance(timestamp, str) or not ISO_TIMESTAMP_PATTERN.match(timestamp):
+        return None
+    return parse_timestamp(timestamp)
+
+
+class _ExpectedEquipment:
+    """What the suite expects of one equipment"""
+
+    __slots__ = ("status", "last_timestamp", "last_entry_id", "min_history_total")
+
+    def __init__(self):
+        self.status: Optional[str] = None
+        # Latest lastUpdated or history timestamp seen, as sent by the API
+        self.last_timestamp = ""
+        # Highest history entry ID seen; a gap after it means some other write happened
+        self.last_entry_id: Optional[int] = None
+        self.min_history_total = 0
+
+
+class ExpectedStateModel:
+    """Response observer that checks responses against the expected per-equipment state"""
+
+    def __init__(self, strict: bool = False):
+        """
+        Args:
+            strict: Raise on the first violation instead of collecting it
+        """
+        self.strict = strict
+        self.violations: List[str] = []
+        self._equipment: Dict[int, _ExpectedEquipment] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, response, response_data: Any) -> None:
+        """
+        Check a decoded response and advance the expected state
+        Args:
+            response: requests.Response
+            response_data: Decoded response body
+        """
+        if not isinstance(response_data, dict) or response_data.get("success") is not True:
+            return
+        data = response_data.get("data")
+        method = response.request.method
+        path = urlparse(response.url).path
+
+        with self._lock:
+            if EQUIPMENT_PATH.match(path):
+                if method == "POST" and response.status_code == 201 and isinstance(data, dict):
+                    self._observe_equipment(data, self._requested_status(response))
+                elif method == "GET" and response.status_code == 200 and isinstance(data, list):
+                    for record in data:
+                        if isinstance(record, dict):
+                            self._observe_equipment(record)
+            elif method == "POST" and response.status_code == 200 and STATUS_PATH.match(path):
+                if isinstance(data, dict):
+                    self._observe_status_update(data, self._requested_status(response))
+            elif method == "GET" and response.status_code == 200 and HISTORY_PATH.match(path):
+                if isinstance(data, dict):
+                    self._observe_history_page(data)
+
+    def _violation(self, message: str) -> None:
+        self.violations.append(message)
+        if self.strict:
+            raise AssertionError(message)
+
+    @staticmethod
+    def _requested_status(response) -> Optional[str]:
+        """The status the request asked for, taken from the sent payload"""
+        try:
+            payload = json.loads(response.request.body or b"{}")
+        except ValueError:
+            return None
+        return payload.get("status") if isinstance(payload, dict) else None
+
+    def _expected(self, equipment_id: Any) -> Optional[_ExpectedEquipment]:
+        if not isinstance(equipment_id, int):
+            return None
+        return self._equipment.setdefault(equipment_id, _ExpectedEquipment())
+
+    def _advance_timestamp(self, expected: _ExpectedEquipment, timestamp: Any, label: str, equipment_id: int) -> None:
+        parsed = _parse(timestamp)
+        if parsed is None:
+            return
+        latest = _parse(expected.last_timestamp)
+        if latest is not None and parsed < latest:
+            self._violation(f"Equipment {equipment_id} {label} {timestamp} is earlier than {expected.last_timestamp}")
+        else:
+            expected.last_timestamp = timestamp
+
+    @staticmethod
+    def _advance_entry_id(expected: _ExpectedEquipment, entry_id: Any) -> None:
+        if isinstance(entry_id, int) and not isinstance(entry_id, bool):
+            if expected.last_entry_id is None or entry_id > expected.last_entry_id:
+                expected.last_entry_id = entry_id
+
+    def _observe_equipment(self, record: Dict[str, Any], requested_status: Optional[str] = None) -> None:
+        """Equipment seen in an add or list response"""
+        expected = self._expected(record.get("id"))
+        if expected is None:
+            return
+        if requested_status is not None and record.get("status") != requested_status:
+            self._violation(f"Equipment {record['id']} was created as {requested_status}, "
+                            f"response has {record.get('status')}")
+        self._advance_timestamp(expected, record.get("lastUpdated"), "lastUpdated", record["id"])
+        # Other clients may change shared equipment; follow the server from here on
+        expected.status = record.get("status")
+
+    def _observe_status_update(self, data: Dict[str, Any], requested_status: Optional[str]) -> None:
+        """Response to POST /api/equipment/{id}/status"""
+        equipment = data.get("equipment") if isinstance(data.get("equipment"), dict) else {}
+        entry = data.get("historyEntry") if isinstance(data.get("historyEntry"), dict) else {}
+        equipment_id = equipment.get("id", entry.get("equipmentId"))
+        expected = self._expected(equipment_id)
+        if expected is None:
+            return
+
+        if requested_status is not None:
+            if equipment.get("status") != requested_status:
+                self._violation(f"Equipment {equipment_id} status should be {requested_status}, "
+                                f"got {equipment.get('status')}")
+            if entry.get("newStatus") != requested_status:
+                self._violation(f"Equipment {equipment_id} history newStatus should be {requested_status}, "
+                                f"got {entry.get('newStatus')}")
+        # Other clients (xdist workers, load scripts) may update the same equipment in between.
+        # Only an entry directly following the last one seen proves that no write intervened,
+        # so only then must it chain on the expected status; otherwise follow the server
+        entry_id = entry.get("id")
+        no_write_between = (expected.last_entry_id is not None and isinstance(entry_id, int)
+                            and entry_id == expected.last_entry_id + 1)
+        if no_write_between and expected.status is not None and entry.get("previousStatus") != expected.status:
+            self._violation(f"Equipment {equipment_id} history previousStatus should be {expected.status}, "
+                            f"got {entry.get('previousStatus')}")
+        self._advance_entry_id(expected, entry_id)
+
+        self._advance_timestamp(expected, entry.get("timestamp"), "history timestamp", equipment_id)
+        self._advance_timestamp(expected, equipment.get("lastUpdated"), "lastUpdated", equipment_id)
+        expected.status = equipment.get("status", requested_status)
+        if expected.min_history_total:
+            expected.min_history_total += 1
+
+    def _observe_history_page(self, data: Dict[str, Any]) -> None:
+        """Response to GET /api/equipment/{id}/history"""
+        equipment_id = data.get("equipmentId")
+        expected = self._expected(equipment_id)
+        if expected is None:
+            return
+
+        total = data.get("total")
+        if isinstance(total, int):
+            if total < expected.min_history_total:
+                self._violation(f"Equipment {equipment_id} history total should be at least "
+                                f"{expected.min_history_total}, got {total}")
+            expected.min_history_total = max(expected.min_history_total, total)
+
+        # A page is a contiguous slice of the history, so consecutive entries must chain
+        entries = [entry for entry in data.get("history") or [] if isinstance(entry, dict)]
+        entries.sort(key=lambda entry: (_parse(entry.get("timestamp")) or EARLIEST, entry.get("id") or 0))
+        for older, newer in zip(entries, entries[1:]):
+            if newer.get("previousStatus") != older.get("newStatus"):
+                self._violation(f"Equipment {equipment_id} history entry {newer.get('id')} previousStatus "
+                                f"{newer.get('previousStatus')} does not follow {older.get('newStatus')} "
+                                f"of entry {older.get('id')}")
+
+        # The newest entry beyond any seen so far carries the current status
+        newest = max(entries, key=lambda entry: entry.get("id") or 0, default=None)
+        if newest is not None and isinstance(newest.get("id"), int) and \
+                (expected.last_entry_id is None or newest["id"] > expected.last_entry_id):
+            expected.status = newest.get("newStatus")
+            self._advance_entry_id(expected, newest["id"])
+
+    def expected_status(self, equipment_id: int) -> Optional[str]:
+        """Status the suite expects the equipment to have, or None if unknown"""
+        expected = self._equipment.get(int(equipment_id))
+        return expected.status if expected else None
+
+    def assert_consistent(self) -> None:
+        """Fail with every violation collected so far"""
+        assert not self.violations, "State consistency violations:\n" + "\n".join(self.violations)
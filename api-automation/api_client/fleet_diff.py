@@ -0,0 +1,158 @@
+"""
+Incremental diffing of successive GET /api/equipment snapshots
+Keeps the last snapshot as id -> content hash so each new list is compared in one pass,
+and applies only the added, removed and changed rows to a local cache
+"""
+
+import time
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional
+
+# Fields that make up an equipment's content hash
+HASHED_FIELDS = ("name", "status", "location", "lastUpdated")
+_hashed_values = itemgetter(*HASHED_FIELDS)
+
+
+def content_hash(record: Dict[str, Any]) -> int:
+    """Hash the fields of an equipment record that can change"""
+    return hash(_hashed_values(record))
+
+
+class FleetDiff:
+    """Difference between two fleet snapshots"""
+
+    __slots__ = ("added", "removed", "changed", "_hashes")
+
+    def __init__(self, added: List[Dict[str, Any]], removed: List[int],
+                 changed: List[Dict[str, Any]], hashes: Dict[int, int]):
+        """
+        Args:
+            added: Records whose id was not in the previous snapshot
+            removed: Ids missing from the new snapshot
+            changed: Records whose content hash differs from the previous snapshot
+            hashes: Content hashes of the added and changed records
+        """
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self._hashes = hashes
+
+    @property
+    def churn(self) -> int:
+        """Number of rows that differ"""
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def __bool__(self) -> bool:
+        return self.churn > 0
+
+    def __repr__(self) -> str:
+        return f"FleetDiff(added={len(self.added)}, removed={len(self.removed)}, changed={len(self.changed)})"
+
+
+class FleetDiffer:
+    """Tracks the last fleet snapshot and diffs new ones against it"""
+
+    def __init__(self, records: Optional[Iterable[Dict[str, Any]]] = None):
+        """
+        Args:
+            records: Initial snapshot, e.g. response["data"]
+        """
+        self._hashes: Dict[int, int] = {}
+        # Local cache of the last snapshot, id -> record
+        self.records: Dict[int, Dict[str, Any]] = {}
+        if records is not None:
+            self.update(records)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def diff(self, records: Iterable[Dict[str, Any]]) -> FleetDiff:
+        """
+        Compare a new snapshot with the last one without changing state
+        Args:
+            records: New equipment records; a streamed iterator is consumed once
+        Returns:
+            FleetDiff
+        Raises:
+            ValueError: If the new snapshot repeats an id
+        """
+        previous = self._hashes
+        # Ids still unseen in the new snapshot; whatever is left at the end was removed
+        unseen = previous.copy()
+        added: List[Dict[str, Any]] = []
+        changed: List[Dict[str, Any]] = []
+        hashes: Dict[int, int] = {}
+
+        for record in records:
+            equipment_id = record["id"]
+            digest = hash(_hashed_values(record))
+            old_digest = unseen.pop(equipment_id, None)
+            if old_digest is None:
+                if equipment_id in previous or equipment_id in hashes:
+                    raise ValueError(f"Equipment id {equipment_id} appears more than once in the snapshot")
+                added.append(record)
+                hashes[equipment_id] = digest
+            elif old_digest != digest:
+                changed.append(record)
+                hashes[equipment_id] = digest
+
+        return FleetDiff(added, list(unseen), changed, hashes)
+
+    def apply(self, diff: FleetDiff) -> None:
+        """
+        Apply a diff to the tracked snapshot and the local cache
+        Args:
+            diff: Result of diff() against the current snapshot
+        """
+        for equipment_id in diff.removed:
+            del self._hashes[equipment_id]
+            del self.records[equipment_id]
+        self._hashes.update(diff._hashes)
+        for record in diff.added:
+            self.records[record["id"]] = record
+        for record in diff.changed:
+            self.records[record["id"]] = record
+
+    def update(self, records: Iterable[Dict[str, Any]]) -> FleetDiff:
+        """
+        Diff a new snapshot and apply it
+        Args:
+            records: New equipment records
+        Returns:
+            FleetDiff that was applied
+        """
+        diff = self.diff(records)
+        self.apply(diff)
+        return diff
+
+    def poll(self, client) -> FleetDiff:
+        """
+        Stream the current fleet through an EquipmentAPIClient and apply the changes
+        Args:
+            client: EquipmentAPIClient
+        Returns:
+            FleetDiff since the last snapshot
+        """
+        return self.update(client.iter_all_equipment())
+
+    def wait_for_change(self, client, timeout: float = 10.0, interval: float = 0.5) -> FleetDiff:
+        """
+        Poll until the fleet differs from the tracked snapshot, e.g. after a status update
+        Args:
+            client: EquipmentAPIClient
+            timeout: Seconds to keep polling
+            interval: Seconds between polls
+        Returns:
+            First non-empty FleetDiff, already applied
+        Raises:
+            TimeoutError: If nothing changed within the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            diff = self.poll(client)
+            if diff or time.monotonic() >= deadline:
+                break
+            time.sleep(interval)
+        if not diff:
+            raise TimeoutError(f"Fleet did not change within {timeout}s")
+        return diff
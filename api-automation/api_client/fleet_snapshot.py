@@ -0,0 +1,174 @@
+"""
+Columnar fleet snapshot for analytics over GET /api/equipment
+Stores ids, status codes, location codes and timestamps in contiguous NumPy arrays,
+with statuses and locations dictionary-encoded, so fleet-wide aggregations are vectorized
+"""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from api_client.models import EquipmentStatus, ModelValidationError
+from helpers.lazy_import import lazy_import
+
+# Optional dependency: pip install numpy
+np = lazy_import("numpy")
+
+STATUSES = [status.value for status in EquipmentStatus]
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+def _to_datetime64(value: datetime):
+    """Convert a datetime (naive values are taken as UTC) to numpy datetime64[ms]"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "ms")
+
+
+class FleetSnapshot:
+    """Column-oriented snapshot of the fleet"""
+
+    def __init__(self, ids, status_codes, location_codes, last_updated, locations: List[str]):
+        """
+        Args:
+            ids: int64 array of equipment ids
+            status_codes: uint8 array of indexes into STATUSES
+            location_codes: int32 array of indexes into locations
+            last_updated: datetime64[ms] array of lastUpdated values (UTC)
+            locations: Location dictionary
+        """
+        self.ids = ids
+        self.status_codes = status_codes
+        self.location_codes = location_codes
+        self.last_updated = last_updated
+        self.locations = locations
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "FleetSnapshot":
+        """
+        Build a snapshot from equipment dictionaries
+        Args:
+            records: Equipment records, e.g. response["data"] or client.iter_all_equipment()
+        Returns:
+            FleetSnapshot
+        Raises:
+            ModelValidationError: If a record has an unknown status
+        """
+        ids = array("q")
+        status_codes = array("B")
+        location_codes = array("i")
+        timestamps: List[str] = []
+        location_index: Dict[str, int] = {}
+
+        for record in records:
+            try:
+                status_code = _STATUS_CODES[record["status"]]
+            except KeyError:
+                raise ModelValidationError(f"Invalid status: {record['status']}")
+            ids.append(record["id"])
+            status_codes.append(status_code)
+            location_codes.append(location_index.setdefault(record["location"], len(location_index)))
+            # numpy parses ISO 8601 but not the trailing "Z"
+            timestamps.append(record["lastUpdated"].rstrip("Z"))
+
+        return cls(
+            np.frombuffer(ids, dtype=np.int64),
+            np.frombuffer(status_codes, dtype=np.uint8),
+            np.frombuffer(location_codes, dtype=np.int32),
+            np.array(timestamps, dtype="datetime64[ms]"),
+            list(location_index)
+        )
+
+    @classmethod
+    def from_response(cls, response_data: Dict[str, Any]) -> "FleetSnapshot":
+        """Build a snapshot from a decoded GET /api/equipment response"""
+        return cls.from_records(response_data["data"])
+
+    @classmethod
+    def from_client(cls, client) -> "FleetSnapshot":
+        """Build a snapshot by streaming GET /api/equipment through an EquipmentAPIClient"""
+        return cls.from_records(client.iter_all_equipment())
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def mask(self, status: Optional[str] = None, location: Optional[str] = None,
+             updated_before: Optional[datetime] = None, updated_after: Optional[datetime] = None):
+        """
+        Build a boolean row mask; all given criteria must match
+        Args:
+            status: Status value, e.g. "Idle"
+            location: Location name
+            updated_before: Keep rows with lastUpdated strictly before this time
+            updated_after: Keep rows with lastUpdated at or after this time
+        Returns:
+            numpy bool array with one entry per equipment
+        """
+        selected = np.ones(len(self.ids), dtype=bool)
+        if status is not None:
+            if status not in _STATUS_CODES:
+                raise ValueError(f"Unknown status '{status}', expected one of {STATUSES}")
+            selected &= self.status_codes == _STATUS_CODES[status]
+        if location is not None:
+            if location not in self.locations:
+                return np.zeros(len(self.ids), dtype=bool)
+            selected &= self.location_codes == self.locations.index(location)
+        if updated_before is not None:
+            selected &= self.last_updated < _to_datetime64(updated_before)
+        if updated_after is not None:
+            selected &= self.last_updated >= _to_datetime64(updated_after)
+        return selected
+
+    def filter(self, **criteria) -> "FleetSnapshot":
+        """
+        Select the rows matching mask() criteria
+        Returns:
+            New FleetSnapshot sharing this snapshot's location dictionary
+        """
+        selected = self.mask(**criteria)
+        return FleetSnapshot(self.ids[selected], self.status_codes[selected],
+                             self.location_codes[selected], self.last_updated[selected], self.locations)
+
+    def stale(self, older_than: timedelta, now: Optional[datetime] = None) -> "FleetSnapshot":
+        """
+        Select equipment whose lastUpdated is older than a cutoff
+        Args:
+            older_than: Maximum age
+            now: Reference time, defaults to the current UTC time
+        Returns:
+            FleetSnapshot of stale equipment
+        """
+        now = now or datetime.now(timezone.utc)
+        return self.filter(updated_before=now - older_than)
+
+    def status_counts(self) -> Dict[str, int]:
+        """Count equipment per status"""
+        counts = np.bincount(self.status_codes, minlength=len(STATUSES))
+        return {status: int(count) for status, count in zip(STATUSES, counts)}
+
+    def status_counts_by_location(self) -> Dict[str, Dict[str, int]]:
+        """
+        Count equipment per location and status
+        Returns:
+            Dictionary of location to {status: count}
+        """
+        combined = self.location_codes.astype(np.int64) * len(STATUSES) + self.status_codes
+        counts = np.bincount(combined, minlength=len(self.locations) * len(STATUSES))
+        counts = counts.reshape(len(self.locations), len(STATUSES))
+        present = np.flatnonzero(counts.sum(axis=1))
+        return {
+            self.locations[code]: {status: int(count) for status, count in zip(STATUSES, counts[code])}
+            for code in present
+        }
+
+    def oldest_update_by_location(self) -> Dict[str, datetime]:
+        """Find the oldest lastUpdated value per location"""
+        if not len(self.ids):
+            return {}
+        order = np.lexsort((self.last_updated, self.location_codes))
+        codes = self.location_codes[order]
+        first = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        return {
+            self.locations[codes[index]]: self.last_updated[order[index]].astype(datetime).replace(tzinfo=timezone.utc)
+            for index in first
+        }
@@ -0,0 +1,123 @@
+"""
+Cheap API health probe with a cross-process result cache
+The probe asks for one history entry of equipment that does not exist, which the API
+answers with a tiny 200 response (or, should it start rejecting unknown ids, a JSON 404
+error envelope); the verdict is cached with a TTL in a locked file so every xdist worker
+and suite subprocess of a run reuses one probe
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from config.endpoints import ENDPOINTS
+from helpers.constants import INVALID_EQUIPMENT_ID_FOR_HISTORY
+from helpers.file_lock import FileLock
+from helpers.lazy_import import lazy_import
+
+requests = lazy_import("requests")
+
+PROBE_ENDPOINT = ENDPOINTS["get_history"].format(id=INVALID_EQUIPMENT_ID_FOR_HISTORY)
+PROBE_PARAMS = {"limit": 1, "offset": 0}
+# A failed probe is trusted for at most this long, so a recovered backend is noticed quickly
+FAILURE_TTL_SECONDS = 10.0
+
+
+class HealthResult:
+    """Verdict of one health probe"""
+
+    __slots__ = ("healthy", "detail", "checked_at", "cached")
+
+    def __init__(self, healthy: bool, detail: str, checked_at: float, cached: bool = False):
+        self.healthy = healthy
+        self.detail = detail
+        self.checked_at = checked_at
+        self.cached = cached
+
+    def __bool__(self) -> bool:
+        return self.healthy
+
+    def __repr__(self) -> str:
+        source = "cached" if self.cached else "probed"
+        return f"HealthResult({'healthy' if self.healthy else 'unhealthy'}, {self.detail!r}, {source})"
+
+
+def probe(client, timeout: Optional[float] = None) -> HealthResult:
+    """
+    Probe the API once
+    PROBE_ENDPOINT names equipment that does not exist. The API currently answers it with a
+    200 and an empty history; a 404 with the API's JSON error envelope ({"success": false})
+    also proves the service is up, so the probe keeps working if unknown ids start being
+    rejected. Any other status, a non-JSON body or a 200 without success true is unhealthy.
+    Args:
+        client: EquipmentAPIClient
+        timeout: Seconds to wait, get_config()["health_timeout"] by default
+    Returns:
+        HealthResult
+    """
+    timeout = timeout or client.config["health_timeout"]
+    started = time.time()
+    try:
+        response = client.session.request("GET", f"{client.base_url}{PROBE_ENDPOINT}",
+                                          params=PROBE_PARAMS, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        return HealthResult(False, f"{type(e).__name__}: {e}", started)
+    if response.status_code not in (200, 404):
+        return HealthResult(False, f"HTTP {response.status_code}", started)
+    try:
+        success = client.codec.loads(response.content).get("success")
+    except (ValueError, AttributeError):
+        success = None
+    # 404 only counts when the API itself answered, not e.g. a proxy or a wrong base URL
+    healthy = success is True if response.status_code == 200 else success is False
+    detail = f"HTTP {response.status_code} in {response.elapsed.total_seconds() * 1000:.0f} ms"
+    if healthy:
+        return HealthResult(True, detail, started)
+    expected = "a successful JSON body" if response.status_code == 200 else "the API's JSON error body"
+    return HealthResult(False, f"{detail} without {expected}", started)
+
+
+def cached_health_check(client, cache_file: Optional[str] = None, ttl: Optional[float] = None) -> HealthResult:
+    """
+    Reuse a recent verdict for the client's base URL, probing only when it has expired
+    Args:
+        client: EquipmentAPIClient
+        cache_file: Cache shared by all processes, get_config()["health_cache_file"] by default
+        ttl: Seconds a healthy verdict is reused, get_config()["health_cache_ttl"] by default; 0 disables the cache
+    Returns:
+        HealthResult
+    """
+    cache_file = cache_file if cache_file is not None else client.config["health_cache_file"]
+    ttl = ttl if ttl is not None else client.config["health_cache_ttl"]
+    if not cache_file or ttl <= 0:
+        return probe(client)
+
+    # Workers starting together queue here; all but the first find a fresh verdict
+    with FileLock(f"{cache_file}.lock"):
+        cache = _load_cache(cache_file)
+        entry = cache.get(client.base_url)
+        if entry:
+            age = time.time() - entry["checked_at"]
+            if 0 <= age < (ttl if entry["healthy"] else min(ttl, FAILURE_TTL_SECONDS)):
+                return HealthResult(entry["healthy"], entry["detail"], entry["checked_at"], cached=True)
+
+        result = probe(client)
+        cache[client.base_url] = {"healthy": result.healthy, "detail": result.detail, "checked_at": result.checked_at}
+        _save_cache(cache_file, cache)
+        return result
+
+
+def _load_cache(path: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path: str, cache: Dict[str, Dict[str, Any]]) -> None:
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(cache, file)
+    os.replace(temporary, path)
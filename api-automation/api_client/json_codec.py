@@ -0,0 +1,71 @@
+"""
+Pluggable JSON codec for request encoding and response decoding
+Uses orjson when it is installed and falls back to the standard library json module
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from config.endpoints import get_config
+
+
+class StdlibJSONCodec:
+    """JSON codec backed by the standard library"""
+
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """JSON codec backed by orjson"""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, value: Any) -> bytes:
+        return self._orjson.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+CODECS = {
+    "json": StdlibJSONCodec,
+    "orjson": OrjsonCodec
+}
+# Preference order when the codec is "auto"
+AUTO_ORDER = ["orjson", "json"]
+
+_codecs: Dict[str, Any] = {}
+
+
+def get_json_codec(name: Optional[str] = None):
+    """
+    Get a JSON codec by name
+    Args:
+        name: "auto", "json" or "orjson"; defaults to get_config()["json_codec"]
+    Returns:
+        Codec instance with dumps() -> bytes and loads(bytes)
+    """
+    name = name or get_config()["json_codec"]
+    if name not in _codecs:
+        if name == "auto":
+            for candidate in AUTO_ORDER:
+                try:
+                    _codecs[name] = get_json_codec(candidate)
+                    break
+                except ImportError:
+                    continue
+        elif name in CODECS:
+            _codecs[name] = CODECS[name]()
+        else:
+            raise ValueError(f"Unknown JSON codec '{name}', expected auto or one of {', '.join(CODECS)}")
+    return _codecs[name]
@@ -0,0 +1,131 @@
+"""
+Incremental JSON parsing for large list responses
+Parses the items of one array inside a top-level JSON object as the bytes arrive,
+keeping only the current item and a small read buffer in memory
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+# Characters that can continue a number; raw_decode stops early at "1." or "1e" cut by a chunk edge
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*\Z")
+
+
+class _TextBuffer:
+    """Sliding window of decoded text over a stream of byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> None:
+        """Drop consumed text and append the next chunk"""
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.text += self._utf8.decode(chunk)
+                return
+        self.text += self._utf8.decode(b"", final=True)
+        self.eof = True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or "" at the end of the stream"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text) or self.eof:
+                return self.text[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, expected: str) -> str:
+        """Consume the next structural character, which must be one of `expected`"""
+        char = self.peek()
+        if not char or char not in expected:
+            found = repr(char) if char else "end of stream"
+            raise ValueError(f"Malformed JSON stream: expected one of {expected!r}, found {found}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A value followed only by number characters up to the buffer edge may be a number
+                # that continues in the next chunk
+                if self.eof or not _NUMBER_TAIL.match(self.text, end):
+                    self.pos = end
+                    return value
+            self.fill()
+
+
+class StreamedArray:
+    """Iterator over the items of one array in a streamed JSON object"""
+
+    def __init__(self, chunks: Iterable[bytes], array_key: str = "data",
+                 on_close: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            chunks: Raw body chunks, e.g. response.iter_content()
+            array_key: Top-level key of the array to stream
+            on_close: Called once parsing stops, e.g. to release the connection
+        """
+        self._chunks = chunks
+        self.array_key = array_key
+        self._on_close = on_close
+        # Other top-level fields; complete once iteration has finished
+        self.envelope: Dict[str, Any] = {}
+        self.array_found = False
+        self.items_read = 0
+        self.complete = False
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._parse()
+
+    def _parse(self) -> Iterator[Any]:
+        buffer = _TextBuffer(self._chunks)
+        try:
+            buffer.expect("{")
+            if buffer.peek() == "}":
+                buffer.pos += 1
+            else:
+                while True:
+                    key = buffer.value()
+                    if not isinstance(key, str):
+                        raise ValueError(f"Malformed JSON stream: object key {key!r} is not a string")
+                    buffer.expect(":")
+                    if key == self.array_key and buffer.peek() == "[":
+                        self.array_found = True
+                        yield from self._parse_array(buffer)
+                    else:
+                        self.envelope[key] = buffer.value()
+                    if buffer.expect(",}") == "}":
+                        break
+            self.complete = True
+        finally:
+            if self._on_close:
+                self._on_close()
+
+    def _parse_array(self, buffer: _TextBuffer) -> Iterator[Any]:
+        buffer.expect("[")
+        if buffer.peek() == "]":
+            buffer.pos += 1
+            return
+        while True:
+            yield buffer.value()
+            self.items_read += 1
+            if buffer.expect(",]") == "]":
+                return
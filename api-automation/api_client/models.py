@@ -0,0 +1,285 @@
+"""
+Compact typed models for Equipment Status Tracker API records
+Fields are validated once at construction, statuses are shared enum members and
+timestamps are kept as the raw string until first accessed
+"""
+
+import sys
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from helpers.validations import ISO_TIMESTAMP_PATTERN
+
+
+class EquipmentStatus(str, Enum):
+    """Equipment status values accepted by the API"""
+
+    ACTIVE = "Active"
+    IDLE = "Idle"
+    UNDER_MAINTENANCE = "Under Maintenance"
+
+
+_STATUSES = {status.value: status for status in EquipmentStatus}
+
+
+class ModelValidationError(AssertionError):
+    """Raised when an API record does not match its model"""
+
+
+def _field(record: Dict[str, Any], field: str, kind: type, model: str, optional: bool = False) -> Any:
+    """Fetch a field and check its type"""
+    if not isinstance(record, dict):
+        raise ModelValidationError(f"{model} should be an object, got {type(record).__name__}")
+    if field not in record:
+        raise ModelValidationError(f"{model} should have {field}")
+    value = record[field]
+    if value is None and optional:
+        return None
+    # bool is a subclass of int but never a valid id or count
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise ModelValidationError(f"{model} {field} should be {kind.__name__}, got {value!r}")
+    return value
+
+
+def _status(record: Dict[str, Any], field: str, model: str) -> EquipmentStatus:
+    value = _field(record, field, str, model)
+    try:
+        return _STATUSES[value]
+    except KeyError:
+        raise ModelValidationError(f"{model} {field} should be one of {list(_STATUSES)}, got {value!r}")
+
+
+def _timestamp(record: Dict[str, Any], field: str, model: str) -> str:
+    value = _field(record, field, str, model)
+    if not ISO_TIMESTAMP_PATTERN.match(value):
+        raise ModelValidationError(f"{model} {field} should be in ISO 8601 format, got: {value}")
+    return value
+
+
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parse an API timestamp such as 2025-06-01T08:30:15.123Z
+    Args:
+        value: ISO 8601 timestamp in UTC
+    Returns:
+        Timezone-aware datetime
+    """
+    # fromisoformat only accepts a trailing "Z" from Python 3.11
+    return datetime.fromisoformat(value[:-1] + "+00:00")
+
+
+def _unwrap(response_data: Dict[str, Any], model: str) -> Any:
+    """Check the success wrapper and return its data"""
+    if _field(response_data, "success", bool, "Response") is not True:
+        raise ModelValidationError(f"{model} response should have success true")
+    return _field(response_data, "data", object, "Response")
+
+
+class Equipment:
+    """Equipment record from the API"""
+
+    __slots__ = ("id", "name", "status", "location", "last_updated_raw", "_last_updated")
+
+    def __init__(self, id: int, name: str, status: EquipmentStatus, location: str, last_updated_raw: str):
+        self.id = id
+        self.name = name
+        self.status = status
+        # Fleets share a handful of locations; store one copy of each
+        self.location = sys.intern(location)
+        self.last_updated_raw = last_updated_raw
+        self._last_updated: Optional[datetime] = None
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, Any]) -> "Equipment":
+        """
+        Build and validate equipment from an API record
+        Args:
+            record: Equipment dictionary (id, name, status, location, lastUpdated)
+        Returns:
+            Equipment instance
+        Raises:
+            ModelValidationError: If the record is invalid
+        """
+        equipment_id = _field(record, "id", int, "Equipment")
+        if equipment_id <= 0:
+            raise ModelValidationError(f"Equipment id should be positive, got {equipment_id}")
+        return cls(
+            equipment_id,
+            _field(record, "name", str, "Equipment"),
+            _status(record, "status", "Equipment"),
+            _field(record, "location", str, "Equipment"),
+            _timestamp(record, "lastUpdated", "Equipment")
+        )
+
+    @classmethod
+    def from_response(cls, response_data: Dict[str, Any]) -> "Equipment":
+        """Build equipment from a {"success": ..., "data": {...}} response"""
+        return cls.from_dict(_unwrap(response_data, "Equipment"))
+
+    @property
+    def last_updated(self) -> datetime:
+        """lastUpdated as a datetime, parsed on first access"""
+        if self._last_updated is None:
+            self._last_updated = parse_timestamp(self.last_updated_raw)
+        return self._last_updated
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the API's dictionary shape"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status.value,
+            "location": self.location,
+            "lastUpdated": self.last_updated_raw
+        }
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Equipment):
+            return NotImplemented
+        return (self.id, self.name, self.status, self.location, self.last_updated_raw) == \
+            (other.id, other.name, other.status, other.location, other.last_updated_raw)
+
+    def __repr__(self) -> str:
+        return f"Equipment(id={self.id}, name={self.name!r}, status={self.status.value!r}, location={self.location!r})"
+
+
+class HistoryEntry:
+    """Status change entry from an equipment's history"""
+
+    __slots__ = ("id", "equipment_id", "previous_status", "new_status", "changed_by",
+                 "timestamp_raw", "_timestamp")
+
+    def __init__(self, id: int, equipment_id: int, previous_status: EquipmentStatus,
+                 new_status: EquipmentStatus, changed_by: Optional[str], timestamp_raw: str):
+        self.id = id
+        self.equipment_id = equipment_id
+        self.previous_status = previous_status
+        self.new_status = new_status
+        self.changed_by = sys.intern(changed_by) if changed_by is not None else None
+        self.timestamp_raw = timestamp_raw
+        self._timestamp: Optional[datetime] = None
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, Any]) -> "HistoryEntry":
+        """
+        Build and validate a history entry from an API record
+        Args:
+            record: History entry dictionary
+        Returns:
+            HistoryEntry instance
+        Raises:
+            ModelValidationError: If the record is invalid
+        """
+        return cls(
+            _field(record, "id", int, "History entry"),
+            _field(record, "equipmentId", int, "History entry"),
+            _status(record, "previousStatus", "History entry"),
+            _status(record, "newStatus", "History entry"),
+            _field(record, "changedBy", str, "History entry", optional=True),
+            _timestamp(record, "timestamp", "History entry")
+        )
+
+    @property
+    def timestamp(self) -> datetime:
+        """timestamp as a datetime, parsed on first access"""
+        if self._timestamp is None:
+            self._timestamp = parse_timestamp(self.timestamp_raw)
+        return self._timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the API's dictionary shape"""
+        return {
+            "id": self.id,
+            "equipmentId": self.equipment_id,
+            "previousStatus": self.previous_status.value,
+            "newStatus": self.new_status.value,
+            "timestamp": self.timestamp_raw,
+            "changedBy": self.changed_by
+        }
+
+    def __repr__(self) -> str:
+        return (f"HistoryEntry(id={self.id}, equipment_id={self.equipment_id}, "
+                f"{self.previous_status.value!r} -> {self.new_status.value!r})")
+
+
+class HistoryPage:
+    """One page of an equipment's status history"""
+
+    __slots__ = ("equipment_id", "entries", "total", "limit", "offset", "has_more")
+
+    def __init__(self, equipment_id: int, entries: Tuple[HistoryEntry, ...], total: int,
+                 limit: Optional[int], offset: Optional[int], has_more: bool):
+        self.equipment_id = equipment_id
+        self.entries = entries
+        self.total = total
+        self.limit = limit
+        self.offset = offset
+        self.has_more = has_more
+
+    @classmethod
+    def from_response(cls, response_data: Dict[str, Any]) -> "HistoryPage":
+        """
+        Build and validate a history page from a GET /api/equipment/{id}/history response
+        Args:
+            response_data: Response data with success wrapper
+        Returns:
+            HistoryPage instance
+        Raises:
+            ModelValidationError: If the response is invalid
+        """
+        data = _unwrap(response_data, "History")
+        history = _field(data, "history", list, "History")
+        return cls(
+            _field(data, "equipmentId", int, "History"),
+            tuple(HistoryEntry.from_dict(entry) for entry in history),
+            _field(data, "total", int, "History"),
+            # The API answers invalid limit/offset values with null
+            _field(data, "limit", int, "History", optional=True),
+            _field(data, "offset", int, "History", optional=True),
+            _field(data, "hasMore", bool, "History")
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __repr__(self) -> str:
+        return (f"HistoryPage(equipment_id={self.equipment_id}, entries={len(self.entries)}, "
+                f"total={self.total}, has_more={self.has_more})")
+
+
+def equipment_list_from_response(response_data: Dict[str, Any]) -> List[Equipment]:
+    """
+    Build equipment models from a GET /api/equipment response
+    Args:
+        response_data: Response data with success wrapper and count
+    Returns:
+        List of Equipment
+    Raises:
+        ModelValidationError: If the response is invalid
+    """
+    records = _unwrap(response_data, "Equipment list")
+    if not isinstance(records, list):
+        raise ModelValidationError("Equipment list data should be a list")
+    count = _field(response_data, "count", int, "Equipment list")
+    if count != len(records):
+        raise ModelValidationError(f"Count should match data length. Expected: {len(records)}, Got: {count}")
+    return [Equipment.from_dict(record) for record in records]
+
+
+def status_update_from_response(response_data: Dict[str, Any]) -> Tuple[Equipment, HistoryEntry]:
+    """
+    Build models from a POST /api/equipment/{id}/status response
+    Args:
+        response_data: Response data with success wrapper
+    Returns:
+        Tuple of (updated equipment, new history entry)
+    Raises:
+        ModelValidationError: If the response is invalid
+    """
+    data = _unwrap(response_data, "Status update")
+    return (Equipment.from_dict(_field(data, "equipment", dict, "Status update")),
+            HistoryEntry.from_dict(_field(data, "historyEntry", dict, "Status update")))
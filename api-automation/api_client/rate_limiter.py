@@ -0,0 +1,275 @@
+"""
+Token-bucket rate limiting for EquipmentAPIClient
+Buckets apply globally and per endpoint, are shared by every thread of a process and,
+through a locked state file, by every xdist worker and load script on the machine; their
+rates back off on 429 responses and honour Retry-After
+"""
+
+import email.utils
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from helpers.file_lock import FileLock
+
+GLOBAL_BUCKET = "*"
+# Fraction of the configured rate kept after a 429, and never gone below
+BACKOFF_FACTOR = 0.5
+MIN_RATE_FRACTION = 0.05
+# Fraction of the configured rate regained per successful response
+RECOVERY_STEP = 0.05
+# Buckets untouched for this long start again full and at the configured rate
+IDLE_RESET_SECONDS = 60.0
+DEFAULT_RETRY_AFTER = 1.0
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header
+    Args:
+        value: Delay in seconds or an HTTP date
+        now: Current time, time.time() by default
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(moment.timestamp() - (now if now is not None else time.time()), 0.0)
+
+
+def parse_endpoint_rates(spec: str) -> Dict[str, float]:
+    """
+    Parse per-endpoint limits
+    Args:
+        spec: Comma-separated "[METHOD ]/path=rate" pairs, paths as in ENDPOINTS with {id}
+    Returns:
+        Dictionary of bucket key to requests per second
+    Raises:
+        ValueError: If an entry is not key=rate
+    """
+    rates = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        key, separator, rate = entry.rpartition("=")
+        if not separator or not key.strip():
+            raise ValueError(f"Invalid endpoint rate limit '{entry}', expected [METHOD ]/path=rate")
+        rates[" ".join(key.split())] = float(rate)
+    return rates
+
+
+class RateLimiter:
+    """Global and per-endpoint token buckets with AIMD adaptation to throttling"""
+
+    def __init__(self, rate: float = 0.0, burst: Optional[float] = None,
+                 endpoint_rates: Optional[Dict[str, float]] = None, state_file: Optional[str] = None,
+                 clock: Callable[[], float] = time.time, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate: Global requests per second; 0 leaves only the endpoint limits
+            burst: Bucket capacity; one second's worth of requests by default
+            endpoint_rates: Requests per second by "METHOD /path" or "/path"
+            state_file: JSON state shared between processes; None keeps buckets in this process
+            clock: Wall-clock seconds; shared state stores absolute times, so every process must agree
+            sleep: Called to wait for tokens
+        """
+        self.limits: Dict[str, float] = {GLOBAL_BUCKET: rate} if rate > 0 else {}
+        self.limits.update({key: value for key, value in (endpoint_rates or {}).items() if value > 0})
+        self.burst = burst
+        self.state_file = state_file
+        self.throttled = 0
+        self.waited = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._file_lock = FileLock(f"{state_file}.lock") if state_file else None
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, float]] = {}
+        # Buckets last seen below their configured rate; only these need writing back on success
+        self._recovering: set = set()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.limits)
+
+    def buckets_for(self, key: str) -> List[str]:
+        """
+        Buckets a request draws from
+        Args:
+            key: "METHOD /path", with IDs collapsed to {id}
+        Returns:
+            Bucket keys
+        """
+        path = key.split(" ", 1)[-1]
+        # The global bucket always applies: without a global rate it only carries Retry-After pauses
+        return [GLOBAL_BUCKET] + [bucket for bucket in (key, path) if bucket in self.limits]
+
+    def acquire(self, key: str) -> float:
+        """
+        Wait until every bucket of a request has a token, then take them
+        Args:
+            key: "METHOD /path", with IDs collapsed to {id}
+        Returns:
+            Seconds spent waiting
+        """
+        buckets = self.buckets_for(key)
+        waited = 0.0
+        while True:
+            with self._locked_state() as state:
+                now = self._clock()
+                entries = [self._refill(state, bucket, now) for bucket in buckets]
+                delay = max(self._delay(entry, now) for entry in entries)
+                if delay <= 0:
+                    for entry in entries:
+                        if entry["rate"]:
+                            entry["tokens"] -= 1.0
+            if delay <= 0:
+                self.waited += waited
+                return waited
+            self._sleep(delay)
+            waited += delay
+
+    def record_response(self, key: str, status_code: int, retry_after: Optional[str] = None) -> bool:
+        """
+        Adapt the rates of a request's buckets to its response
+        Args:
+            key: "METHOD /path", with IDs collapsed to {id}
+            status_code: Response status
+            retry_after: Retry-After header value
+        Returns:
+            True if the request was throttled (429) and should be retried
+        """
+        buckets = self.buckets_for(key)
+        if status_code != 429:
+            recovering = [bucket for bucket in buckets if bucket in self._recovering]
+            if recovering:
+                with self._locked_state() as state:
+                    for bucket in recovering:
+                        entry = self._refill(state, bucket, self._clock())
+                        entry["rate"] = min(entry["rate"] + self.limits[bucket] * RECOVERY_STEP, self.limits[bucket])
+            return False
+
+        self.throttled += 1
+        pause = parse_retry_after(retry_after, self._clock())
+        with self._locked_state() as state:
+            now = self._clock()
+            for bucket in buckets:
+                limit = self.limits.get(bucket)
+                entry = self._refill(state, bucket, now)
+                if limit:
+                    entry["rate"] = max(entry["rate"] * BACKOFF_FACTOR, limit * MIN_RATE_FRACTION)
+                    entry["tokens"] = min(entry["tokens"], 0.0)
+                    self._recovering.add(bucket)
+                entry["blocked_until"] = max(entry["blocked_until"],
+                                             now + (pause if pause is not None else DEFAULT_RETRY_AFTER))
+        return True
+
+    def _refill(self, state: Dict[str, Dict[str, float]], bucket: str, now: float) -> Dict[str, float]:
+        """Bring a bucket's tokens up to date, creating or resetting it if needed"""
+        limit = self.limits.get(bucket, 0.0)
+        capacity = self.burst or max(limit, 1.0)
+        entry = state.get(bucket)
+        if entry is None or entry.get("limit") != limit or \
+                (now - entry["updated"] > IDLE_RESET_SECONDS and entry["blocked_until"] < now):
+            entry = state[bucket] = {"limit": limit, "rate": limit, "tokens": capacity,
+                                     "updated": now, "blocked_until": 0.0}
+        elif now > entry["updated"]:
+            entry["tokens"] = min(entry["tokens"] + (now - entry["updated"]) * entry["rate"], capacity)
+            entry["updated"] = now
+        if entry["rate"] >= limit:
+            self._recovering.discard(bucket)
+        else:
+            self._recovering.add(bucket)
+        return entry
+
+    @staticmethod
+    def _delay(entry: Dict[str, float], now: float) -> float:
+        """Seconds until a bucket can hand out a token"""
+        blocked = entry["blocked_until"] - now
+        if entry["tokens"] >= 1.0 or not entry["rate"]:
+            return blocked
+        return max(blocked, (1.0 - entry["tokens"]) / entry["rate"])
+
+    def _locked_state(self) -> "_LockedState":
+        return _LockedState(self)
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if not self.state_file:
+            return self._state
+        try:
+            with open(self.state_file, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, state: Dict[str, Dict[str, float]]) -> None:
+        if not self.state_file:
+            return
+        temporary = f"{self.state_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(state, file)
+        os.replace(temporary, self.state_file)
+
+
+class _LockedState:
+    """Bucket state held under the thread lock and, when shared, the state file lock"""
+
+    def __init__(self, limiter: RateLimiter):
+        self.limiter = limiter
+        self.state: Dict[str, Dict[str, float]] = {}
+
+    def __enter__(self) -> Dict[str, Dict[str, float]]:
+        self.limiter._lock.acquire()
+        if self.limiter._file_lock is not None:
+            try:
+                self.limiter._file_lock.acquire()
+            except BaseException:
+                self.limiter._lock.release()
+                raise
+        self.state = self.limiter._load()
+        return self.state
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            if exc_type is None:
+                self.limiter._save(self.state)
+        finally:
+            if self.limiter._file_lock is not None:
+                self.limiter._file_lock.release()
+            self.limiter._lock.release()
+
+
+def rate_limiter_from_config(config: Dict[str, Any]) -> Optional[RateLimiter]:
+    """
+    Build a limiter from get_config() values
+    Args:
+        config: Client configuration
+    Returns:
+        RateLimiter, or None if no limit is configured
+    """
+    limiter = RateLimiter(config["rate_limit"], config["rate_limit_burst"] or None,
+                          parse_endpoint_rates(config["rate_limit_endpoints"]),
+                          config["rate_limit_file"] or None)
+    return limiter if limiter.enabled else None
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Return the process-wide limiter shared by every EquipmentAPIClient, or None if disabled"""
+    global _limiter
+    from config.endpoints import get_config
+
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = rate_limiter_from_config(get_config()) or False
+        return _limiter or None
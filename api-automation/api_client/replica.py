@@ -0,0 +1,142 @@
+"""
+Local SQLite replica of equipment and status history
+Fed from the responses that pass through EquipmentAPIClient, so consistency checks on
+data the suite itself produced run as indexed local queries instead of remote requests
+"""
+
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS equipment (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    status TEXT,
+    location TEXT,
+    last_updated TEXT
+);
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    equipment_id INTEGER NOT NULL,
+    previous_status TEXT,
+    new_status TEXT,
+    timestamp TEXT,
+    changed_by TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_equipment_status ON equipment (status);
+CREATE INDEX IF NOT EXISTS idx_equipment_location ON equipment (location);
+CREATE INDEX IF NOT EXISTS idx_equipment_last_updated ON equipment (last_updated);
+CREATE INDEX IF NOT EXISTS idx_history_equipment_timestamp ON history (equipment_id, timestamp);
+"""
+
+EQUIPMENT_PATH = re.compile(r"^/api/equipment/?$")
+STATUS_PATH = re.compile(r"^/api/equipment/([^/]+)/status/?$")
+HISTORY_PATH = re.compile(r"^/api/equipment/([^/]+)/history/?$")
+
+_UPSERT_EQUIPMENT = ("INSERT OR REPLACE INTO equipment (id, name, status, location, last_updated) "
+                     "VALUES (:id, :name, :status, :location, :lastUpdated)")
+_UPSERT_HISTORY = ("INSERT OR REPLACE INTO history (id, equipment_id, previous_status, new_status, timestamp, changed_by) "
+                   "VALUES (:id, :equipmentId, :previousStatus, :newStatus, :timestamp, :changedBy)")
+
+
+class EquipmentReplica:
+    """Embedded replica of the equipment and history the suite has seen"""
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Args:
+            path: SQLite database file; in-memory by default
+        """
+        # Observers can run on any thread that uses the client
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.executescript(SCHEMA)
+
+    def __call__(self, response, response_data: Any) -> None:
+        """
+        Response observer; records successful equipment and history responses
+        Args:
+            response: requests.Response
+            response_data: Decoded response body
+        """
+        if not isinstance(response_data, dict) or response_data.get("success") is not True:
+            return
+        data = response_data.get("data")
+        method = response.request.method
+        path = urlparse(response.url).path
+
+        if EQUIPMENT_PATH.match(path):
+            if method == "GET" and response.status_code == 200 and isinstance(data, list):
+                self.record_equipment(data)
+            elif method == "POST" and response.status_code == 201 and isinstance(data, dict):
+                self.record_equipment([data])
+        elif method == "POST" and response.status_code == 200 and STATUS_PATH.match(path):
+            if isinstance(data, dict):
+                if isinstance(data.get("equipment"), dict):
+                    self.record_equipment([data["equipment"]])
+                if isinstance(data.get("historyEntry"), dict):
+                    self.record_history([data["historyEntry"]])
+        elif method == "GET" and response.status_code == 200 and HISTORY_PATH.match(path):
+            if isinstance(data, dict) and isinstance(data.get("history"), list):
+                self.record_history(data["history"])
+
+    def record_equipment(self, records: List[Dict[str, Any]]) -> None:
+        """Insert or replace equipment records"""
+        rows = [dict({"name": None, "status": None, "location": None, "lastUpdated": None}, **record)
+                for record in records if "id" in record]
+        with self._lock, self._connection:
+            self._connection.executemany(_UPSERT_EQUIPMENT, rows)
+
+    def record_history(self, entries: List[Dict[str, Any]]) -> None:
+        """Insert or replace history entries"""
+        rows = [dict({"previousStatus": None, "newStatus": None, "timestamp": None, "changedBy": None}, **entry)
+                for entry in entries if "id" in entry and "equipmentId" in entry]
+        with self._lock, self._connection:
+            self._connection.executemany(_UPSERT_HISTORY, rows)
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._connection.execute(sql, params)]
+
+    def get_equipment(self, equipment_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Look up one equipment
+        Args:
+            equipment_id: Equipment ID
+        Returns:
+            Equipment row, or None if the replica has not seen it
+        """
+        rows = self._query("SELECT * FROM equipment WHERE id = ?", (int(equipment_id),))
+        return rows[0] if rows else None
+
+    def equipment_by_status(self, status: str) -> List[Dict[str, Any]]:
+        """Equipment rows with the given status"""
+        return self._query("SELECT * FROM equipment WHERE status = ? ORDER BY id", (status,))
+
+    def equipment_by_location(self, location: str) -> List[Dict[str, Any]]:
+        """Equipment rows at the given location"""
+        return self._query("SELECT * FROM equipment WHERE location = ? ORDER BY id", (location,))
+
+    def equipment_updated_before(self, timestamp: str) -> List[Dict[str, Any]]:
+        """Equipment rows whose lastUpdated is before an ISO 8601 timestamp"""
+        return self._query("SELECT * FROM equipment WHERE last_updated < ? ORDER BY last_updated", (timestamp,))
+
+    def history(self, equipment_id: int) -> List[Dict[str, Any]]:
+        """History rows of one equipment, oldest first"""
+        return self._query("SELECT * FROM history WHERE equipment_id = ? ORDER BY timestamp, id",
+                           (int(equipment_id),))
+
+    def last_history_entry(self, equipment_id: int) -> Optional[Dict[str, Any]]:
+        """Most recent history row of one equipment, or None"""
+        rows = self._query("SELECT * FROM history WHERE equipment_id = ? ORDER BY timestamp DESC, id DESC LIMIT 1",
+                           (int(equipment_id),))
+        return rows[0] if rows else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,69 @@
+"""
+Single-flight execution of identical concurrent calls
+The first caller for a key runs the call; callers arriving while it is in flight wait for
+and share its outcome instead of repeating it
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """One in-flight call and the callers waiting on it"""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls by key; completed calls are not cached"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run a call, or join the identical one already in flight
+        Args:
+            key: Identity of the call
+            function: Performs the call
+        Returns:
+            Tuple of (result, shared); shared is True if another caller ran the call
+        Raises:
+            Whatever the call raised, for the caller that ran it and every caller sharing it
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            joined = call is not None
+            if joined:
+                call.waiters += 1
+            else:
+                call = self._calls[key] = _Call()
+        if joined:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Callers arriving from now on start a new call rather than getting a finished one
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,156 @@
+"""
+HTTP transports for EquipmentAPIClient
+"requests" is the default HTTP/1.1 connection pool. "http2" multiplexes concurrent requests
+over a few HTTP/2 connections through httpx (optional: pip install "httpx[http2]"), and
+"h2c" does the same over cleartext with prior knowledge, for local stand-in servers.
+Every transport is a session with a requests-style request() returning requests.Response,
+so the client's methods and the tests see the same response shape
+"""
+
+import datetime
+import time
+from typing import Any, Dict, Optional, Union
+
+from helpers.lazy_import import lazy_import
+
+requests = lazy_import("requests")
+httpx = lazy_import("httpx")
+
+TRANSPORTS = ("requests", "http2", "h2c")
+# Connections kept per host; HTTP/2 needs few because each carries many concurrent streams
+HTTP2_MAX_CONNECTIONS = 4
+HTTP2_MAX_KEEPALIVE = 4
+
+
+class _StreamedBody:
+    """File-like view of a streamed httpx response, read by requests.Response.iter_content"""
+
+    def __init__(self, response):
+        self._response = response
+        self._chunks = response.iter_bytes()
+        self._buffer = b""
+
+    def read(self, amount: Optional[int] = None, **kwargs) -> bytes:
+        while amount is None or len(self._buffer) < amount:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+        if amount is None:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:amount], self._buffer[amount:]
+        return data
+
+    def close(self) -> None:
+        self._response.close()
+
+    # requests.Response.close() calls this even after the body was fully read
+    release_conn = close
+
+
+class Http2Session:
+    """requests.Session look-alike backed by an HTTP/2 httpx.Client"""
+
+    def __init__(self, prior_knowledge: bool = False, max_connections: int = HTTP2_MAX_CONNECTIONS):
+        """
+        Args:
+            prior_knowledge: Speak HTTP/2 without negotiation, required for cleartext (h2c) servers
+            max_connections: Connections kept per host
+        """
+        try:
+            limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=HTTP2_MAX_KEEPALIVE)
+            self._client = httpx.Client(http1=not prior_knowledge, http2=True, limits=limits)
+        except ImportError as e:
+            raise ImportError(f"The HTTP/2 transport needs httpx with HTTP/2 support: "
+                              f"pip install \"httpx[http2]\" ({e})") from e
+        self.headers: Dict[str, str] = requests.structures.CaseInsensitiveDict()
+
+    def request(self, method: str, url: str, data: Optional[bytes] = None, params: Optional[Dict] = None,
+                timeout: Optional[Union[float, tuple]] = None, stream: bool = False, **kwargs) -> Any:
+        """
+        Send a request
+        Args:
+            method: HTTP method
+            url: Full URL
+            data: Encoded request body
+            params: Query parameters
+            timeout: Seconds, or a (connect, read) tuple as accepted by requests
+            stream: Defer downloading the body until it is read
+        Returns:
+            requests.Response
+        Raises:
+            requests.exceptions.RequestException: On transport errors, as with the requests transport
+        """
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        request = self._client.build_request(method, url, content=data, params=params,
+                                             headers=dict(self.headers), timeout=timeout)
+        started = time.perf_counter()
+        try:
+            # Always stream first so elapsed means time to headers, as it does with requests
+            response = self._client.send(request, stream=True)
+            elapsed = datetime.timedelta(seconds=time.perf_counter() - started)
+            if not stream:
+                try:
+                    response.read()
+                finally:
+                    response.close()
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e)) from e
+        return _to_requests_response(request, response, elapsed, stream)
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> "Http2Session":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def _to_requests_response(request, response, elapsed: datetime.timedelta, stream: bool):
+    """Give an httpx response the shape of requests.Response"""
+    prepared = requests.PreparedRequest()
+    prepared.method = request.method
+    prepared.url = str(request.url)
+    prepared.headers = requests.structures.CaseInsensitiveDict(request.headers)
+    prepared.body = request.content or None
+
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.reason = response.reason_phrase
+    converted.headers = requests.structures.CaseInsensitiveDict(response.headers)
+    converted.url = str(response.url)
+    converted.request = prepared
+    converted.encoding = response.charset_encoding
+    converted.elapsed = elapsed
+    # Response.close() closes raw unless the content was consumed, so raw is always set
+    converted.raw = _StreamedBody(response)
+    if not stream:
+        converted._content = response.content
+        converted._content_consumed = True
+    return converted
+
+
+def create_session(transport: str = "requests"):
+    """
+    Create the session a client sends requests through
+    Args:
+        transport: "requests", "http2" or "h2c"
+    Returns:
+        requests.Session or Http2Session
+    Raises:
+        ValueError: If the transport is unknown
+        ImportError: If an HTTP/2 transport is chosen without httpx installed
+    """
+    if transport == "requests":
+        return requests.Session()
+    if transport in ("http2", "h2c"):
+        return Http2Session(prior_knowledge=transport == "h2c")
+    raise ValueError(f"Unknown transport '{transport}', expected one of {', '.join(TRANSPORTS)}")
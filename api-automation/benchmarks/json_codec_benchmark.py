@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the JSON codecs on realistic equipment and history payloads
+Compares encode and decode throughput of every codec installed here
+"""
+
+import os
+import sys
+import timeit
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client.json_codec import CODECS, get_json_codec
+from helpers.test_data import generate_equipment_name, generate_location
+
+STATUSES = ["Active", "Idle", "Under Maintenance"]
+LIST_SIZES = [int(size) for size in os.getenv("CODEC_BENCHMARK_SIZES", "100,10000").split(",")]
+
+
+def equipment_record(equipment_id: int) -> Dict[str, Any]:
+    return {
+        "id": equipment_id,
+        "name": generate_equipment_name(),
+        "status": STATUSES[equipment_id % 3],
+        "location": generate_location(),
+        "lastUpdated": "2025-06-01T08:30:15.123Z"
+    }
+
+
+def build_payloads() -> Dict[str, Any]:
+    """Build request and response bodies shaped like the real API's"""
+    payloads: Dict[str, Any] = {
+        "add request": {"name": generate_equipment_name(), "status": "Active", "location": generate_location()},
+        "status update response": {
+            "success": True,
+            "data": {
+                "equipment": equipment_record(7),
+                "historyEntry": {
+                    "id": 120, "equipmentId": 7, "previousStatus": "Idle", "newStatus": "Active",
+                    "timestamp": "2025-06-01T08:30:15.123Z", "changedBy": "Operator D"
+                }
+            }
+        }
+    }
+    history: List[Dict[str, Any]] = [{
+        "id": entry_id, "equipmentId": 1, "previousStatus": STATUSES[entry_id % 3],
+        "newStatus": STATUSES[(entry_id + 1) % 3], "timestamp": "2025-06-01T08:30:15.123Z",
+        "changedBy": "Operator D"
+    } for entry_id in range(50)]
+    payloads["history page (50)"] = {
+        "success": True,
+        "data": {"equipmentId": 1, "history": history, "total": 500, "limit": 50, "offset": 0, "hasMore": True}
+    }
+    for size in LIST_SIZES:
+        equipment = [equipment_record(equipment_id) for equipment_id in range(1, size + 1)]
+        payloads[f"equipment list ({size})"] = {"success": True, "data": equipment, "count": size}
+    return payloads
+
+
+def main():
+    """Run the benchmark for every installed codec"""
+    codecs = []
+    for name in CODECS:
+        try:
+            codecs.append(get_json_codec(name))
+        except ImportError:
+            print(f"[INFO] {name} is not installed, skipping")
+
+    print(f"{'payload':28} {'codec':8} {'size':>10} {'encode':>12} {'decode':>12}")
+    for label, payload in build_payloads().items():
+        encoded = get_json_codec("json").dumps(payload)
+        # Aim for roughly 0.2 s per measurement regardless of payload size
+        number = max(1, 2_000_000 // max(len(encoded), 1))
+        for codec in codecs:
+            encode = min(timeit.repeat(lambda: codec.dumps(payload), number=number, repeat=3)) / number
+            decode = min(timeit.repeat(lambda: codec.loads(encoded), number=number, repeat=3)) / number
+            print(f"{label:28} {codec.name:8} {len(encoded):>10} "
+                  f"{encode * 1e6:>9.1f} us {decode * 1e6:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
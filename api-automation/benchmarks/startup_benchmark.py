@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Start-up budget benchmark for the API test harness
+Measures what importing conftest and the test modules costs on top of pytest itself,
+and fails when that exceeds the budget or a deferred dependency is imported eagerly
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HARNESS_MODULES = [
+    "conftest",
+    "tests.base_test",
+    "tests.test_add_equipment",
+    "tests.test_get_all_equipment",
+    "tests.test_get_equipment_history",
+    "tests.test_update_equipment_status"
+]
+# Heavy dependencies that must only be imported on first use
+DEFERRED_MODULES = ["jsonschema", "allure", "requests"]
+
+BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", 60))
+RUNS = int(os.getenv("STARTUP_BENCHMARK_RUNS", 15))
+
+
+def time_interpreter(code: str, runs: int = RUNS) -> float:
+    """
+    Time a fresh interpreter running a snippet
+    Args:
+        code: Python source passed to -c
+        runs: Number of interpreters to start
+    Returns:
+        Median wall time in milliseconds
+    """
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=PROJECT_DIR, check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def eagerly_imported(modules: List[str]) -> List[str]:
+    """Return the deferred modules that importing the harness pulls in"""
+    code = "\n".join([f"import {name}" for name in HARNESS_MODULES] + [
+        "import sys",
+        f"print(' '.join(name for name in {modules!r} if name in sys.modules))"
+    ])
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_DIR,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def main():
+    """Run the benchmark and enforce the start-up budget"""
+    imports = "\n".join(["import pytest"] + [f"import {name}" for name in HARNESS_MODULES])
+    baseline = time_interpreter("import pytest")
+    harness = time_interpreter(imports)
+    overhead = harness - baseline
+    loaded = eagerly_imported(DEFERRED_MODULES)
+
+    print(f"pytest import:              {baseline:8.1f} ms")
+    print(f"pytest + harness import:    {harness:8.1f} ms")
+    print(f"harness overhead:           {overhead:8.1f} ms (budget {BUDGET_MS:.0f} ms)")
+    print(f"eagerly imported deferreds: {', '.join(loaded) if loaded else 'none'}")
+
+    if overhead > BUDGET_MS or loaded:
+        print("❌ Start-up budget exceeded")
+        sys.exit(1)
+    print("✅ Start-up within budget")
+
+
+if __name__ == "__main__":
+    main()
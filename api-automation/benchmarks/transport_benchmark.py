@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the HTTP/1.1 requests pool versus the HTTP/2 transport under concurrency
+Starts two local stand-in servers answering GET /api/equipment after a fixed delay, one
+speaking HTTP/1.1 and one cleartext HTTP/2 (h2c, needs pip install "httpx[http2]"), and
+fires the same concurrent load at each through EquipmentAPIClient.get_all_equipment
+"""
+
+import asyncio
+import http.server
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client.equipment_api import EquipmentAPIClient
+from api_client.transports import create_session
+
+REQUESTS = int(os.getenv("TRANSPORT_BENCHMARK_REQUESTS", "600"))
+CONCURRENCY = int(os.getenv("TRANSPORT_BENCHMARK_CONCURRENCY", "32"))
+LATENCY = float(os.getenv("TRANSPORT_BENCHMARK_LATENCY_MS", "20")) / 1000
+LIST_SIZE = int(os.getenv("TRANSPORT_BENCHMARK_SIZE", "50"))
+
+
+def build_body() -> bytes:
+    equipment = [{
+        "id": equipment_id,
+        "name": f"Equipment {equipment_id}",
+        "status": "Active",
+        "location": f"Site {equipment_id % 40}",
+        "lastUpdated": "2025-06-01T08:30:15.123Z"
+    } for equipment_id in range(1, LIST_SIZE + 1)]
+    return json.dumps({"success": True, "data": equipment, "count": LIST_SIZE}).encode("utf-8")
+
+
+class Http1Server(http.server.ThreadingHTTPServer):
+    """Keep-alive HTTP/1.1 stand-in that counts accepted connections"""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.connections = 0
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                time.sleep(LATENCY)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        super().__init__(("127.0.0.1", 0), Handler)
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+class H2Protocol(asyncio.Protocol):
+    """One h2c connection; every stream is answered concurrently after the delay"""
+
+    def __init__(self, server: "Http2Server"):
+        import h2.config
+        import h2.connection
+        self.server = server
+        self.connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        self.window_updated = asyncio.Event()
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.server.connections += 1
+        self.transport = transport
+        self.connection.initiate_connection()
+        self.transport.write(self.connection.data_to_send())
+
+    def data_received(self, data):
+        import h2.events
+        import h2.exceptions
+        try:
+            events = self.connection.receive_data(data)
+        except h2.exceptions.ProtocolError:
+            self.transport.write(self.connection.data_to_send())
+            self.transport.close()
+            return
+        for event in events:
+            if isinstance(event, h2.events.RequestReceived):
+                asyncio.ensure_future(self.respond(event.stream_id))
+            elif isinstance(event, h2.events.WindowUpdated):
+                self.window_updated.set()
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self.transport.close()
+        self.transport.write(self.connection.data_to_send())
+
+    def connection_lost(self, exc):
+        self.window_updated.set()
+
+    async def respond(self, stream_id: int):
+        import h2.exceptions
+        await asyncio.sleep(LATENCY)
+        body = self.server.body
+        try:
+            self.connection.send_headers(stream_id, [(":status", "200"), ("content-type", "application/json"),
+                                                     ("content-length", str(len(body)))])
+            sent = 0
+            while sent < len(body):
+                window = min(self.connection.local_flow_control_window(stream_id),
+                             self.connection.max_outbound_frame_size)
+                if window <= 0:
+                    # Wait for the client to grant more window, then try again
+                    self.window_updated.clear()
+                    self.transport.write(self.connection.data_to_send())
+                    await self.window_updated.wait()
+                    if self.transport.is_closing():
+                        return
+                    continue
+                chunk = body[sent:sent + window]
+                sent += len(chunk)
+                self.connection.send_data(stream_id, chunk, end_stream=sent == len(body))
+                self.transport.write(self.connection.data_to_send())
+        except h2.exceptions.StreamClosedError:
+            return
+
+
+class Http2Server:
+    """Cleartext HTTP/2 stand-in on an event loop in a background thread"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.connections = 0
+        self.port = 0
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(self._loop)
+            server = self._loop.run_until_complete(
+                self._loop.create_server(lambda: H2Protocol(self), "127.0.0.1", 0))
+            self.port = server.sockets[0].getsockname()[1]
+            started.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=serve, name="h2c-server", daemon=True).start()
+        started.wait()
+
+    def shutdown(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def run(transport: str, base_url: str, server) -> None:
+    """Fire the concurrent load through one transport"""
+    client = EquipmentAPIClient(session=create_session(transport))
+    client.base_url = base_url
+    # Every request is identical; coalescing would hide the transport difference
+    client.coalesce_gets = False
+    client.get_all_equipment()
+    server.connections = 0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(CONCURRENCY) as executor:
+        results = list(executor.map(lambda _: client.get_all_equipment()["count"], range(REQUESTS)))
+    elapsed = time.perf_counter() - started
+    client.session.close()
+    assert results == [LIST_SIZE] * REQUESTS
+
+    print(f"{transport:9} {elapsed:6.2f} s  {REQUESTS / elapsed:7.1f} requests/s  "
+          f"new connections {server.connections}")
+
+
+def main():
+    """Compare HTTP/1.1 and HTTP/2 transports against local stand-in servers"""
+    import logging
+    # urllib3 warns whenever its pool is full and a connection is discarded
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+
+    body = build_body()
+    print(f"{REQUESTS} GET /api/equipment ({len(body)} bytes) from {CONCURRENCY} threads, "
+          f"{LATENCY * 1000:.0f} ms server latency")
+
+    http1 = Http1Server(body)
+    threading.Thread(target=http1.serve_forever, daemon=True).start()
+    run("requests", f"http://127.0.0.1:{http1.server_address[1]}", http1)
+    http1.shutdown()
+
+    try:
+        import h2  # noqa: F401
+        import httpx  # noqa: F401
+    except ImportError:
+        print("[WARNING] Skipping HTTP/2: pip install \"httpx[http2]\"")
+        return
+    http2 = Http2Server(body)
+    run("h2c", f"http://127.0.0.1:{http2.port}", http2)
+    http2.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark of inline versus process-pool validation in a simulated request loop
+Each iteration waits a fixed time standing in for network I/O, then hands a large
+GET /api/equipment body to the validation pipeline
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client.json_codec import get_json_codec
+from helpers.validation_pipeline import ValidationPipeline
+
+STATUSES = ["Active", "Idle", "Under Maintenance"]
+LIST_SIZE = int(os.getenv("VALIDATION_BENCHMARK_SIZE", "20000"))
+REQUESTS = int(os.getenv("VALIDATION_BENCHMARK_REQUESTS", "20"))
+IO_SECONDS = float(os.getenv("VALIDATION_BENCHMARK_IO_MS", "20")) / 1000
+WORKER_COUNTS = [0, 1, os.cpu_count() or 1]
+
+
+def build_body() -> bytes:
+    equipment = [{
+        "id": equipment_id,
+        "name": f"Equipment {equipment_id}",
+        "status": STATUSES[equipment_id % 3],
+        "location": f"Site {equipment_id % 40}",
+        "lastUpdated": "2025-06-01T08:30:15.123Z"
+    } for equipment_id in range(1, LIST_SIZE + 1)]
+    return get_json_codec("json").dumps({"success": True, "data": equipment, "count": LIST_SIZE})
+
+
+def run(workers: int, body: bytes) -> None:
+    """Run the simulated request loop with the given number of validation workers"""
+    with ValidationPipeline(workers=workers) as pipeline:
+        # Start the workers before timing
+        pipeline.submit("equipment_list", body)
+        pipeline.wait()
+
+        started = time.perf_counter()
+        loop_busy = 0.0
+        for _ in range(REQUESTS):
+            time.sleep(IO_SECONDS)
+            submitted = time.perf_counter()
+            pipeline.submit("equipment_list", body)
+            loop_busy += time.perf_counter() - submitted
+        loop_done = time.perf_counter() - started
+        pipeline.assert_all_passed()
+        total = time.perf_counter() - started
+
+    label = "inline" if workers == 0 else f"{workers} worker(s)"
+    print(f"{label:14} request loop {loop_done:7.2f} s  blocked in submit {loop_busy:6.2f} s  "
+          f"all validated {total:7.2f} s  {REQUESTS / total:6.1f} responses/s  "
+          f"peak in flight {pipeline.peak_pending}")
+
+
+def main():
+    """Compare inline validation with process-pool validation"""
+    body = build_body()
+    print(f"{REQUESTS} responses of {LIST_SIZE} items ({len(body) / 1e6:.1f} MB), "
+          f"{IO_SECONDS * 1000:.0f} ms simulated I/O each, {os.cpu_count()} CPUs")
+    for workers in dict.fromkeys(WORKER_COUNTS):
+        run(workers, body)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,50 @@ DEFAULT_HEADERS = {
 # Test Configuration
 TIMEOUT = 30
 RETRY_ATTEMPTS = 3
+JSON_CODEC = "auto"  # auto (orjson when installed), json or orjson
+TRANSPORT = "requests"  # requests (HTTP/1.1 pool), http2 or h2c (HTTP/2 via httpx[http2], h2c for cleartext)
+
+# Health probe (api_client/health.py); the verdict is shared by every worker through the cache file
+HEALTH_TIMEOUT = 5
+HEALTH_CACHE_FILE = "reports/.health.json"
+HEALTH_CACHE_TTL = 60  # seconds a healthy verdict is reused; 0 probes in every process
+
+# Request/response logging
+LOG_FILE = "reports/api-log.ndjson"
+LOG_LEVEL = "info"  # off, info (request line and status) or debug (headers and bodies)
+LOG_SAMPLE_RATE = 1.0
+LOG_BODY_LIMIT = 2048  # bytes of each body kept in debug records
+
+# Metrics (api_client/metrics.py)
+METRICS_FILE = "reports/metrics.prom"  # OpenMetrics dump written at the end of the run; empty disables
+METRICS_PORT = 0  # serve live metrics on http://127.0.0.1:<port>/metrics; 0 disables
+
+# Concurrent identical GETs share one request (api_client/single_flight.py); off by default because
+# sharing callers get the same Response, so its elapsed time and observers are the first caller's
+COALESCE_GETS = False
+
+# Rate limiting (api_client/rate_limiter.py); 429 responses are retried up to RETRY_ATTEMPTS times
+RATE_LIMIT = 0.0  # requests per second across all endpoints; 0 disables the global limit
+RATE_LIMIT_BURST = 0.0  # bucket capacity; 0 means one second's worth of requests
+RATE_LIMIT_ENDPOINTS = ""  # per-endpoint limits, e.g. "GET /api/equipment=5,/api/equipment/{id}/status=2"
+RATE_LIMIT_FILE = "reports/.rate-limit.json"  # bucket state shared by xdist workers; empty keeps it per process
+
+# Tracing (helpers/tracing.py)
+TRACE_DIR = ""  # directory for Chrome trace and OTLP JSON spans written at the end of the run; empty disables
+
+# Soak runs (soak_runner.py, helpers/resource_monitor.py); growth limits are per hour after warm-up, 0 disables
+SOAK_INTERVAL = 10.0  # seconds between resource samples
+SOAK_WARMUP = 60.0  # seconds of start-up growth left out of the slopes
+SOAK_TIMESERIES_FILE = "reports/soak-timeseries.ndjson"
+SOAK_MAX_RSS_MB_PER_HOUR = 50.0
+SOAK_MAX_FDS_PER_HOUR = 10.0
+SOAK_MAX_CONNECTIONS_PER_HOUR = 5.0
+SOAK_MAX_TRACED_MB_PER_HOUR = 20.0
+SOAK_MAX_LATENCY_P95_MS_PER_HOUR = 0.0
+
+# Response validation pipeline (helpers/validation_pipeline.py)
+VALIDATION_WORKERS = 0  # 0 validates inline, -1 uses one process per CPU
+VALIDATION_QUEUE_DEPTH = 0  # validations in flight before submitting blocks; 0 means 2 per worker
 
 # Environment variables
 def get_config() -> Dict[str, Any]:
@@ -33,5 +77,34 @@ def get_config() -> Dict[str, Any]:
     return {
         "base_url": os.getenv("API_BASE_URL", BASE_URL),
         "timeout": int(os.getenv("API_TIMEOUT", TIMEOUT)),
-        "retry_attempts": int(os.getenv("API_RETRY_ATTEMPTS", RETRY_ATTEMPTS))
+        "retry_attempts": int(os.getenv("API_RETRY_ATTEMPTS", RETRY_ATTEMPTS)),
+        "json_codec": os.getenv("API_JSON_CODEC", JSON_CODEC).lower(),
+        "transport": os.getenv("API_TRANSPORT", TRANSPORT).lower(),
+        "health_timeout": float(os.getenv("API_HEALTH_TIMEOUT", HEALTH_TIMEOUT)),
+        "health_cache_file": os.getenv("API_HEALTH_CACHE_FILE", HEALTH_CACHE_FILE),
+        "health_cache_ttl": float(os.getenv("API_HEALTH_CACHE_TTL", HEALTH_CACHE_TTL)),
+        "log_file": os.getenv("API_LOG_FILE", LOG_FILE),
+        "log_level": os.getenv("API_LOG_LEVEL", LOG_LEVEL).lower(),
+        "log_sample_rate": float(os.getenv("API_LOG_SAMPLE_RATE", LOG_SAMPLE_RATE)),
+        "log_body_limit": int(os.getenv("API_LOG_BODY_LIMIT", LOG_BODY_LIMIT)),
+        "metrics_file": os.getenv("API_METRICS_FILE", METRICS_FILE),
+        "metrics_port": int(os.getenv("API_METRICS_PORT", METRICS_PORT)),
+        "coalesce_gets": os.getenv("API_COALESCE_GETS", str(COALESCE_GETS)).lower() in ("1", "true", "yes"),
+        "rate_limit": float(os.getenv("API_RATE_LIMIT", RATE_LIMIT)),
+        "rate_limit_burst": float(os.getenv("API_RATE_LIMIT_BURST", RATE_LIMIT_BURST)),
+        "rate_limit_endpoints": os.getenv("API_RATE_LIMIT_ENDPOINTS", RATE_LIMIT_ENDPOINTS),
+        "rate_limit_file": os.getenv("API_RATE_LIMIT_FILE", RATE_LIMIT_FILE),
+        "trace_dir": os.getenv("API_TRACE_DIR", TRACE_DIR),
+        "soak_interval": float(os.getenv("API_SOAK_INTERVAL", SOAK_INTERVAL)),
+        "soak_warmup": float(os.getenv("API_SOAK_WARMUP", SOAK_WARMUP)),
+        "soak_timeseries_file": os.getenv("API_SOAK_TIMESERIES_FILE", SOAK_TIMESERIES_FILE),
+        "soak_max_rss_mb_per_hour": float(os.getenv("API_SOAK_MAX_RSS_MB_PER_HOUR", SOAK_MAX_RSS_MB_PER_HOUR)),
+        "soak_max_fds_per_hour": float(os.getenv("API_SOAK_MAX_FDS_PER_HOUR", SOAK_MAX_FDS_PER_HOUR)),
+        "soak_max_connections_per_hour": float(os.getenv("API_SOAK_MAX_CONNECTIONS_PER_HOUR",
+                                                         SOAK_MAX_CONNECTIONS_PER_HOUR)),
+        "soak_max_traced_mb_per_hour": float(os.getenv("API_SOAK_MAX_TRACED_MB_PER_HOUR", SOAK_MAX_TRACED_MB_PER_HOUR)),
+        "soak_max_latency_p95_ms_per_hour": float(os.getenv("API_SOAK_MAX_LATENCY_P95_MS_PER_HOUR",
+                                                            SOAK_MAX_LATENCY_P95_MS_PER_HOUR)),
+        "validation_workers": int(os.getenv("API_VALIDATION_WORKERS", VALIDATION_WORKERS)),
+        "validation_queue_depth": int(os.getenv("API_VALIDATION_QUEUE_DEPTH", VALIDATION_QUEUE_DEPTH))
     }
@@ -3,25 +3,60 @@ Pytest configuration and fixtures for Equipment Status Tracker API tests
 """
 
 import pytest
-import allure
+from helpers.lazy_import import lazy_import
+from helpers.tracing import get_tracer
 from api_client.equipment_api import EquipmentAPIClient
+from config.endpoints import get_config
 from helpers.test_data import create_equipment_payload, get_sample_equipment
 
+allure = lazy_import("allure")
+
 @pytest.fixture(scope="session")
-def api_client():
+def api_client(request):
     """
     Fixture to provide API client instance
     Returns:
         EquipmentAPIClient instance
     """
-    client = EquipmentAPIClient()
+    # Reuse the warm connection pool when running inside worker_daemon.py
+    warm_worker = request.config.pluginmanager.get_plugin("warm_worker")
+    client = EquipmentAPIClient(session=warm_worker.session if warm_worker else None)
+    _export_metrics(request, client)
     
-    # Verify API is accessible
-    if not client.health_check():
-        pytest.skip("API is not accessible")
+    # Verify API is healthy; one probe per TTL is shared by every worker and suite subprocess
+    from api_client.health import cached_health_check
+    health = cached_health_check(client)
+    if not health:
+        pytest.skip(f"API is not healthy: {health.detail}")
     
     return client
 
+def _export_metrics(request, client: EquipmentAPIClient):
+    """Serve live metrics if configured and dump them to a textfile when the session ends"""
+    import os
+    from api_client.metrics import start_metrics_server, worker_metrics_file
+    
+    if client.config["metrics_port"]:
+        # xdist workers listen on consecutive ports: gw0 on the configured one, gw1 on the next...
+        worker = os.getenv("PYTEST_XDIST_WORKER", "gw0")
+        port = client.config["metrics_port"] + int(worker[2:] or 0)
+        server = start_metrics_server(port, client.metrics)
+        print(f"\nMetrics served at http://127.0.0.1:{server.server_address[1]}/metrics")
+        request.addfinalizer(server.shutdown)
+    if client.config["metrics_file"]:
+        request.addfinalizer(lambda: client.metrics.write_textfile(worker_metrics_file(client.config["metrics_file"])))
+
+@pytest.fixture(scope="session")
+def expected_state(api_client):
+    """
+    Fixture to provide the expected state model checking api_client responses
+    Returns:
+        ExpectedStateModel instance
+    """
+    model = api_client.attach_expectations()
+    yield model
+    api_client.observers.remove(model)
+
 @pytest.fixture
 def sample_equipment_data():
     """
@@ -53,12 +88,39 @@ def multiple_equipment_data():
 # Allure reporting hooks
 def pytest_runtest_setup(item):
     """Setup hook for Allure reporting"""
-    allure.dynamic.description(f"Test: {item.name}")
+    # The listener only exists when results are written (--alluredir)
+    if item.config.pluginmanager.has_plugin("allure_listener"):
+        allure.dynamic.description(f"Test: {item.name}")
 
 def pytest_runtest_teardown(item, nextitem):
     """Teardown hook for Allure reporting"""
     pass
 
+# Tracing hooks: test -> fixture setup / call -> request -> validator spans
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Record each test, including its setup and teardown, as a root span"""
+    with get_tracer().span(item.nodeid, "test", **{"test.name": item.name}):
+        yield
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """Record fixture setup, e.g. the api_client health check"""
+    with get_tracer().span(f"fixture {fixturedef.argname}", "fixture", scope=fixturedef.scope):
+        yield
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Record the test body separately from its fixtures"""
+    with get_tracer().span("call", "test"):
+        yield
+
+def pytest_runtest_logreport(report):
+    """Tag the test span with its outcome"""
+    span = get_tracer().current()
+    if span is not None and (report.when == "call" or report.failed):
+        span.set_attribute("test.outcome", report.outcome)
+
 def pytest_configure(config):
     """Register custom markers"""
     config.addinivalue_line("markers", "smoke: Smoke tests")
@@ -75,31 +137,52 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "p1: Priority 1 tests")
     config.addinivalue_line("markers", "p2: Priority 2 tests")
     config.addinivalue_line("markers", "p3: Priority 3 tests")
+    
+    trace_dir = get_config()["trace_dir"]
+    get_tracer().enabled = bool(trace_dir)
+    if trace_dir and not hasattr(config, "workerinput"):
+        # Drop worker traces of an earlier run so they are not merged into this one
+        from helpers.tracing import clear_worker_traces
+        clear_worker_traces(trace_dir)
 
 def pytest_sessionfinish(session, exitstatus):
-    """Generate HTML report after all tests complete"""
-    import subprocess
+    """Export traces and build the HTML report in the background after all tests complete"""
     import os
+    from helpers.report_builder import RESULTS_DIR, LOG_FILE, start_background_build
+    
+    _export_traces(session)
+    # Collection-only sessions (e.g. the suite runner's test selection) produce no results
+    if session.config.option.collectonly:
+        return
+    # Under xdist the controller builds once after every worker has finished
+    if hasattr(session.config, "workerinput"):
+        return
     
     # Check if allure-results exists
-    results_dir = "reports/allure-results"
-    if os.path.exists(results_dir) and os.listdir(results_dir):
-        print("\nGenerating HTML report...")
-        try:
-            # Generate HTML report
-            cmd = [
-                "allure", "generate", 
-                results_dir, 
-                "--clean", 
-                "-o", "reports/allure-report"
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                print(f"✅ Report generated")
-            else:
-                print(f"❌ Failed to generate report: {result.stderr}")
-        except Exception as e:
-            print(f"❌ Error generating HTML report: {e}")
+    if os.path.exists(RESULTS_DIR) and os.listdir(RESULTS_DIR):
+        if start_background_build():
+            print(f"\nBuilding HTML report in the background (log: {LOG_FILE})")
     else:
         print("No Allure results found to generate report from.")
+
+def pytest_unconfigure(config):
+    """Flush the request/response log and stop its writer thread"""
+    from helpers.log_sink import close_log_sink
+    close_log_sink()
+
+def _export_traces(session):
+    """Write this process's spans; the xdist controller merges the workers' files instead"""
+    from helpers.tracing import merge_worker_traces
+    
+    tracer = get_tracer()
+    trace_dir = get_config()["trace_dir"]
+    if not tracer.enabled or not trace_dir or session.config.option.collectonly:
+        return
+    worker = getattr(session.config, "workerinput", {}).get("workerid")
+    if worker:
+        tracer.export(trace_dir, suffix=f"-{worker}", process_name=f"pytest {worker}")
+        return
+    written = merge_worker_traces(trace_dir) or tracer.export(trace_dir)
+    if tracer.dropped:
+        print(f"\n[WARNING] {tracer.dropped} spans were dropped")
+    print(f"\nTrace written to {written[0]} (open in https://ui.perfetto.dev or chrome://tracing)")
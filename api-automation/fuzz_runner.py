@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Fuzz the equipment endpoints with generated and mutated requests
+Failures are grouped by response signature, shrunk to minimal reproducers and written
+to reports/fuzz-findings.json
+
+Usage: python fuzz_runner.py [--cases N] [--duration SECONDS] [--workers N] [--seed N]
+                             [--operations add_equipment,update_status,get_history] [--no-shrink]
+"""
+
+import json
+import os
+import sys
+import time
+
+from api_client.equipment_api import EquipmentAPIClient
+from api_client.health import cached_health_check
+from helpers.cli import known_equipment_ids, pop_option
+from helpers.fuzzing import CaseGenerator, FuzzEngine
+
+FINDINGS_FILE = "reports/fuzz-findings.json"
+DEFAULT_CASES = 2000
+DEFAULT_WORKERS = 16
+
+
+def _known_ids(client: EquipmentAPIClient) -> list:
+    """IDs of a few existing equipment records, or none when listing fails"""
+    try:
+        return known_equipment_ids(client)
+    except Exception as e:
+        print(f"[WARNING] Could not list equipment, fuzzing with ID 1: {e}")
+        return []
+
+
+def main():
+    """Command line interface"""
+    try:
+        duration = pop_option("duration")
+        duration = float(duration) if duration else None
+        cases = pop_option("cases")
+        cases = int(cases) if cases else (None if duration else DEFAULT_CASES)
+        workers = int(pop_option("workers", str(DEFAULT_WORKERS)))
+        seed = int(pop_option("seed", str(int(time.time()))))
+    except ValueError as e:
+        print(f"[ERROR] Invalid option value: {e}")
+        sys.exit(2)
+    operations = pop_option("operations")
+    operations = [name.strip() for name in operations.split(",")] if operations else None
+    shrink = "--no-shrink" not in sys.argv
+
+    client = EquipmentAPIClient()
+    health = cached_health_check(client)
+    if not health:
+        print(f"❌ API is not healthy: {health.detail}")
+        sys.exit(1)
+
+    try:
+        generator = CaseGenerator(seed, operations, _known_ids(client))
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(2)
+    budget = f"{cases} cases" if cases else ""
+    budget += (" or " if budget and duration else "") + (f"{duration:.0f} s" if duration else "")
+    print(f"Fuzzing {', '.join(generator.operations)} at {client.base_url}")
+    print(f"Seed {seed}, {workers} workers, {budget}")
+
+    engine = FuzzEngine(client, generator, workers=workers)
+    findings = engine.run(cases=cases, duration=duration, shrink=shrink)
+
+    rate = engine.sent / engine.elapsed * 60 if engine.elapsed else 0
+    print(f"\nSent {engine.sent} requests in {engine.elapsed:.1f} s ({rate:.0f}/min)")
+    print("Status codes: " + ", ".join(f"{status}: {count}" for status, count in engine.statuses.most_common()))
+
+    os.makedirs(os.path.dirname(FINDINGS_FILE), exist_ok=True)
+    with open(FINDINGS_FILE, "w") as file:
+        json.dump({
+            "base_url": client.base_url,
+            "seed": seed,
+            "operations": generator.operations,
+            "sent": engine.sent,
+            "elapsed_seconds": round(engine.elapsed, 2),
+            "statuses": {str(status): count for status, count in engine.statuses.items()},
+            "findings": [finding.to_dict(client.base_url) for finding in findings]
+        }, file, indent=2, ensure_ascii=False)
+
+    if not findings:
+        print("✅ No failures found")
+        return
+    print(f"\n❌ {len(findings)} distinct failures ({sum(finding.count for finding in findings)} cases):")
+    for finding in findings:
+        operation, kind, status, _ = finding.signature
+        reply = f"HTTP {status}" if status else "no reply"
+        print(f"  {finding.count:6}x  {operation:14} {kind:20} {reply:8}  {finding.message[:80]}")
+        print(f"           {finding.minimal.curl(client.base_url)[:160]}")
+    print(f"\nReproducers written to {FINDINGS_FILE}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
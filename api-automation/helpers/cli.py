@@ -0,0 +1,46 @@
+"""
+Command line helpers shared by the runner scripts
+"""
+
+import sys
+from typing import List, Optional
+
+KNOWN_ID_SAMPLE = 20
+
+
+def pop_option(name: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Remove --name VALUE (or --name=VALUE) from the command line
+    Args:
+        name: Option name without dashes
+        default: Value when the option is absent
+    Returns:
+        Option value, or "" when the flag is last and has no value
+    """
+    flag = f"--{name}"
+    for position, arg in enumerate(sys.argv):
+        if arg == flag or arg.startswith(f"{flag}="):
+            value = arg.split("=", 1)[1] if "=" in arg else (sys.argv[position + 1] if position + 1 < len(sys.argv) else "")
+            del sys.argv[position:position + (1 if "=" in arg else 2)]
+            return value
+    return default
+
+
+def known_equipment_ids(client, limit: int = KNOWN_ID_SAMPLE) -> List[int]:
+    """
+    IDs of a few existing equipment records, streamed so large fleets stay cheap
+    Args:
+        client: EquipmentAPIClient
+        limit: Maximum number of IDs
+    Returns:
+        Up to limit IDs, possibly none
+    """
+    stream = iter(client.iter_all_equipment())
+    ids = []
+    for equipment in stream:
+        ids.append(equipment["id"])
+        if len(ids) >= limit:
+            break
+    # Closing the iterator early releases the connection without reading the rest
+    stream.close()
+    return ids
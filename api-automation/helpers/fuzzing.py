@@ -0,0 +1,561 @@
+"""
+Property-based fuzzing of the equipment endpoints
+Generates valid and mutated payloads, query parameters and IDs from the schemas in
+helpers/validations.py, sends them concurrently, checks every response against the API
+contract, groups failures by response signature and shrinks the first case of each group
+to a minimal reproducer
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from config.endpoints import ENDPOINTS
+from helpers import validations
+
+# What the API should do with a case
+EXPECT_SUCCESS = "success"
+EXPECT_REJECTED = "rejected"
+EXPECT_ANY = "any"  # either, as long as it answers sanely
+
+OPERATIONS = {
+    "add_equipment": {
+        "method": "POST",
+        "path": ENDPOINTS["add_equipment"],
+        "body": validations.EQUIPMENT_PAYLOAD_SCHEMA,
+        "success": 201,
+        "validator": "validate_equipment_response"
+    },
+    "update_status": {
+        "method": "POST",
+        "path": ENDPOINTS["update_status"],
+        "body": validations.STATUS_UPDATE_PAYLOAD_SCHEMA,
+        "success": 200,
+        "validator": "validate_equipment_status_update_response"
+    },
+    "get_history": {
+        "method": "GET",
+        "path": ENDPOINTS["get_history"],
+        "params": validations.HISTORY_PARAMS_SCHEMA,
+        "success": 200,
+        "validator": "validate_equipment_history_response"
+    }
+}
+
+SAMPLE_WORDS = ["Pump", "Conveyor", "Press", "Forklift", "Line", "Warehouse", "Dock", "Site"]
+# Valid by schema, but stress encoding, escaping and storage; the API should accept them
+TRICKY_STRINGS = [
+    "Test@#$%^&*()_+{}|:<>?[]\\;'\",./", "Gerät Ünïcödé", "设备 🚜", "  padded  ", "line\nbreak",
+    "'; DROP TABLE equipment; --", "<script>alert(1)</script>", "%s%n{0}${x}", "\u200b", "nul\u0000byte"
+]
+LONG_STRING_LENGTHS = [256, 4096, 65536]
+# Values of every JSON type; those matching the field's type are skipped
+TYPE_SWAPS = [None, 0, -1, 1.5, True, "", "123", [], ["x"], {}, {"k": "v"}]
+ENUM_VIOLATIONS = ["active", "ACTIVE", "Active ", " Idle", "InvalidStatus", "Under_Maintenance", "", "null"]
+INTEGER_VIOLATIONS = [-1, 0, 2 ** 31, 2 ** 63, 1.5, "1", True]
+# Query strings carry text only; requests drops None and repeats list values
+PARAM_MUTATIONS = ["-1", "0", "abc", "", "1.5", "1e3", " 1", "0x10", "9223372036854775808", ["1", "2"]]
+ID_MUTATIONS = [0, -1, 99999999, 2 ** 63, "abc", "1.5", "1 ", "１", "null", "1;2", "../1", "a" * 300]
+MAX_QUEUED_FACTOR = 2
+MESSAGE_LIMIT = 160
+
+
+def _raw_mutations(body: bytes) -> List[Tuple[str, bytes]]:
+    """Malformed variants of a valid JSON body"""
+    text = body.decode("utf-8")
+    return [
+        ("truncated", body[:max(len(body) // 2, 1)]),
+        ("trailing_comma", (text[:-1] + ",}").encode("utf-8")),
+        ("single_quotes", text.replace('"', "'").encode("utf-8")),
+        ("empty", b""),
+        ("null", b"null"),
+        ("not_json", b"name=Pump&status=Active"),
+        ("duplicate_keys", (text[:-1] + ',"status":"InvalidStatus"}').encode("utf-8")),
+        ("nan", (text[:-1] + ',"extra":NaN}').encode("utf-8")),
+        ("invalid_utf8", body[:-1] + b'\xff\xfe"}'),
+        ("bom", b"\xef\xbb\xbf" + body),
+        ("deep_nesting", b"[" * 5000 + b"]" * 5000),
+    ]
+
+
+def valid_value(schema: Dict[str, Any], rng: random.Random) -> Any:
+    """
+    Generate a value satisfying a (simple) JSON schema
+    Args:
+        schema: Object, string or integer schema as used in helpers/validations.py
+        rng: Random source
+    Returns:
+        Generated value
+    """
+    kind = schema.get("type")
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if kind == "object":
+        required = set(schema.get("required", []))
+        return {name: valid_value(field, rng) for name, field in schema["properties"].items()
+                if name in required or rng.random() < 0.5}
+    if kind == "integer":
+        minimum = schema.get("minimum", 0)
+        return rng.randint(minimum, minimum + 50)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return f"{rng.choice(SAMPLE_WORDS)} {rng.randint(1, 999)}"
+
+
+def _json_type_matches(value: Any, kind: str) -> bool:
+    if kind == "integer":
+        return isinstance(value, int) and not isinstance(value, bool)
+    if kind == "string":
+        return isinstance(value, str)
+    if kind == "object":
+        return isinstance(value, dict)
+    return False
+
+
+class FuzzCase:
+    """One generated request; body is the payload encoded as JSON unless raw bytes are set"""
+
+    __slots__ = ("operation", "equipment_id", "params", "payload", "raw", "mutation", "expect", "index")
+
+    def __init__(self, operation: str, equipment_id: Any = None, params: Optional[Dict[str, Any]] = None,
+                 payload: Any = None, raw: Optional[bytes] = None, mutation: str = "none",
+                 expect: str = EXPECT_SUCCESS, index: int = -1):
+        self.operation = operation
+        self.equipment_id = equipment_id
+        self.params = params
+        self.payload = payload
+        self.raw = raw
+        self.mutation = mutation
+        self.expect = expect
+        self.index = index
+
+    @property
+    def method(self) -> str:
+        return OPERATIONS[self.operation]["method"]
+
+    @property
+    def endpoint(self) -> str:
+        path = OPERATIONS[self.operation]["path"]
+        return path.format(id=quote(str(self.equipment_id), safe="")) if "{id}" in path else path
+
+    def body(self) -> Optional[bytes]:
+        if self.raw is not None:
+            return self.raw
+        if self.method == "GET":
+            return None
+        return json.dumps(self.payload, ensure_ascii=False).encode("utf-8")
+
+    def size(self) -> int:
+        """Rough size used to make sure shrinking always makes progress"""
+        return len(self.body() or b"") + len(json.dumps(self.params)) + len(str(self.equipment_id))
+
+    def replace(self, **changes: Any) -> "FuzzCase":
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return FuzzCase(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        body = self.body()
+        return {
+            "operation": self.operation,
+            "method": self.method,
+            "endpoint": self.endpoint,
+            "params": self.params,
+            "body": body.decode("utf-8", errors="replace") if body is not None else None,
+            "mutation": self.mutation,
+            "expect": self.expect,
+            "index": self.index
+        }
+
+    def curl(self, base_url: str) -> str:
+        """Command line reproducing the request"""
+        query = f"?{urlencode(self.params, doseq=True)}" if self.params else ""
+        command = f"curl -i -X {self.method} '{base_url}{self.endpoint}{query}'"
+        body = self.body()
+        if body is not None:
+            text = body.decode("utf-8", errors="replace").replace("'", "'\\''")
+            command += f" -H 'Content-Type: application/json' --data-binary '{text}'"
+        return command
+
+
+class CaseGenerator:
+    """Deterministic case stream: case(index) is the same for the same seed"""
+
+    def __init__(self, seed: int = 0, operations: Optional[List[str]] = None,
+                 known_ids: Optional[List[int]] = None, mutation_rate: float = 0.8):
+        """
+        Args:
+            seed: Seed of the case stream
+            operations: Keys of OPERATIONS to fuzz, all by default
+            known_ids: IDs of existing equipment, used as the valid IDs
+            mutation_rate: Share of cases that get a mutation
+        """
+        unknown = set(operations or []) - set(OPERATIONS)
+        if unknown:
+            raise ValueError(f"Unknown operations {sorted(unknown)}, expected some of {', '.join(OPERATIONS)}")
+        self.seed = seed
+        self.operations = list(operations or OPERATIONS)
+        self.known_ids = list(known_ids or [1])
+        self.mutation_rate = mutation_rate
+
+    def case(self, index: int) -> FuzzCase:
+        """
+        Generate one case
+        Args:
+            index: Position in the stream
+        Returns:
+            FuzzCase
+        """
+        rng = random.Random(f"{self.seed}:{index}")
+        operation = rng.choice(self.operations)
+        spec = OPERATIONS[operation]
+        case = FuzzCase(
+            operation,
+            equipment_id=rng.choice(self.known_ids) if "{id}" in spec["path"] else None,
+            params=valid_value(spec["params"], rng) if "params" in spec else None,
+            payload=valid_value(spec["body"], rng) if "body" in spec else None,
+            index=index
+        )
+        if rng.random() >= self.mutation_rate:
+            return case
+        targets = [target for target, present in (("body", "body" in spec), ("params", "params" in spec),
+                                                  ("id", case.equipment_id is not None)) if present]
+        target = rng.choice(targets)
+        if target == "id":
+            return case.replace(equipment_id=rng.choice(ID_MUTATIONS), mutation="id", expect=EXPECT_ANY)
+        if target == "params":
+            return self._mutate_params(case, spec["params"], rng)
+        return self._mutate_body(case, spec["body"], rng)
+
+    def __iter__(self) -> Iterator[FuzzCase]:
+        index = 0
+        while True:
+            yield self.case(index)
+            index += 1
+
+    @staticmethod
+    def _mutate_params(case: FuzzCase, schema: Dict[str, Any], rng: random.Random) -> FuzzCase:
+        # The API documents lenient handling of bad paging values, so any sane answer passes
+        params = dict(case.params)
+        if rng.random() < 0.15:
+            params[rng.choice(["page", "sort", "limit[]", "offset "])] = rng.choice(PARAM_MUTATIONS)
+            return case.replace(params=params, mutation="extra_param", expect=EXPECT_ANY)
+        name = rng.choice(list(schema["properties"]))
+        params[name] = rng.choice(PARAM_MUTATIONS)
+        return case.replace(params=params, mutation=f"param:{name}", expect=EXPECT_ANY)
+
+    @staticmethod
+    def _mutate_body(case: FuzzCase, schema: Dict[str, Any], rng: random.Random) -> FuzzCase:
+        payload = dict(case.payload)
+        properties = schema["properties"]
+        strategy = rng.choice(["missing", "null", "type", "enum", "empty", "tricky", "long",
+                               "extra_field", "top_level", "raw", "raw"])
+        if strategy == "raw":
+            kind, raw = rng.choice(_raw_mutations(case.body()))
+            return case.replace(raw=raw, mutation=f"raw:{kind}", expect=EXPECT_REJECTED)
+        if strategy == "top_level":
+            value = rng.choice([[payload], "Pump", 42, True])
+            return case.replace(payload=value, mutation=f"top_level:{type(value).__name__}", expect=EXPECT_REJECTED)
+        if strategy == "extra_field":
+            payload[rng.choice(["id", "lastUpdated", "extra", "__proto__", "status2"])] = rng.choice(TYPE_SWAPS)
+            return case.replace(payload=payload, mutation="extra_field", expect=EXPECT_ANY)
+
+        if strategy == "missing":
+            field = rng.choice(schema["required"])
+            payload.pop(field, None)
+            return case.replace(payload=payload, mutation=f"missing:{field}", expect=EXPECT_REJECTED)
+        if strategy == "enum":
+            fields = [name for name, field in properties.items() if "enum" in field]
+            if fields:
+                field = rng.choice(fields)
+                payload[field] = rng.choice(ENUM_VIOLATIONS)
+                return case.replace(payload=payload, mutation=f"enum:{field}", expect=EXPECT_REJECTED)
+            strategy = "type"
+
+        field = rng.choice(list(properties))
+        kind = properties[field].get("type")
+        is_text = kind == "string" and "enum" not in properties[field]
+        if strategy == "null":
+            payload[field] = None
+            expect = EXPECT_REJECTED if field in schema["required"] else EXPECT_ANY
+        elif strategy == "empty" and properties[field].get("minLength"):
+            payload[field] = ""
+            expect = EXPECT_REJECTED
+        elif strategy == "tricky" and is_text:
+            payload[field] = rng.choice(TRICKY_STRINGS)
+            expect = EXPECT_SUCCESS
+        elif strategy == "long" and is_text:
+            payload[field] = "x" * rng.choice(LONG_STRING_LENGTHS)
+            expect = EXPECT_ANY
+        else:
+            strategy = "type"
+            swaps = INTEGER_VIOLATIONS if kind == "integer" else TYPE_SWAPS
+            payload[field] = rng.choice([value for value in swaps if not _json_type_matches(value, kind)])
+            expect = EXPECT_REJECTED
+        return case.replace(payload=payload, mutation=f"{strategy}:{field}", expect=expect)
+
+
+def _error_message(response) -> str:
+    """Short description of an error response"""
+    try:
+        data = response.json()
+    except ValueError:
+        return response.text[:MESSAGE_LIMIT]
+    if isinstance(data, dict):
+        for key in ("error", "message"):
+            if isinstance(data.get(key), str):
+                return data[key]
+    return json.dumps(data)[:MESSAGE_LIMIT]
+
+
+def check(case: FuzzCase, response) -> Optional[Tuple[str, str]]:
+    """
+    Check a response against the API contract
+    Args:
+        case: Case that was sent
+        response: Response object
+    Returns:
+        None if the response is acceptable, otherwise (failure kind, message)
+    """
+    spec = OPERATIONS[case.operation]
+    status = response.status_code
+    if status >= 500:
+        return "server_error", _error_message(response)
+    if case.expect == EXPECT_SUCCESS and status != spec["success"]:
+        return "rejected_valid", _error_message(response)
+    if case.expect == EXPECT_REJECTED and 200 <= status < 300:
+        return "accepted_invalid", case.mutation
+    if 200 <= status < 300:
+        try:
+            data = response.json()
+        except ValueError:
+            return "non_json_success", response.headers.get("content-type", "")
+        try:
+            getattr(validations, spec["validator"])(data)
+        except (AssertionError, KeyError, TypeError) as e:
+            return "invalid_success_body", f"{type(e).__name__}: {e}"
+    return None
+
+
+def normalize_message(message: str) -> str:
+    """Drop the parts of a message that vary between occurrences of the same failure"""
+    message = re.sub(r"'[^']*'|\"[^\"]*\"", "'…'", message)
+    message = re.sub(r"\d+", "N", message)
+    return " ".join(message.split())[:MESSAGE_LIMIT]
+
+
+class Finding:
+    """Failures sharing one response signature"""
+
+    __slots__ = ("signature", "case", "minimal", "count", "message", "shrink_attempts")
+
+    def __init__(self, signature: Tuple, case: FuzzCase, message: str):
+        self.signature = signature
+        self.case = case
+        self.minimal = case
+        self.count = 1
+        self.message = message
+        self.shrink_attempts = 0
+
+    def to_dict(self, base_url: str) -> Dict[str, Any]:
+        operation, kind, status, _ = self.signature
+        return {
+            "operation": operation,
+            "kind": kind,
+            "status": status,
+            "message": self.message,
+            "count": self.count,
+            "first_case": self.case.to_dict(),
+            "reproducer": self.minimal.to_dict(),
+            "curl": self.minimal.curl(base_url),
+            "shrink_attempts": self.shrink_attempts
+        }
+
+
+class FuzzEngine:
+    """Sends generated cases concurrently and collects deduplicated, shrunk findings"""
+
+    def __init__(self, client, generator: CaseGenerator, workers: int = 16, shrink_budget: int = 64):
+        """
+        Args:
+            client: EquipmentAPIClient; its rate limiter, if configured, paces the run
+            generator: Case stream
+            workers: Requests in flight
+            shrink_budget: Requests spent shrinking each finding
+        """
+        self.client = client
+        self.generator = generator
+        self.workers = workers
+        self.shrink_budget = shrink_budget
+        self.findings: Dict[Tuple, Finding] = {}
+        self.sent = 0
+        self.statuses: Counter = Counter()
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def execute(self, case: FuzzCase) -> Tuple[Optional[int], Optional[Tuple[str, str]]]:
+        """
+        Send one case and check the response
+        Args:
+            case: Case to send
+        Returns:
+            Tuple of (status code or None without a response, failure or None); errors are
+            returned as transport_error failures rather than raised, so one case cannot end a run
+        """
+        try:
+            response = self.client._make_request(case.method, case.endpoint, params=case.params,
+                                                 raw_body=case.body())
+        except Exception as e:
+            return None, ("transport_error", str(e))
+        failure = None
+        try:
+            failure = check(case, response)
+        except Exception as e:
+            failure = ("transport_error", f"{type(e).__name__}: {e}")
+        finally:
+            try:
+                response.close()
+            except Exception as e:
+                failure = failure or ("transport_error", f"{type(e).__name__}: {e}")
+        return response.status_code, failure
+
+    def signature(self, case: FuzzCase) -> Optional[Tuple]:
+        """Send a case and return its failure signature, or None if it passed"""
+        status, failure = self.execute(case)
+        if failure is None:
+            return None
+        return case.operation, failure[0], status, normalize_message(failure[1])
+
+    def _run_case(self, case: FuzzCase) -> None:
+        status, failure = self.execute(case)
+        with self._lock:
+            self.sent += 1
+            self.statuses[status or "error"] += 1
+            if failure is None:
+                return
+            signature = (case.operation, failure[0], status, normalize_message(failure[1]))
+            finding = self.findings.get(signature)
+            if finding is None:
+                self.findings[signature] = Finding(signature, case, failure[1])
+            else:
+                finding.count += 1
+
+    def run(self, cases: Optional[int] = None, duration: Optional[float] = None, shrink: bool = True) -> List[Finding]:
+        """
+        Fuzz until a number of cases were sent or a time budget ran out
+        Args:
+            cases: Cases to send
+            duration: Seconds to run for
+            shrink: Shrink each finding to a minimal reproducer afterwards
+        Returns:
+            Findings, most frequent first
+        """
+        if cases is None and duration is None:
+            raise ValueError("Give a number of cases, a duration or both")
+        started = time.perf_counter()
+        deadline = started + duration if duration is not None else None
+        stream = iter(self.generator)
+        submitted = 0
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="fuzz") as pool:
+            pending = set()
+            while True:
+                exhausted = cases is not None and submitted >= cases
+                expired = deadline is not None and time.perf_counter() >= deadline
+                if not exhausted and not expired and len(pending) < self.workers * MAX_QUEUED_FACTOR:
+                    pending.add(pool.submit(self._run_case, next(stream)))
+                    submitted += 1
+                    continue
+                if not pending:
+                    break
+                done, pending = wait(pending, timeout=0.5 if deadline else None, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+        self.elapsed = time.perf_counter() - started
+
+        findings = sorted(self.findings.values(), key=lambda finding: -finding.count)
+        if shrink:
+            for finding in findings:
+                self.shrink(finding)
+        return findings
+
+    def shrink(self, finding: Finding) -> FuzzCase:
+        """
+        Greedily simplify a finding's case while it keeps failing with the same signature
+        Args:
+            finding: Finding to shrink; its minimal case is updated
+        Returns:
+            Minimal case found within the shrink budget
+        """
+        current = finding.case
+        # Cutting bytes out of a malformed body that was wrongly accepted soon yields a
+        # different malformation, so such bodies are only shrunk field by field
+        reduce_raw = finding.signature[1] != "accepted_invalid"
+        improved = True
+        while improved and finding.shrink_attempts < self.shrink_budget:
+            improved = False
+            for candidate in simplifications(current, reduce_raw):
+                if candidate.size() >= current.size():
+                    continue
+                finding.shrink_attempts += 1
+                if self.signature(candidate) == finding.signature:
+                    current = candidate
+                    improved = True
+                    break
+                if finding.shrink_attempts >= self.shrink_budget:
+                    break
+        finding.minimal = current
+        return current
+
+
+def simplifications(case: FuzzCase, reduce_raw: bool = True) -> Iterator[FuzzCase]:
+    """
+    Candidate simplifications of a case, biggest reductions first
+    Args:
+        case: Case to simplify
+        reduce_raw: Also delete chunks of a raw body (delta debugging)
+    Returns:
+        Iterator of smaller cases with the same operation, mutation and expectation
+    """
+    mutated_field = case.mutation.split(":", 1)[1] if ":" in case.mutation else None
+
+    if reduce_raw and case.raw is not None and len(case.raw) > 1:
+        length = len(case.raw)
+        chunk = length // 2
+        while chunk >= 1:
+            for start in range(0, length, chunk):
+                yield case.replace(raw=case.raw[:start] + case.raw[start + chunk:])
+            chunk //= 2
+
+    if isinstance(case.payload, dict) and case.raw is None:
+        schema = OPERATIONS[case.operation].get("body", {})
+        required = set(schema.get("required", []))
+        for name in case.payload:
+            if name != mutated_field and name not in required:
+                yield case.replace(payload={key: value for key, value in case.payload.items() if key != name})
+        for name, value in case.payload.items():
+            if isinstance(value, str) and len(value) > 1:
+                if name == mutated_field:
+                    shorter = value[:len(value) // 2]
+                else:
+                    # Keep other fields valid: the first enum value or a one-letter string
+                    shorter = schema.get("properties", {}).get(name, {}).get("enum", ["a"])[0]
+                yield case.replace(payload={**case.payload, name: shorter})
+    elif isinstance(case.payload, list) and case.payload:
+        yield case.replace(payload=case.payload[:len(case.payload) // 2])
+
+    if case.params:
+        for name in case.params:
+            if case.mutation == "extra_param" or name != mutated_field:
+                yield case.replace(params={key: value for key, value in case.params.items() if key != name})
+        for name, value in case.params.items():
+            if isinstance(value, str) and len(value) > 1:
+                yield case.replace(params={**case.params, name: value[:len(value) // 2]})
+
+    if isinstance(case.equipment_id, str) and len(case.equipment_id) > 1:
+        yield case.replace(equipment_id=case.equipment_id[:len(case.equipment_id) // 2])
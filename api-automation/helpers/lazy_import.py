@@ -0,0 +1,50 @@
+"""
+Lazy import facility for heavy dependencies
+Defers importing a module until one of its attributes is first used
+"""
+
+import importlib
+import sys
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """Module proxy that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attribute: str):
+        # Only called for attributes not yet copied onto the proxy
+        value = getattr(self._load(), attribute)
+        self.__dict__[attribute] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module on first use
+    Args:
+        name: Fully qualified module name
+    Returns:
+        The module itself if it is already imported, otherwise a lazy proxy
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
@@ -0,0 +1,150 @@
+"""
+Structured request/response logging sink
+Records are queued by the test thread and written as NDJSON by a background
+thread, so logging cost does not depend on response size
+"""
+
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config.endpoints import get_config
+
+LEVELS = {"off": 0, "info": 1, "debug": 2}
+MAX_QUEUED_RECORDS = 10000
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+class LogSink:
+    """Background NDJSON writer with level, sampling and body truncation controls"""
+
+    def __init__(self, path: str, level: str = "info", sample_rate: float = 1.0, body_limit: int = 2048):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown log level '{level}', expected one of {', '.join(LEVELS)}")
+        self.path = path
+        self.level = LEVELS[level]
+        self.sample_rate = sample_rate
+        self.body_limit = body_limit
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=MAX_QUEUED_RECORDS)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Private generator: drawing from the global one would shift seeded test data
+        self._random = random.Random()
+
+    def enabled(self, level: str = "info") -> bool:
+        """Check whether records of a level are written at all"""
+        return self.level >= LEVELS[level]
+
+    def sample(self) -> bool:
+        """Decide whether to log one request/response pair"""
+        return self.level > 0 and (self.sample_rate >= 1.0 or self._random.random() < self.sample_rate)
+
+    def truncate_body(self, body: Optional[bytes]) -> Optional[str]:
+        """
+        Keep the first body_limit bytes of a body
+        Args:
+            body: Raw request or response body
+        Returns:
+            Decoded prefix of the body, or None if there is no body
+        """
+        if not body:
+            return None
+        return body[:self.body_limit].decode("utf-8", errors="replace")
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        """
+        Queue a record without blocking the caller
+        Args:
+            record: JSON-serialisable record
+        """
+        self._ensure_writer()
+        record.setdefault("ts", time.time())
+        record.setdefault("test", os.getenv("PYTEST_CURRENT_TEST", "").split(" ")[0] or None)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # Drop rather than stall the test when the writer falls behind
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Block until every queued record has been written"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write the remaining records and stop the writer thread"""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_writer(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    self._thread = threading.Thread(target=self._write_records, name="log-sink", daemon=True)
+                    self._thread.start()
+
+    def _write_records(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    self._queue.task_done()
+                    break
+                file.write(json.dumps(record, default=str) + "\n")
+                if self._queue.empty():
+                    file.flush()
+                self._queue.task_done()
+            if self.dropped:
+                file.write(json.dumps({"ts": time.time(), "event": "dropped", "count": self.dropped}) + "\n")
+
+
+def get_log_sink() -> LogSink:
+    """
+    Get the process-wide log sink configured from get_config()
+    Returns:
+        Shared LogSink instance
+    """
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                config = get_config()
+                path = config["log_file"]
+                # Each xdist worker gets its own file so lines never interleave
+                worker = os.getenv("PYTEST_XDIST_WORKER")
+                if worker:
+                    root, extension = os.path.splitext(path)
+                    path = f"{root}-{worker}{extension}"
+                _sink = LogSink(path, config["log_level"], config["log_sample_rate"], config["log_body_limit"])
+                atexit.register(_sink.close)
+    return _sink
+
+
+def close_log_sink() -> None:
+    """
+    Flush and close the process-wide log sink, if one was created
+    Long-lived processes that run several sessions (worker_daemon.py) re-import this module
+    for every run, so each session closes its sink instead of leaving the writer thread,
+    its open file and an atexit entry behind
+    """
+    global _sink
+    with _sink_lock:
+        sink, _sink = _sink, None
+    if sink is not None:
+        atexit.unregister(sink.close)
+        sink.close()
@@ -0,0 +1,144 @@
+"""
+Incremental Allure report builds
+Result files are content-hashed against the last build, so the report is only regenerated
+when results changed; builds run in a background process and are serialized by a file lock
+
+Usage: python -m helpers.report_builder [--force]
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+from helpers.file_lock import FileLock
+
+RESULTS_DIR = "reports/allure-results"
+REPORT_DIR = "reports/allure-report"
+MANIFEST_FILE = "reports/.allure-build.json"
+LOCK_FILE = "reports/.allure-build.lock"
+LOG_FILE = "reports/report-build.log"
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def results_manifest(results_dir: str, previous: Optional[Dict[str, List]] = None) -> Dict[str, List]:
+    """
+    Hash every result file, reusing hashes of files whose size and mtime are unchanged
+    Args:
+        results_dir: Allure results directory
+        previous: Manifest of the last build
+    Returns:
+        Dictionary of file name to [size, mtime_ns, sha1]
+    """
+    previous = previous or {}
+    manifest = {}
+    with os.scandir(results_dir) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+            known = previous.get(entry.name)
+            if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+                manifest[entry.name] = known
+            else:
+                manifest[entry.name] = [stat.st_size, stat.st_mtime_ns, _file_digest(entry.path)]
+    return manifest
+
+
+def _load_manifest() -> Dict[str, List]:
+    try:
+        with open(MANIFEST_FILE, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _content_changed(old: Dict[str, List], new: Dict[str, List]) -> bool:
+    """Compare manifests by content only; a touched but identical file is not a change"""
+    return {name: entry[2] for name, entry in old.items()} != {name: entry[2] for name, entry in new.items()}
+
+
+def build_report(results_dir: str = RESULTS_DIR, report_dir: str = REPORT_DIR, force: bool = False) -> bool:
+    """
+    Regenerate the Allure report if the results changed since the last build
+    Args:
+        results_dir: Allure results directory
+        report_dir: Report output directory
+        force: Rebuild even if the results are unchanged
+    Returns:
+        True if the report is up to date
+    """
+    if not os.path.isdir(results_dir) or not os.listdir(results_dir):
+        print("No Allure results found to generate report from.")
+        return False
+
+    # Concurrent sessions queue here; whoever comes second usually finds nothing new
+    with FileLock(LOCK_FILE):
+        previous = _load_manifest()
+        manifest = results_manifest(results_dir, previous)
+        new_files = len(manifest.keys() - previous.keys())
+        if not force and os.path.isdir(report_dir) and not _content_changed(previous, manifest):
+            print("✅ Report is up to date")
+            _save_manifest(manifest)
+            return True
+
+        print(f"Generating HTML report ({new_files} new of {len(manifest)} result files)...")
+        staging_dir = f"{report_dir}.tmp"
+        try:
+            result = subprocess.run(["allure", "generate", results_dir, "--clean", "-o", staging_dir],
+                                    capture_output=True, text=True)
+        except OSError as e:
+            print(f"❌ Error generating HTML report: {e}")
+            return False
+        if result.returncode != 0:
+            print(f"❌ Failed to generate report: {result.stderr}")
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return False
+
+        # Swap the finished report in so a running server never sees a half-written one
+        retired_dir = f"{report_dir}.old"
+        shutil.rmtree(retired_dir, ignore_errors=True)
+        if os.path.isdir(report_dir):
+            os.replace(report_dir, retired_dir)
+        os.replace(staging_dir, report_dir)
+        shutil.rmtree(retired_dir, ignore_errors=True)
+        _save_manifest(manifest)
+        print("✅ Report generated")
+        return True
+
+
+def _save_manifest(manifest: Dict[str, List]) -> None:
+    with open(MANIFEST_FILE, "w") as file:
+        json.dump(manifest, file)
+
+
+def start_background_build() -> Optional[subprocess.Popen]:
+    """
+    Build the report in a detached process so the caller can exit straight away
+    Returns:
+        The build process, or None if it could not be started
+    """
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+    detach = {"start_new_session": True} if os.name == "posix" else \
+        {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    try:
+        with open(LOG_FILE, "a") as log:
+            return subprocess.Popen([sys.executable, "-m", "helpers.report_builder"],
+                                    stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, **detach)
+    except OSError as e:
+        print(f"❌ Could not start report build: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    sys.exit(0 if build_report(force="--force" in sys.argv[1:]) else 1)
@@ -0,0 +1,334 @@
+"""
+Client-side resource sampling for soak runs
+A background thread samples resident memory, open file descriptors, connection pool
+state, tracemalloc totals and request latency at a fixed interval. Growth slopes fitted
+over the samples after a warm-up flag leaks, and the samples are kept as a time series
+so latency drift can be lined up against resource growth
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+HOUR = 3600.0
+# Samples after warm-up needed before a slope is trusted
+MIN_SLOPE_SAMPLES = 3
+# Growth thresholds are expressed per hour, in these units
+SLOPE_UNITS = {
+    "rss_bytes": ("rss_mb_per_hour", 1024 * 1024, "MB"),
+    "open_fds": ("fds_per_hour", 1, "fds"),
+    "connections": ("connections_per_hour", 1, "connections"),
+    "traced_bytes": ("traced_mb_per_hour", 1024 * 1024, "MB"),
+    "latency_p95_ms": ("latency_p95_ms_per_hour", 1, "ms")
+}
+
+
+def rss_bytes() -> int:
+    """
+    Resident set size of this process
+    Returns:
+        Bytes; the peak RSS where the current value is not available (non-Linux)
+    """
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def open_fds() -> Tuple[int, int]:
+    """
+    Open file descriptors of this process
+    Returns:
+        Tuple of (descriptors, sockets); (0, 0) where /proc or /dev/fd is unavailable
+    """
+    for directory in ("/proc/self/fd", "/dev/fd"):
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        sockets = 0
+        for name in names:
+            try:
+                sockets += os.readlink(os.path.join(directory, name)).startswith("socket:")
+            except OSError:
+                pass
+        # The listing itself holds one descriptor open while it runs
+        return max(len(names) - 1, 0), sockets
+    return 0, 0
+
+
+def pool_stats(session) -> Dict[str, int]:
+    """
+    Connection pool state of a client session
+    Args:
+        session: requests.Session or transports.Http2Session
+    Returns:
+        Dictionary with pools (one per host), connections (open) and idle (open and unused)
+    """
+    stats = {"pools": 0, "connections": 0, "idle": 0}
+    for adapter in getattr(session, "adapters", {}).values():
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            queue = getattr(pool, "pool", None)
+            if queue is None:
+                continue
+            # Checked-out connections are missing from the queue; idle ones wait in it
+            idle = sum(1 for connection in list(queue.queue)
+                       if connection is not None and getattr(connection, "sock", None) is not None)
+            stats["pools"] += 1
+            stats["idle"] += idle
+            stats["connections"] += idle + queue.maxsize - queue.qsize()
+    # Http2Session: httpx client -> HTTPTransport -> httpcore ConnectionPool
+    connection_pool = getattr(getattr(getattr(session, "_client", None), "_transport", None), "_pool", None)
+    if connection_pool is not None:
+        connections = list(connection_pool.connections)
+        stats["pools"] += 1
+        stats["connections"] += len(connections)
+        stats["idle"] += sum(1 for connection in connections if connection.is_idle())
+    return stats
+
+
+def fit_slope(points: List[Tuple[float, float]]) -> float:
+    """
+    Least-squares slope of (x, y) points
+    Args:
+        points: Pairs of x and y values
+    Returns:
+        Change of y per unit of x; 0 for fewer than two distinct x values
+    """
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def correlation(pairs: List[Tuple[float, float]]) -> Optional[float]:
+    """Pearson correlation of paired values, None when either side is constant"""
+    if len(pairs) < 2:
+        return None
+    mean_a = sum(a for a, _ in pairs) / len(pairs)
+    mean_b = sum(b for _, b in pairs) / len(pairs)
+    spread_a = sum((a - mean_a) ** 2 for a, _ in pairs)
+    spread_b = sum((b - mean_b) ** 2 for _, b in pairs)
+    if spread_a == 0 or spread_b == 0:
+        return None
+    return sum((a - mean_a) * (b - mean_b) for a, b in pairs) / (spread_a * spread_b) ** 0.5
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class ResourceMonitor:
+    """Samples process and client resources from a background thread"""
+
+    def __init__(self, client, interval: float = 10.0, warmup: float = 60.0,
+                 trace_allocations: bool = True, top_allocators: int = 5, metrics=None):
+        """
+        Args:
+            client: EquipmentAPIClient whose session pools are sampled
+            interval: Seconds between samples
+            warmup: Seconds of start-up growth (imports, pool fill, caches) left out of the slopes
+            trace_allocations: Track Python allocations with tracemalloc; costs some throughput
+            top_allocators: Source lines with the most allocation growth kept per sample
+            metrics: Registry to publish the latest sample as gauges in, e.g. for live scraping
+        """
+        self.client = client
+        self.interval = interval
+        self.warmup = warmup
+        self.trace_allocations = trace_allocations
+        self.top_allocators = top_allocators
+        self.samples: List[Dict[str, Any]] = []
+        self._latencies: List[float] = []
+        self._errors = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._baseline = None
+        self._gauge = metrics.gauge("soak_resource", "Latest soak sample of client resources",
+                                    ["resource"]) if metrics is not None else None
+
+    def start(self) -> "ResourceMonitor":
+        """Take the first sample and start sampling in the background"""
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._started = time.monotonic()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="resource-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop sampling, taking a final sample"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sample()
+        if self.trace_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def __enter__(self) -> "ResourceMonitor":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def record(self, seconds: float, ok: bool = True) -> None:
+        """
+        Record one client call of the workload
+        Args:
+            seconds: Call duration
+            ok: False if the call failed
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+            if not ok:
+                self._errors += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> Dict[str, Any]:
+        """
+        Take one sample; request counts and latencies cover the calls since the previous one
+        Returns:
+            The sample, also appended to samples
+        """
+        with self._lock:
+            latencies, self._latencies = sorted(self._latencies), []
+            errors, self._errors = self._errors, 0
+        elapsed = time.monotonic() - self._started
+        fds, sockets = open_fds()
+        sample = {
+            "elapsed": round(elapsed, 3),
+            "timestamp": time.time(),
+            "rss_bytes": rss_bytes(),
+            "open_fds": fds,
+            "sockets": sockets,
+            "threads": threading.active_count(),
+            **pool_stats(self.client.session),
+            "requests": len(latencies),
+            "errors": errors,
+            "latency_p50_ms": round(_percentile(latencies, 0.5) * 1000, 2),
+            "latency_p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+            "latency_max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0
+        }
+        if self.trace_allocations and tracemalloc.is_tracing():
+            sample["traced_bytes"] = tracemalloc.get_traced_memory()[0]
+            sample["top_allocators"] = self._allocation_growth(elapsed)
+        if self._gauge is not None:
+            for resource, value in sample.items():
+                if isinstance(value, (int, float)) and resource not in ("elapsed", "timestamp"):
+                    self._gauge.set(value, resource=resource)
+        self.samples.append(sample)
+        return sample
+
+    def _allocation_growth(self, elapsed: float) -> List[Dict[str, Any]]:
+        """Source lines whose allocations grew most since the end of warm-up"""
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")
+        ])
+        if self._baseline is None or elapsed < self.warmup:
+            self._baseline = snapshot
+            return []
+        growth = [difference for difference in snapshot.compare_to(self._baseline, "lineno")
+                  if difference.size_diff > 0][:self.top_allocators]
+        return [{
+            "location": f"{difference.traceback[0].filename}:{difference.traceback[0].lineno}",
+            "size_diff": difference.size_diff,
+            "count_diff": difference.count_diff
+        } for difference in growth]
+
+    def slopes(self) -> Dict[str, float]:
+        """
+        Growth of each tracked resource after warm-up, fitted by least squares
+        Returns:
+            Dictionary of threshold name (see SLOPE_UNITS) to growth per hour; empty until
+            enough samples were taken after warm-up
+        """
+        steady = [sample for sample in self.samples if sample["elapsed"] >= self.warmup]
+        if len(steady) < MIN_SLOPE_SAMPLES:
+            return {}
+        slopes = {}
+        for field, (name, scale, _) in SLOPE_UNITS.items():
+            points = [(sample["elapsed"], sample[field]) for sample in steady
+                      if field in sample and (field != "latency_p95_ms" or sample["requests"])]
+            if len(points) >= MIN_SLOPE_SAMPLES:
+                slopes[name] = fit_slope(points) * HOUR / scale
+        return slopes
+
+    def check(self, thresholds: Dict[str, float]) -> List[str]:
+        """
+        Compare growth slopes with thresholds
+        Args:
+            thresholds: Maximum growth per hour by threshold name; 0 or missing disables a check
+        Returns:
+            One message per exceeded threshold
+        """
+        slopes = self.slopes()
+        violations = []
+        for field, (name, _, unit) in SLOPE_UNITS.items():
+            limit = thresholds.get(name, 0)
+            if limit and name in slopes and slopes[name] > limit:
+                violations.append(f"{field} grows {slopes[name]:.2f} {unit}/hour (limit {limit:g})")
+        return violations
+
+    def latency_correlations(self) -> Dict[str, Optional[float]]:
+        """Correlation of p95 latency with each resource over the samples that carried requests"""
+        active = [sample for sample in self.samples if sample["requests"]]
+        return {field: correlation([(sample[field], sample["latency_p95_ms"]) for sample in active
+                                    if field in sample])
+                for field in SLOPE_UNITS if field != "latency_p95_ms"}
+
+    def write_timeseries(self, path: str) -> str:
+        """
+        Write the samples as NDJSON, one sample per line
+        Args:
+            path: Output file
+        Returns:
+            The path written
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as file:
+            for sample in self.samples:
+                file.write(json.dumps(sample) + "\n")
+        return path
+
+
+def soak_thresholds(config: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Growth thresholds from get_config()
+    Args:
+        config: Configuration dictionary
+    Returns:
+        Dictionary accepted by ResourceMonitor.check
+    """
+    return {name: config[f"soak_max_{name}"] for name, _, _ in SLOPE_UNITS.values()}
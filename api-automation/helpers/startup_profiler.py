@@ -0,0 +1,184 @@
+"""
+Startup profiling for the API test harness
+Loaded as a pytest plugin (-p helpers.startup_profiler) to time pytest_configure,
+collection and fixture setup, and combined with `python -X importtime` output into
+a ranked report and a flamegraph-compatible folded stack file
+"""
+
+import glob
+import json
+import os
+import re
+import shutil
+import time
+from typing import Dict, Any, List
+
+import pytest
+
+PROFILE_DIR_ENV = "STARTUP_PROFILE_DIR"
+DEFAULT_PROFILE_DIR = "reports/startup-profile"
+IMPORT_LOG_FILE = "imports.log"
+REPORT_FILE = "startup-profile.txt"
+FOLDED_FILE = "startup-profile.folded"
+TOP_ENTRIES = 25
+
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+# Phase timings for this process, in microseconds
+_phases: Dict[str, int] = {}
+_fixtures: Dict[str, Dict[str, Any]] = {}
+_configure_started = 0.0
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Mark the start of configuration; historic hooks cannot be wrapped"""
+    global _configure_started
+    _configure_started = time.perf_counter()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionstart(session):
+    """Every pytest_configure implementation, including conftest's, has run"""
+    _phases["configure"] = int((time.perf_counter() - _configure_started) * 1_000_000)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    """Time test collection"""
+    started = time.perf_counter()
+    yield
+    _phases["collection"] = int((time.perf_counter() - started) * 1_000_000)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """Time fixture setup, e.g. the api_client health check"""
+    started = time.perf_counter()
+    yield
+    elapsed = int((time.perf_counter() - started) * 1_000_000)
+    stats = _fixtures.setdefault(fixturedef.argname, {"scope": fixturedef.scope, "calls": 0, "total_us": 0})
+    stats["calls"] += 1
+    stats["total_us"] += elapsed
+
+
+def pytest_unconfigure(config):
+    """Write this process's phase timings for the runner to merge"""
+    output_dir = os.getenv(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, f"pytest-phases-{os.getpid()}.json"), "w") as file:
+        json.dump({"phases": _phases, "fixtures": _fixtures}, file, indent=2)
+
+
+def reset_profile_dir(output_dir: str = DEFAULT_PROFILE_DIR) -> str:
+    """
+    Start a fresh profile directory so timings from earlier runs are not merged
+    Args:
+        output_dir: Profile output directory
+    Returns:
+        Path of the import log the profiled process should write to
+    """
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.makedirs(output_dir)
+    return os.path.join(output_dir, IMPORT_LOG_FILE)
+
+
+def parse_import_times(log_text: str) -> List[Dict[str, Any]]:
+    """
+    Parse `python -X importtime` output
+    Args:
+        log_text: stderr of the profiled process
+    Returns:
+        List of import records (module, self_us, cumulative_us, depth) in log order
+    """
+    records = []
+    for line in log_text.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            records.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": (len(match.group(3)) - 1) // 2
+            })
+    return records
+
+
+def folded_import_stacks(records: List[Dict[str, Any]]) -> List[str]:
+    """
+    Convert import records to folded stacks ("a;b;c <self_us>")
+    Args:
+        records: Output of parse_import_times
+    Returns:
+        List of folded stack lines
+    """
+    # importtime logs children before their parent; walking the log backwards
+    # visits every parent before its children
+    stack: List[str] = []
+    lines = []
+    for record in reversed(records):
+        del stack[record["depth"]:]
+        stack.append(record["module"])
+        lines.append(f"imports;{';'.join(stack)} {record['self_us']}")
+    return list(reversed(lines))
+
+
+def write_startup_report(output_dir: str = DEFAULT_PROFILE_DIR) -> str:
+    """
+    Merge the import log and pytest phase timings into the ranked report
+    Args:
+        output_dir: Directory holding imports.log and pytest-phases-*.json
+    Returns:
+        Path of the ranked report
+    """
+    import_log = os.path.join(output_dir, IMPORT_LOG_FILE)
+    records = []
+    if os.path.exists(import_log):
+        with open(import_log, "r", errors="replace") as file:
+            records = parse_import_times(file.read())
+
+    phases: Dict[str, int] = {}
+    fixtures: Dict[str, Dict[str, Any]] = {}
+    for path in glob.glob(os.path.join(output_dir, "pytest-phases-*.json")):
+        with open(path, "r") as file:
+            timings = json.load(file)
+        for phase, elapsed in timings["phases"].items():
+            phases[phase] = phases.get(phase, 0) + elapsed
+        for name, stats in timings["fixtures"].items():
+            merged = fixtures.setdefault(name, {"scope": stats["scope"], "calls": 0, "total_us": 0})
+            merged["calls"] += stats["calls"]
+            merged["total_us"] += stats["total_us"]
+
+    top_level = [record for record in records if record["depth"] == 0]
+    lines = [
+        "Startup Profile",
+        "=" * 60,
+        f"Total import time: {sum(r['cumulative_us'] for r in top_level) / 1000:.1f} ms",
+        ""
+    ]
+    for phase, elapsed in sorted(phases.items(), key=lambda item: -item[1]):
+        lines.append(f"pytest {phase}: {elapsed / 1000:.1f} ms")
+
+    lines.extend(["", "Top-level imports by cumulative time", "-" * 60])
+    for record in sorted(top_level, key=lambda r: -r["cumulative_us"])[:TOP_ENTRIES]:
+        lines.append(f"{record['cumulative_us'] / 1000:10.1f} ms  {record['module']}")
+
+    lines.extend(["", "Modules by self time", "-" * 60])
+    for record in sorted(records, key=lambda r: -r["self_us"])[:TOP_ENTRIES]:
+        lines.append(f"{record['self_us'] / 1000:10.1f} ms  {record['module']}")
+
+    lines.extend(["", "Fixture setup time", "-" * 60])
+    for name, stats in sorted(fixtures.items(), key=lambda item: -item[1]["total_us"]):
+        lines.append(f"{stats['total_us'] / 1000:10.1f} ms  {name} ({stats['scope']}, {stats['calls']} calls)")
+
+    report_path = os.path.join(output_dir, REPORT_FILE)
+    with open(report_path, "w") as file:
+        file.write("\n".join(lines) + "\n")
+
+    folded = folded_import_stacks(records)
+    folded.extend(f"pytest;{phase} {elapsed}" for phase, elapsed in phases.items())
+    folded.extend(f"pytest;fixture_setup;{name} {stats['total_us']}" for name, stats in fixtures.items())
+    with open(os.path.join(output_dir, FOLDED_FILE), "w") as file:
+        file.write("\n".join(folded) + "\n")
+
+    return report_path
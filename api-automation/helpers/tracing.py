@@ -0,0 +1,324 @@
+"""
+Lightweight span tracing for the API test harness
+Records nested spans (test, fixture setup, HTTP request, validator) per thread and exports
+them as Chrome trace-event JSON (chrome://tracing, Perfetto) and as OTLP JSON
+"""
+
+import functools
+import glob
+import json
+import os
+import secrets
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+CHROME_TRACE_FILE = "trace{suffix}.json"
+OTLP_TRACE_FILE = "trace{suffix}.otlp.json"
+SERVICE_NAME = "api-automation"
+# Spans kept in memory before new ones are dropped, e.g. in long-lived pool workers
+MAX_SPANS = 200000
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def _new_id(bits: int) -> str:
+    # Independent of the global random module, which tests seed; all-zero IDs are invalid in OTLP
+    return f"{secrets.randbits(bits) or 1:0{bits // 4}x}"
+
+
+class Span:
+    """One timed operation; use as a context manager to time and record it"""
+
+    __slots__ = ("tracer", "name", "category", "attributes", "trace_id", "span_id", "parent_id",
+                 "thread_id", "start_ns", "duration_ns", "error", "_started")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.trace_id = ""
+        self.span_id = ""
+        self.parent_id = ""
+        self.thread_id = 0
+        self.start_ns = 0
+        self.duration_ns = 0
+        self.error: Optional[str] = None
+        self._started = 0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        stack = self.tracer._stack()
+        parent = stack[-1] if stack else None
+        self.trace_id = parent.trace_id if parent else _new_id(128)
+        self.parent_id = parent.span_id if parent else ""
+        self.span_id = _new_id(64)
+        self.thread_id = threading.get_ident()
+        stack.append(self)
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.duration_ns = time.perf_counter_ns() - self._started
+        if exc_type is not None and self.error is None:
+            self.error = f"{exc_type.__name__}: {exc_value}"
+        stack = self.tracer._stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        self.tracer._finish(self)
+
+
+class _NoopSpan:
+    """Stands in for Span while tracing is disabled"""
+
+    __slots__ = ()
+    error = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Collects finished spans in memory; nesting follows the per-thread stack of open spans"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.dropped = 0
+        self._spans: List[Span] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            if len(self._spans) < MAX_SPANS:
+                self._spans.append(span)
+            else:
+                self.dropped += 1
+
+    def span(self, name: str, category: str = "internal", **attributes: Any):
+        """
+        Start a span, nested under the current span of this thread
+        Args:
+            name: Span name, e.g. the test node ID or "GET /api/equipment"
+            category: test, fixture, http, validation...
+            attributes: Span attributes
+        Returns:
+            Context manager yielding the Span
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, category, attributes)
+
+    def current(self) -> Optional[Span]:
+        """Return the innermost open span of this thread"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self.dropped = 0
+
+    def chrome_trace(self, process_name: str = "pytest") -> Dict[str, Any]:
+        """
+        Build a Chrome trace-event document of complete ("X") events
+        Args:
+            process_name: Name shown for this process's track
+        Returns:
+            JSON-serializable trace document
+        """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {"ph": "M", "name": "process_name", "pid": pid, "tid": 0, "args": {"name": process_name}}
+        ]
+        threads = {}
+        for span in self.spans:
+            tid = threads.setdefault(span.thread_id, len(threads) + 1)
+            args = dict(span.attributes)
+            if span.error:
+                args["error"] = span.error
+            events.append({
+                "ph": "X",
+                "name": span.name,
+                "cat": span.category,
+                "pid": pid,
+                "tid": tid,
+                "ts": span.start_ns / 1000,
+                "dur": span.duration_ns / 1000,
+                "args": args
+            })
+        events.extend({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": f"thread {tid}"}}
+                      for tid in threads.values())
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def otlp_trace(self, process_name: str = "pytest") -> Dict[str, Any]:
+        """
+        Build an OTLP/JSON ExportTraceServiceRequest document
+        Args:
+            process_name: Recorded as the process.executable.name resource attribute
+        Returns:
+            JSON-serializable trace document
+        """
+        resource = {"attributes": [
+            _otlp_attribute("service.name", SERVICE_NAME),
+            _otlp_attribute("process.pid", os.getpid()),
+            _otlp_attribute("process.executable.name", process_name)
+        ]}
+        spans = [{
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "parentSpanId": span.parent_id,
+            "name": span.name,
+            "kind": SPAN_KIND_CLIENT if span.category == "http" else SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.start_ns + span.duration_ns),
+            "attributes": [_otlp_attribute("category", span.category)] +
+                          [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+            "status": {"code": STATUS_ERROR, "message": span.error} if span.error else {"code": STATUS_OK}
+        } for span in self.spans]
+        return {"resourceSpans": [{
+            "resource": resource,
+            "scopeSpans": [{"scope": {"name": "helpers.tracing"}, "spans": spans}]
+        }]}
+
+    def export(self, directory: str, suffix: str = "", process_name: str = "pytest") -> List[str]:
+        """
+        Write the recorded spans as Chrome trace and OTLP JSON files
+        Args:
+            directory: Output directory
+            suffix: File name suffix, e.g. "-gw0" for an xdist worker
+            process_name: Name of this process in the trace viewers
+        Returns:
+            Paths written
+        """
+        os.makedirs(directory, exist_ok=True)
+        written = []
+        for template, document in ((CHROME_TRACE_FILE, self.chrome_trace(process_name)),
+                                   (OTLP_TRACE_FILE, self.otlp_trace(process_name))):
+            path = os.path.join(directory, template.format(suffix=suffix))
+            _write_json(path, document)
+            written.append(path)
+        return written
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def _write_json(path: str, document: Dict[str, Any]) -> None:
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(document, file)
+    os.replace(temporary, path)
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer; disabled until the test session enables it"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+        return _tracer
+
+
+def traced(name: Optional[str] = None, category: str = "validation") -> Callable:
+    """
+    Decorator recording every call of a function as a span
+    Args:
+        name: Span name, the function name by default
+        category: Span category
+    Returns:
+        Decorator
+    """
+    def decorator(function: Callable) -> Callable:
+        span_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            if not tracer.enabled:
+                return function(*args, **kwargs)
+            with tracer.span(span_name, category):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _worker_trace_files(directory: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, "trace-gw*.json")))
+
+
+def clear_worker_traces(directory: str) -> None:
+    """Remove per-worker trace files left by an earlier run"""
+    for path in _worker_trace_files(directory):
+        os.remove(path)
+
+
+def merge_worker_traces(directory: str) -> List[str]:
+    """
+    Merge the per-worker files of an xdist run into one Chrome trace and one OTLP file
+    Args:
+        directory: Trace directory holding trace-gw*.json and trace-gw*.otlp.json
+    Returns:
+        Paths written; empty if there were no worker files
+    """
+    worker_files = _worker_trace_files(directory)
+    chrome_files = [path for path in worker_files if not path.endswith(".otlp.json")]
+    otlp_files = [path for path in worker_files if path.endswith(".otlp.json")]
+    written = []
+    if chrome_files:
+        events = []
+        for path in chrome_files:
+            with open(path, "r") as file:
+                events.extend(json.load(file)["traceEvents"])
+        merged = os.path.join(directory, CHROME_TRACE_FILE.format(suffix=""))
+        _write_json(merged, {"traceEvents": events, "displayTimeUnit": "ms"})
+        written.append(merged)
+    if otlp_files:
+        resource_spans = []
+        for path in otlp_files:
+            with open(path, "r") as file:
+                resource_spans.extend(json.load(file)["resourceSpans"])
+        merged = os.path.join(directory, OTLP_TRACE_FILE.format(suffix=""))
+        _write_json(merged, {"resourceSpans": resource_spans})
+        written.append(merged)
+    return written
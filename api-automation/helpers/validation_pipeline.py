@@ -0,0 +1,200 @@
+"""
+Opt-in validation pipeline for large responses
+Hands raw response bytes to a process pool so decoding and validation run on other cores,
+while the request loop only waits when too many validations are already in flight
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from config.endpoints import get_config
+
+# Response kind -> validator in helpers.validations
+VALIDATORS = {
+    "equipment": "validate_equipment_response",
+    "equipment_list": "validate_get_all_equipment_response",
+    "status_update": "validate_equipment_status_update_response",
+    "history": "validate_equipment_history_response"
+}
+
+
+def _validate_raw(kind: str, body: bytes, codec_name: str) -> Optional[str]:
+    """
+    Decode and validate one response body; runs in a worker process
+    Args:
+        kind: Key of VALIDATORS
+        body: Raw response body
+        codec_name: JSON codec to decode with
+    Returns:
+        None if valid, otherwise the failure message
+    """
+    from api_client.json_codec import get_json_codec
+    from helpers import validations
+
+    try:
+        response_data = get_json_codec(codec_name).loads(body)
+    except ValueError as e:
+        return f"Response is not valid JSON: {e}"
+    try:
+        getattr(validations, VALIDATORS[kind])(response_data)
+    except (AssertionError, KeyError, TypeError) as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+class ValidationResult:
+    """Outcome of one pipelined validation"""
+
+    __slots__ = ("kind", "label", "error", "elapsed")
+
+    def __init__(self, kind: str, label: str, error: Optional[str], elapsed: float):
+        self.kind = kind
+        self.label = label
+        self.error = error
+        # Seconds from submission to result, including time queued
+        self.elapsed = elapsed
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f"ValidationResult(kind={self.kind!r}, label={self.label!r}, passed={self.passed})"
+
+
+class ValidationPipeline:
+    """Validates response bodies on a process pool with bounded queue depth"""
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 on_result: Optional[Callable[[ValidationResult], None]] = None):
+        """
+        Args:
+            workers: Worker processes; 0 validates inline on the calling thread.
+                     Defaults to the validation_workers setting
+            max_pending: Validations in flight before submit() blocks. Defaults to the
+                         validation_queue_depth setting, or twice the workers when that is 0
+            on_result: Called with each ValidationResult as it completes, on a pool thread
+        """
+        config = get_config()
+        self.workers = config["validation_workers"] if workers is None else workers
+        if self.workers < 0:
+            self.workers = os.cpu_count() or 1
+        depth = config["validation_queue_depth"] if max_pending is None else max_pending
+        self.max_pending = depth or 2 * max(self.workers, 1)
+        self.codec_name = config["json_codec"]
+        self.on_result = on_result
+
+        self.results: List[ValidationResult] = []
+        # Seconds submit() spent waiting for a free slot
+        self.blocked_seconds = 0.0
+        self.peak_pending = 0
+        self._pending: Dict[Future, None] = {}
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers else None
+
+    def submit(self, kind: str, body: bytes, label: str = "") -> None:
+        """
+        Queue a response body for validation, blocking while the queue is full
+        Args:
+            kind: Response kind, a key of VALIDATORS
+            body: Raw response body
+            label: Shown with failures, e.g. the request line
+        """
+        if kind not in VALIDATORS:
+            raise ValueError(f"Unknown response kind '{kind}', expected one of {list(VALIDATORS)}")
+        submitted = time.perf_counter()
+
+        if self._executor is None:
+            self._record(ValidationResult(kind, label, _validate_raw(kind, body, self.codec_name),
+                                          time.perf_counter() - submitted))
+            return
+
+        if not self._slots.acquire(blocking=False):
+            self._slots.acquire()
+            with self._lock:
+                self.blocked_seconds += time.perf_counter() - submitted
+        try:
+            future = self._executor.submit(_validate_raw, kind, body, self.codec_name)
+        except BaseException:
+            # E.g. BrokenProcessPool after a worker died; the slot would otherwise be lost for good
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending[future] = None
+            self.peak_pending = max(self.peak_pending, len(self._pending))
+        future.add_done_callback(lambda done: self._complete(done, kind, label, submitted))
+
+    def submit_response(self, kind: str, response) -> None:
+        """
+        Queue a requests.Response body for validation
+        Args:
+            kind: Response kind, a key of VALIDATORS
+            response: Response object
+        """
+        self.submit(kind, response.content, f"{response.request.method} {response.url}")
+
+    def _complete(self, future: Future, kind: str, label: str, submitted: float) -> None:
+        try:
+            try:
+                error = future.result()
+            except Exception as e:
+                error = f"Validation worker failed: {e!r}"
+            self._record(ValidationResult(kind, label, error, time.perf_counter() - submitted))
+        finally:
+            # Only drop the future once its result is recorded, so wait() sees it
+            with self._lock:
+                self._pending.pop(future, None)
+                self._idle.notify_all()
+            self._slots.release()
+
+    def _record(self, result: ValidationResult) -> None:
+        with self._lock:
+            self.results.append(result)
+        if self.on_result:
+            # A failing callback must not stall the pipeline; report it like a failed validation
+            try:
+                self.on_result(result)
+            except Exception as e:
+                with self._lock:
+                    self.results.append(ValidationResult(result.kind, result.label,
+                                                         f"on_result callback failed: {e!r}", result.elapsed))
+
+    def wait(self) -> List[ValidationResult]:
+        """
+        Wait for every submitted validation to finish
+        Returns:
+            All results so far, in completion order
+        """
+        with self._idle:
+            self._idle.wait_for(lambda: not self._pending)
+            return list(self.results)
+
+    @property
+    def failures(self) -> List[ValidationResult]:
+        with self._lock:
+            return [result for result in self.results if not result.passed]
+
+    def assert_all_passed(self) -> None:
+        """Wait for pending validations and fail with every error collected"""
+        self.wait()
+        failures = self.failures
+        assert not failures, f"{len(failures)} response validations failed:\n" + \
+            "\n".join(f"{result.label or result.kind}: {result.error}" for result in failures)
+
+    def close(self) -> None:
+        """Wait for pending validations and stop the workers"""
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> "ValidationPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
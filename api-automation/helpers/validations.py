@@ -3,9 +3,74 @@ Validation utilities for Equipment Status Tracker API tests
 """
 
 import json
+import re
 from typing import Dict, Any, List
-from jsonschema import validate, ValidationError
+from helpers.lazy_import import lazy_import
+from helpers.tracing import traced
 
+# Only the schema-based validators need jsonschema; defer it until they run
+jsonschema = lazy_import("jsonschema")
+
+ISO_TIMESTAMP_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{3})?Z$')
+VALID_STATUSES = ["Active", "Idle", "Under Maintenance"]
+
+EQUIPMENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer", "minimum": 1},
+        "name": {"type": "string", "minLength": 1},
+        "status": {"type": "string", "minLength": 1},
+        "location": {"type": "string", "minLength": 1},
+        "lastUpdated": {
+            "type": "string",
+            "pattern": r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z$"
+        }
+    },
+    "required": ["id", "name", "status", "location", "lastUpdated"]
+}
+
+EQUIPMENT_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "success": {"type": "boolean"},
+        "data": EQUIPMENT_SCHEMA
+    },
+    "required": ["success", "data"]
+}
+
+# Request-side schemas derived from the response schemas, e.g. for helpers/fuzzing.py
+EQUIPMENT_ID_SCHEMA = EQUIPMENT_SCHEMA["properties"]["id"]
+
+EQUIPMENT_PAYLOAD_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": EQUIPMENT_SCHEMA["properties"]["name"],
+        "status": {**EQUIPMENT_SCHEMA["properties"]["status"], "enum": VALID_STATUSES},
+        "location": EQUIPMENT_SCHEMA["properties"]["location"]
+    },
+    "required": ["name", "status", "location"]
+}
+
+STATUS_UPDATE_PAYLOAD_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "status": EQUIPMENT_PAYLOAD_SCHEMA["properties"]["status"],
+        "changedBy": {"type": "string", "minLength": 1}
+    },
+    "required": ["status"]
+}
+
+HISTORY_PARAMS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "limit": {"type": "integer", "minimum": 1},
+        "offset": {"type": "integer", "minimum": 0}
+    },
+    "required": []
+}
+
+
+@traced()
 def validate_equipment_response(response_data: Dict[str, Any]) -> bool:
     """
     Validate equipment response structure
@@ -14,34 +79,13 @@ def validate_equipment_response(response_data: Dict[str, Any]) -> bool:
     Returns:
         True if valid, raises exception if invalid
     """
-    expected_schema = {
-        "type": "object",
-        "properties": {
-            "success": {"type": "boolean"},
-            "data": {
-                "type": "object",
-                "properties": {
-                    "id": {"type": "integer", "minimum": 1},
-                    "name": {"type": "string", "minLength": 1},
-                    "status": {"type": "string", "minLength": 1},
-                    "location": {"type": "string", "minLength": 1},
-                    "lastUpdated": {
-                        "type": "string",
-                        "pattern": r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z$"
-                    }
-                },
-                "required": ["id", "name", "status", "location", "lastUpdated"]
-            }
-        },
-        "required": ["success", "data"]
-    }
-    
     try:
-        validate(instance=response_data, schema=expected_schema)
+        jsonschema.validate(instance=response_data, schema=EQUIPMENT_RESPONSE_SCHEMA)
         return True
-    except ValidationError as e:
+    except jsonschema.ValidationError as e:
         raise AssertionError(f"Response validation failed: {e.message}")
 
+@traced()
 def validate_equipment_list_response(response_data: Dict[str, Any]) -> bool:
     """
     Validate equipment list response structure
@@ -73,12 +117,13 @@ def validate_equipment_list_response(response_data: Dict[str, Any]) -> bool:
     }
     
     try:
-        validate(instance=response_data, schema=expected_schema)
+        jsonschema.validate(instance=response_data, schema=expected_schema)
         return True
-    except ValidationError as e:
+    except jsonschema.ValidationError as e:
         raise AssertionError(f"Equipment list response validation failed: {e.message}")
 
 
+@traced()
 def validate_get_all_equipment_response(response_data: Dict[str, Any]) -> None:
     """
     Comprehensive validation for GET /api/equipment response
@@ -102,32 +147,8 @@ def validate_get_all_equipment_response(response_data: Dict[str, Any]) -> None:
     assert response_data["count"] >= 0, "Count should be non-negative"
     
     # 4. Validate each equipment item
-    if response_data["data"]:
-        for equipment in response_data["data"]:
-            # Check required fields exist
-            assert "id" in equipment, "Equipment should have ID"
-            assert "name" in equipment, "Equipment should have name"
-            assert "status" in equipment, "Equipment should have status"
-            assert "location" in equipment, "Equipment should have location"
-            assert "lastUpdated" in equipment, "Equipment should have lastUpdated"
-            
-            # Validate data types
-            assert isinstance(equipment["id"], int), "Equipment ID should be integer"
-            assert isinstance(equipment["name"], str), "Equipment name should be string"
-            assert isinstance(equipment["status"], str), "Equipment status should be string"
-            assert isinstance(equipment["location"], str), "Equipment location should be string"
-            assert isinstance(equipment["lastUpdated"], str), "Equipment lastUpdated should be string"
-            
-            # Validate business rules
-            assert equipment["id"] > 0, "Equipment ID should be positive"
-            assert equipment["status"] in ["Active", "Idle", "Under Maintenance"], \
-                f"Invalid status: {equipment['status']}"
-            
-            # Validate lastUpdated format (ISO 8601)
-            import re
-            iso_pattern = r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{3})?Z$'
-            assert re.match(iso_pattern, equipment["lastUpdated"]), \
-                f"lastUpdated should be in ISO 8601 format, got: {equipment['lastUpdated']}"
+    for equipment in response_data["data"]:
+        _validate_equipment_item(equipment)
     
     # 5. Count validation
     if response_data["data"]:
@@ -136,6 +157,64 @@ def validate_get_all_equipment_response(response_data: Dict[str, Any]) -> None:
     else:
         assert response_data["count"] == 0, "Count should be 0 for empty list"
 
+@traced()
+def validate_get_all_equipment_stream(stream) -> int:
+    """
+    Streaming validation for GET /api/equipment, one equipment record at a time
+    Args:
+        stream: StreamedArray from EquipmentAPIClient.iter_all_equipment()
+    Returns:
+        Number of equipment records validated
+    Raises:
+        AssertionError: If validation fails
+    """
+    validated = 0
+    for equipment in stream:
+        _validate_equipment_item(equipment)
+        validated += 1
+    
+    envelope = stream.envelope
+    assert stream.array_found, "Response should contain 'data' field"
+    assert "success" in envelope, "Response should contain 'success' field"
+    assert "count" in envelope, "Response should contain 'count' field"
+    assert envelope["success"] is True, "Success should be true"
+    assert isinstance(envelope["count"], int), "Count should be an integer"
+    assert envelope["count"] == validated, \
+        f"Count should match data length. Expected: {validated}, Got: {envelope['count']}"
+    return validated
+
+def _validate_equipment_item(equipment: Dict[str, Any]) -> None:
+    """
+    Validate a single equipment record from GET /api/equipment
+    Args:
+        equipment: Equipment dictionary
+    Raises:
+        AssertionError: If validation fails
+    """
+    # Check required fields exist
+    assert "id" in equipment, "Equipment should have ID"
+    assert "name" in equipment, "Equipment should have name"
+    assert "status" in equipment, "Equipment should have status"
+    assert "location" in equipment, "Equipment should have location"
+    assert "lastUpdated" in equipment, "Equipment should have lastUpdated"
+    
+    # Validate data types
+    assert isinstance(equipment["id"], int), "Equipment ID should be integer"
+    assert isinstance(equipment["name"], str), "Equipment name should be string"
+    assert isinstance(equipment["status"], str), "Equipment status should be string"
+    assert isinstance(equipment["location"], str), "Equipment location should be string"
+    assert isinstance(equipment["lastUpdated"], str), "Equipment lastUpdated should be string"
+    
+    # Validate business rules
+    assert equipment["id"] > 0, "Equipment ID should be positive"
+    assert equipment["status"] in ["Active", "Idle", "Under Maintenance"], \
+        f"Invalid status: {equipment['status']}"
+    
+    # Validate lastUpdated format (ISO 8601)
+    assert ISO_TIMESTAMP_PATTERN.match(equipment["lastUpdated"]), \
+        f"lastUpdated should be in ISO 8601 format, got: {equipment['lastUpdated']}"
+
+@traced()
 def assert_equipment_created(created_equipment: Dict[str, Any], original_payload: Dict[str, str]) -> None:
     """
     Assert that equipment was created correctly
@@ -202,6 +281,7 @@ def assert_content_type(response, expected_type: str = "application/json") -> No
     assert expected_type in content_type, \
         f"Expected content type {expected_type}, got {content_type}"
 
+@traced()
 def validate_error_response(response_data: Dict[str, Any]) -> bool:
     """
     Validate error response structure
@@ -220,11 +300,12 @@ def validate_error_response(response_data: Dict[str, Any]) -> bool:
     }
     
     try:
-        validate(instance=response_data, schema=error_schema)
+        jsonschema.validate(instance=response_data, schema=error_schema)
         return True
-    except ValidationError as e:
+    except jsonschema.ValidationError as e:
         raise AssertionError(f"Error response validation failed: {e.message}")
 
+@traced()
 def validate_equipment_status_update_response(response_data: Dict[str, Any]) -> None:
     """
     Validate equipment status update response structure
@@ -281,6 +362,7 @@ def validate_equipment_status_update_response(response_data: Dict[str, Any]) ->
     assert history["previousStatus"] in valid_statuses, f"Previous status should be one of {valid_statuses}"
 
 
+@traced()
 def validate_equipment_history_response(response_data: Dict[str, Any]) -> None:
     """
     Validate equipment history response structure
@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 """
 Simple script to run all 32 tests with minimal output
+Pass --profile-startup to write an import-time and fixture setup profile
 """
 
+import os
 import subprocess
 import sys
 
-def run_all_tests():
+def run_all_tests(profile_startup: bool = False):
     """Run all 32 tests with clean output"""
     print("Running all 32 tests...")
     
@@ -19,14 +21,28 @@ def run_all_tests():
         "--no-summary",
         "--alluredir=reports/allure-results"
     ]
+    env = None
+    
+    if profile_startup:
+        from helpers.startup_profiler import reset_profile_dir, PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR
+        import_log = reset_profile_dir()
+        cmd[1:1] = ["-X", "importtime"]
+        cmd.extend(["-p", "helpers.startup_profiler"])
+        env = dict(os.environ, **{PROFILE_DIR_ENV: DEFAULT_PROFILE_DIR})
     
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, capture_output=True, text=True, env=env)
         
         if result.returncode == 0:
             print("All tests passed!")
         else:
             print("Some tests failed")
+        
+        if profile_startup:
+            from helpers.startup_profiler import write_startup_report
+            with open(import_log, "w") as file:
+                file.write(result.stderr)
+            print(f"Startup profile written to {write_startup_report()}")
             
         return result.returncode == 0
         
@@ -35,5 +51,5 @@ def run_all_tests():
         return False
 
 if __name__ == "__main__":
-    success = run_all_tests()
-    sys.exit(0 if success else 1) 
\ No newline at end of file
+    success = run_all_tests(profile_startup="--profile-startup" in sys.argv[1:])
+    sys.exit(0 if success else 1) 
@@ -1,54 +1,352 @@
 #!/usr/bin/env python3
 """
-Simple HTTP server to serve Allure HTML report
+HTTP server to serve the Allure HTML report
+Serves requests on multiple threads, compresses text assets once and keeps the encoded
+bytes in memory, and answers with strong ETags, long-lived caching for hashed assets
+and byte ranges
+
+Usage: python serve_report.py [--port PORT]   (or REPORT_PORT=PORT)
 """
 
+import gzip
+import hashlib
 import http.server
-import socketserver
-import webbrowser
 import os
+import re
 import sys
+import threading
+import webbrowser
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli  # Optional: pip install brotli
+except ImportError:
+    brotli = None
+
+REPORT_DIR = "reports/allure-report"
+DEFAULT_PORT = 8080
+# Files above this size are streamed from disk uncompressed
+MAX_CACHED_FILE = 8 * 1024 * 1024
+CACHE_BUDGET = 256 * 1024 * 1024
+MIN_COMPRESS_SIZE = 1024
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+# Attachments and bundles named by content hash or UUID never change under the same name
+HASHED_NAME = re.compile(r"[0-9a-f]{16,}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class CachedAsset:
+    """File contents plus their compressed variants, each encoded at most once"""
+
+    def __init__(self, data: bytes, mtime_ns: int, compressible: bool):
+        self.data = data
+        self.mtime_ns = mtime_ns
+        self.compressible = compressible and len(data) >= MIN_COMPRESS_SIZE
+        self.etag = hashlib.sha1(data).hexdigest()[:20]
+        self._encoded: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: str) -> bytes:
+        """Return the body in an encoding (identity, gzip or br)"""
+        if encoding == "identity":
+            return self.data
+        with self._lock:
+            if encoding not in self._encoded:
+                if encoding == "br":
+                    self._encoded[encoding] = brotli.compress(self.data, quality=9)
+                else:
+                    self._encoded[encoding] = gzip.compress(self.data, compresslevel=6, mtime=0)
+            return self._encoded[encoding]
+
+    @property
+    def size(self) -> int:
+        return len(self.data) + sum(len(body) for body in self._encoded.values())
+
+
+class AssetCache:
+    """LRU cache of report files, invalidated when a file's mtime or size changes"""
+
+    def __init__(self, budget: int = CACHE_BUDGET):
+        self.budget = budget
+        self._assets: "OrderedDict[str, CachedAsset]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, stat: os.stat_result, compressible: bool) -> CachedAsset:
+        with self._lock:
+            asset = self._assets.get(path)
+            if asset and asset.mtime_ns == stat.st_mtime_ns and len(asset.data) == stat.st_size:
+                self._assets.move_to_end(path)
+                return asset
+
+        with open(path, "rb") as file:
+            asset = CachedAsset(file.read(), stat.st_mtime_ns, compressible)
+        with self._lock:
+            self._assets[path] = asset
+            self._evict()
+        return asset
+
+    def _evict(self) -> None:
+        total = sum(asset.size for asset in self._assets.values())
+        while total > self.budget and len(self._assets) > 1:
+            _, evicted = self._assets.popitem(last=False)
+            total -= evicted.size
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range
+    Args:
+        header: Range header value
+        size: Full body size
+    Returns:
+        Inclusive (start, end), or None if the range cannot be satisfied
+    Raises:
+        ValueError: If the header is not a single byte range (it is then ignored)
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        raise ValueError(header)
+    start, end = match.group(1), match.group(2)
+    if not start:
+        length = int(end)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+class ReportRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves report files with compression, ETags, cache headers and ranges"""
+
+    cache = AssetCache()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Don't log anything
+
+    def do_GET(self):
+        self._serve(head_only=False)
+
+    def do_HEAD(self):
+        self._serve(head_only=True)
+
+    def _serve(self, head_only: bool):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            index = os.path.join(path, "index.html")
+            if not self.path.split("?", 1)[0].endswith("/") or not os.path.isfile(index):
+                # Redirects and directory listings as usual
+                return super().do_HEAD() if head_only else super().do_GET()
+            path = index
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.send_error(404, "File not found")
+            return
+
+        content_type = self.guess_type(path)
+        hashed = bool(HASHED_NAME.search(os.path.basename(path)))
+        if stat.st_size > MAX_CACHED_FILE:
+            self._serve_from_disk(path, stat, content_type, hashed, head_only)
+            return
+
+        asset = self.cache.get(path, stat, content_type.startswith(COMPRESSIBLE_TYPES))
+        range_header = self.headers.get("Range")
+        # Ranges address the identity bytes, so ranged requests are never compressed
+        encoding = "identity" if range_header else self._choose_encoding(asset)
+        if range_header and self._if_range_matches(asset.etag):
+            self._send_range(asset.data, range_header, asset.etag, content_type, hashed, head_only)
+            return
+
+        etag = asset.etag if encoding == "identity" else f"{asset.etag}-{encoding}"
+        if self._not_modified(etag):
+            self._send_not_modified(etag, hashed, asset.compressible)
+            return
+
+        body = asset.encoded(encoding)
+        self.send_response(200)
+        self._send_common_headers(etag, content_type, hashed, asset.compressible)
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def _serve_from_disk(self, path: str, stat: os.stat_result, content_type: str, hashed: bool, head_only: bool):
+        """Stream a large file without caching it, honouring a byte range"""
+        etag = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+        if self._not_modified(etag):
+            self._send_not_modified(etag, hashed, False)
+            return
+        start, end = 0, stat.st_size - 1
+        status = 200
+        range_header = self.headers.get("Range")
+        if range_header and self._if_range_matches(etag):
+            try:
+                byte_range = parse_range(range_header, stat.st_size)
+            except ValueError:
+                byte_range = (start, end)
+            else:
+                if byte_range is None:
+                    self._send_unsatisfiable(stat.st_size)
+                    return
+                status = 206
+            start, end = byte_range
+
+        self.send_response(status)
+        self._send_common_headers(etag, content_type, hashed, False)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{stat.st_size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if head_only:
+            return
+        with open(path, "rb") as file:
+            file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = file.read(min(remaining, 1 << 16))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+    def _send_range(self, data: bytes, range_header: str, etag: str, content_type: str, hashed: bool, head_only: bool):
+        try:
+            byte_range = parse_range(range_header, len(data))
+        except ValueError:
+            byte_range = (0, len(data) - 1)
+            status = 200
+        else:
+            if byte_range is None:
+                self._send_unsatisfiable(len(data))
+                return
+            status = 206
+        start, end = byte_range
+        self.send_response(status)
+        self._send_common_headers(etag, content_type, hashed, False)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(data[start:end + 1])
+
+    def _send_unsatisfiable(self, size: int):
+        self.send_response(416)
+        self.send_header("Content-Range", f"bytes */{size}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_not_modified(self, etag: str, hashed: bool, compressible: bool):
+        self.send_response(304)
+        self.send_header("ETag", f'"{etag}"')
+        self.send_header("Cache-Control", IMMUTABLE if hashed else REVALIDATE)
+        if compressible:
+            self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+
+    def _send_common_headers(self, etag: str, content_type: str, hashed: bool, compressible: bool):
+        self.send_header("Content-Type", content_type)
+        self.send_header("ETag", f'"{etag}"')
+        self.send_header("Cache-Control", IMMUTABLE if hashed else REVALIDATE)
+        self.send_header("Accept-Ranges", "bytes")
+        if compressible:
+            self.send_header("Vary", "Accept-Encoding")
+
+    def _choose_encoding(self, asset: CachedAsset) -> str:
+        """Pick br or gzip when the client accepts it and the asset is worth compressing"""
+        if not asset.compressible:
+            return "identity"
+        accepted = {}
+        for part in self.headers.get("Accept-Encoding", "").split(","):
+            name, _, params = part.strip().partition(";")
+            quality = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip().lower()] = quality
+        if brotli is not None and accepted.get("br", 0) > 0:
+            return "br"
+        if accepted.get("gzip", 0) > 0:
+            return "gzip"
+        return "identity"
+
+    def _not_modified(self, etag: str) -> bool:
+        header = self.headers.get("If-None-Match")
+        if not header:
+            return False
+        candidates = {candidate.strip().removeprefix("W/").strip('"') for candidate in header.split(",")}
+        return "*" in candidates or etag in candidates
+
+    def _if_range_matches(self, etag: str) -> bool:
+        """A Range applies only if If-Range is absent or names the current representation"""
+        header = self.headers.get("If-Range")
+        return header is None or header.strip().strip('"') == etag
+
+
+def _port_from_args() -> int:
+    """Read --port PORT (or --port=PORT), then REPORT_PORT, then the default"""
+    args = sys.argv[1:]
+    for position, arg in enumerate(args):
+        if arg.startswith("--port="):
+            return int(arg.split("=", 1)[1])
+        if arg == "--port" and position + 1 < len(args):
+            return int(args[position + 1])
+    return int(os.getenv("REPORT_PORT", DEFAULT_PORT))
+
 
 def serve_report():
     """Serve the Allure HTML report on localhost"""
-    
+
     # Check if report exists
-    report_dir = "reports/allure-report"
+    report_dir = REPORT_DIR
     if not os.path.exists(report_dir):
         print("Report directory not found!")
-        print("Please run tests first: python run_tests_and_generate_report.py")
+        print("Please run tests first: python -m pytest --alluredir=reports/allure-results")
         sys.exit(1)
-    
-    # Change to report directory
-    os.chdir(report_dir)
-    
+
     # Set up server
-    PORT = 8080
-    
     try:
-        # Create a custom handler that doesn't log requests
-        class QuietHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-            def log_message(self, format, *args):
-                pass  # Don't log anything
-        
-        with socketserver.TCPServer(("", PORT), QuietHTTPRequestHandler) as httpd:
+        PORT = _port_from_args()
+    except ValueError:
+        print("[ERROR] Port must be a number")
+        sys.exit(2)
+
+    try:
+        handler = partial(ReportRequestHandler, directory=report_dir)
+        with http.server.ThreadingHTTPServer(("", PORT), handler) as httpd:
+            httpd.daemon_threads = True
             print(f"Report opened at: http://localhost:{PORT}")
+            if brotli is None:
+                print("[INFO] Serving gzip only; pip install brotli to enable br")
             print("Press Ctrl+C to stop")
-            
+
             # Open browser
             webbrowser.open(f"http://localhost:{PORT}")
-            
+
             # Start server
             httpd.serve_forever()
-            
+
     except KeyboardInterrupt:
         print("\nServer stopped")
     except OSError as e:
         if "Address already in use" in str(e):
             print(f"Port {PORT} is already in use")
-            print("Try a different port or stop the existing server")
+            print("Try a different port (--port or REPORT_PORT) or stop the existing server")
         else:
             print(f"Error: {e}")
 
 if __name__ == "__main__":
-    serve_report() 
\ No newline at end of file
+    serve_report()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Soak the API client with a steady read (and optional write) workload for a long time
+Resident memory, file descriptors, pool connections, tracemalloc totals and latency are
+sampled at intervals; the run fails when a resource keeps growing faster than its limit
+after warm-up. Samples are written to reports/soak-timeseries.ndjson
+
+Usage: python soak_runner.py [--duration SECONDS] [--workers N] [--interval SECONDS]
+                             [--warmup SECONDS] [--pause SECONDS] [--write-ratio FRACTION]
+                             [--no-tracemalloc]
+"""
+
+import random
+import sys
+import threading
+import time
+from typing import List
+
+from api_client.equipment_api import EquipmentAPIClient
+from api_client.health import cached_health_check
+from api_client.metrics import start_metrics_server
+from helpers.cli import known_equipment_ids, pop_option
+from helpers.resource_monitor import ResourceMonitor, soak_thresholds
+from helpers.validations import VALID_STATUSES
+
+DEFAULT_DURATION = 3600
+DEFAULT_WORKERS = 4
+DEFAULT_PAUSE = 0.1
+
+
+def _worker(client: EquipmentAPIClient, monitor: ResourceMonitor, ids: List[int], deadline: float,
+            stop: threading.Event, pause: float, write_ratio: float, seed: int) -> None:
+    """Call the client in a loop until the deadline, recording every call with the monitor"""
+    rng = random.Random(seed)
+    while not stop.is_set() and time.monotonic() < deadline:
+        roll = rng.random()
+        started = time.perf_counter()
+        ok = True
+        try:
+            if roll < write_ratio:
+                client.update_equipment_status(str(rng.choice(ids)), rng.choice(VALID_STATUSES))
+            elif roll < write_ratio + (1 - write_ratio) / 2:
+                client.get_all_equipment()
+            else:
+                client.get_equipment_history(str(rng.choice(ids)))
+        except Exception:
+            ok = False
+        monitor.record(time.perf_counter() - started, ok)
+        if pause:
+            stop.wait(pause)
+
+
+def main():
+    """Command line interface"""
+    client = EquipmentAPIClient()
+    config = client.config
+    try:
+        duration = float(pop_option("duration", str(DEFAULT_DURATION)))
+        workers = int(pop_option("workers", str(DEFAULT_WORKERS)))
+        interval = float(pop_option("interval", str(config["soak_interval"])))
+        warmup = float(pop_option("warmup", str(config["soak_warmup"])))
+        pause = float(pop_option("pause", str(DEFAULT_PAUSE)))
+        write_ratio = float(pop_option("write-ratio", "0"))
+    except ValueError as e:
+        print(f"[ERROR] Invalid option value: {e}")
+        sys.exit(2)
+    trace_allocations = "--no-tracemalloc" not in sys.argv
+
+    health = cached_health_check(client)
+    if not health:
+        print(f"❌ API is not healthy: {health.detail}")
+        sys.exit(1)
+    if config["metrics_port"]:
+        server = start_metrics_server(config["metrics_port"], client.metrics)
+        print(f"[INFO] Live metrics on http://127.0.0.1:{server.server_address[1]}/metrics")
+
+    ids = known_equipment_ids(client) or [1]
+    print(f"Soaking {client.base_url} for {duration:.0f} s with {workers} workers")
+    print(f"Sampling every {interval:g} s, slopes fitted after {warmup:g} s of warm-up")
+
+    monitor = ResourceMonitor(client, interval=interval, warmup=warmup,
+                              trace_allocations=trace_allocations, metrics=client.metrics)
+    deadline = time.monotonic() + duration
+    stop = threading.Event()
+    threads = [threading.Thread(target=_worker, name=f"soak-{number}",
+                                args=(client, monitor, ids, deadline, stop, pause, write_ratio, number))
+               for number in range(workers)]
+    with monitor:
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            print("[WARNING] Interrupted, finishing the calls in flight")
+            stop.set()
+            for thread in threads:
+                thread.join()
+    path = monitor.write_timeseries(config["soak_timeseries_file"])
+
+    first, last = monitor.samples[0], monitor.samples[-1]
+    calls = sum(sample["requests"] for sample in monitor.samples)
+    errors = sum(sample["errors"] for sample in monitor.samples)
+    print(f"\n{calls} calls, {errors} errors, {len(monitor.samples)} samples written to {path}")
+    print(f"RSS {first['rss_bytes'] / 1048576:.1f} -> {last['rss_bytes'] / 1048576:.1f} MB, "
+          f"fds {first['open_fds']} -> {last['open_fds']}, "
+          f"connections {first['connections']} -> {last['connections']}, "
+          f"threads {first['threads']} -> {last['threads']}")
+
+    slopes = monitor.slopes()
+    if not slopes:
+        print("[WARNING] Too few samples after warm-up to fit growth slopes; run longer or sample more often")
+        return
+    print("Growth per hour after warm-up: " + ", ".join(f"{name} {slope:+.2f}" for name, slope in slopes.items()))
+    correlations = {field: value for field, value in monitor.latency_correlations().items() if value is not None}
+    if correlations:
+        print("p95 latency correlation: " + ", ".join(f"{field} {value:+.2f}" for field, value in correlations.items()))
+    if last.get("top_allocators"):
+        print("Top allocation growth since warm-up:")
+        for allocator in last["top_allocators"]:
+            print(f"  {allocator['size_diff'] / 1024:+10.1f} KiB {allocator['count_diff']:+8} blocks  "
+                  f"{allocator['location']}")
+
+    violations = monitor.check(soak_thresholds(config))
+    if violations:
+        print("\n❌ Resource growth over the limit:")
+        for violation in violations:
+            print(f"  {violation}")
+        sys.exit(1)
+    print("✅ No resource growth over the limits")
+
+
+if __name__ == "__main__":
+    main()
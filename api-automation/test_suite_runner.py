@@ -7,7 +7,33 @@ All test suite configurations in one file for easy management
 import subprocess
 import sys
 import os
-from typing import List, Dict, Optional
+import io
+import json
+import ast
+import contextlib
+import glob
+import heapq
+import shutil
+from typing import List, Dict, Optional, Set, Tuple
+
+from helpers.cli import pop_option
+
+# Outcomes reported by pytest-json-report that do not fail a suite
+PASSING_OUTCOMES = {"passed", "skipped", "xfailed", "xpassed"}
+RESULTS_FILE = "reports/suite-results.json"
+ALLURE_RESULTS_DIR = "reports/allure-results"
+
+# Sharding: per-test durations (seconds) recorded from earlier runs balance the shards
+DURATIONS_FILE = "reports/test-durations.json"
+DEFAULT_TEST_DURATION = 1.0
+
+# Impact analysis: changes to these files affect every test, so they force a full run
+FULL_RUN_TRIGGERS = {"pytest.ini", "requirements.txt"}
+# Fixtures and hooks in a conftest.py apply to every test below it, at any depth
+FULL_RUN_FILE_NAMES = {"conftest.py"}
+LOCAL_PACKAGES = ["api_client", "config", "helpers", "tests"]
+# Data files are read at runtime rather than imported, so map them to their loader
+DATA_DEPENDENCIES = {"test_data/": "helpers/test_data.py"}
 
 class TestSuiteConfig:
     """Test Suite Configuration"""
@@ -30,10 +56,24 @@ class TestSuiteConfig:
         self.parallel = parallel
         self.thread_count = thread_count
 
+class _CollectionRecorder:
+    """Pytest plugin that records node IDs and marker names of collected tests"""
+
+    def __init__(self):
+        self.tests: Dict[str, Set[str]] = {}
+
+    def pytest_collection_finish(self, session):
+        for item in session.items:
+            self.tests[item.nodeid] = {marker.name for marker in item.iter_markers()}
+
 class TestSuiteRunner:
     """Master Test Suite Runner"""
     
-    def __init__(self):
+    def __init__(self, profile_startup: bool = False, shard: Optional[Tuple[int, int]] = None):
+        # Write an import-time and fixture setup profile for every pytest run
+        self.profile_startup = profile_startup
+        # (index, count) with a 1-based index: run only this machine's share of the tests
+        self.shard = shard
         # Define all test suites
         self.test_suites = {
             # Smoke Test Suite - Critical functionality
@@ -147,7 +187,10 @@ class TestSuiteRunner:
             return False
 
         suite = self.test_suites[suite_name]
-        success = self._execute_suite(suite, generate_report, open_report=False)
+        if self.shard:
+            success = self._run_deduplicated([suite_name])[suite_name]
+        else:
+            success = self._execute_suite(suite, generate_report, open_report=False)
         
         # Open report only once at the end
         if open_report and success:
@@ -156,17 +199,20 @@ class TestSuiteRunner:
         return success
 
     def run_multiple_suites(self, suite_names: List[str], generate_report: bool = True, open_report: bool = True) -> Dict[str, bool]:
-        """Run multiple test suites"""
+        """Run multiple test suites, executing each shared test only once"""
         print(f"Running Multiple Test Suites: {', '.join(suite_names)}")
         print("=" * 60)
         
-        results = {}
+        known_suites = []
         for suite_name in suite_names:
             if suite_name in self.test_suites:
-                results[suite_name] = self.run_suite(suite_name, generate_report=False, open_report=False)
+                known_suites.append(suite_name)
             else:
                 print(f"[WARNING] Suite '{suite_name}' not found, skipping...")
-                results[suite_name] = False
+        
+        results = self._run_deduplicated(known_suites)
+        for suite_name in suite_names:
+            results.setdefault(suite_name, False)
         
         # Generate final report
         if generate_report:
@@ -182,13 +228,12 @@ class TestSuiteRunner:
         return results
 
     def run_all_suites(self, generate_report: bool = True, open_report: bool = True) -> Dict[str, bool]:
-        """Run all test suites"""
+        """Run all test suites, executing each shared test only once"""
         print("Running All Test Suites...")
         
-        results = {}
-        for suite_name, suite in self.test_suites.items():
-            if suite_name != "all":  # Skip the "all" suite to avoid duplication
-                results[suite_name] = self._execute_suite(suite, generate_report=False, open_report=False)
+        # Skip the "all" suite to avoid duplication
+        suite_names = [name for name in self.test_suites if name != "all"]
+        results = self._run_deduplicated(suite_names)
         
         # Generate final report only once
         if generate_report:
@@ -204,18 +249,262 @@ class TestSuiteRunner:
         
         return results
 
-    def _execute_suite(self, suite: TestSuiteConfig, generate_report: bool = True, open_report: bool = True) -> bool:
-        """Execute a single test suite"""
-        print(f"Running: {suite.name}")
+    def _run_deduplicated(self, suite_names: List[str]) -> Dict[str, bool]:
+        """
+        Run the union of several suites in a single pytest session
+        Args:
+            suite_names: Names of the suites to run
+        Returns:
+            Dictionary of suite name to success flag
+        """
+        if not suite_names:
+            return {}
+        
+        collected = self._collect_tests()
+        suite_tests = {
+            name: self._select_suite_tests(self.test_suites[name], collected)
+            for name in suite_names
+        }
+        
+        # Preserve collection order so the session runs tests file by file
+        selected = set().union(*suite_tests.values())
+        test_ids = [nodeid for nodeid in collected if nodeid in selected]
+        total_scheduled = sum(len(ids) for ids in suite_tests.values())
+        print(f"Collected {len(test_ids)} unique tests for {len(suite_names)} suites "
+              f"({total_scheduled} suite entries)")
+        
+        if self.shard:
+            test_ids = self._select_shard(test_ids)
+            in_shard = set(test_ids)
+            suite_tests = {name: [nodeid for nodeid in ids if nodeid in in_shard]
+                           for name, ids in suite_tests.items()}
+        
+        suites = [self.test_suites[name] for name in suite_names]
+        parallel = any(suite.parallel for suite in suites)
+        thread_count = max(suite.thread_count for suite in suites)
+        outcomes = self._run_test_ids(test_ids, parallel, thread_count)
+        
+        # Fan the verdict of every test out to each suite that includes it
+        results = {}
+        for name in suite_names:
+            ids = suite_tests[name]
+            failed = [nodeid for nodeid in ids if outcomes.get(nodeid) not in PASSING_OUTCOMES]
+            # A shard may legitimately hold none of a suite's tests
+            results[name] = (bool(ids) or bool(self.shard)) and not failed
+            print(f"  {self.test_suites[name].name}: {len(ids)} tests, {len(failed)} failed")
+        
+        return results
+
+    def _collect_tests(self) -> Dict[str, Set[str]]:
+        """
+        Collect every test under tests/ once
+        Returns:
+            Dictionary of node ID to marker names, in collection order
+        """
+        import pytest
+        
+        recorder = _CollectionRecorder()
+        # pytest prints the collected IDs; keep the runner output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            pytest.main(["--collect-only", "-q", "-p", "no:cacheprovider", "tests/"], plugins=[recorder])
+        return recorder.tests
+
+    def _select_suite_tests(self, suite: TestSuiteConfig, collected: Dict[str, Set[str]]) -> List[str]:
+        """
+        Select the collected tests matching a suite's files and markers
+        Args:
+            suite: Suite configuration
+            collected: Dictionary of node ID to marker names
+        Returns:
+            List of node IDs in the suite
+        """
+        selected = []
+        for nodeid, markers in collected.items():
+            path = nodeid.split("::")[0]
+            if suite.files and not any(path == f or path.startswith(f.rstrip("/") + "/") for f in suite.files):
+                continue
+            if suite.markers and not markers.intersection(suite.markers):
+                continue
+            selected.append(nodeid)
+        return selected
+
+    def _run_test_ids(self, test_ids: List[str], parallel: bool = False, thread_count: int = 1) -> Dict[str, str]:
+        """
+        Run an explicit list of tests in one pytest session
+        Args:
+            test_ids: Node IDs to run
+            parallel: Run with pytest-xdist
+            thread_count: Number of xdist workers
+        Returns:
+            Dictionary of node ID to pytest outcome
+        """
+        if not test_ids:
+            print("[WARNING] No tests selected")
+            return {}
+        
+        cmd = self._base_command()
+        cmd.extend(["--json-report", f"--json-report-file={RESULTS_FILE}"])
+        if parallel and thread_count > 1 and not self.profile_startup:
+            cmd.extend(["-n", str(thread_count)])
+        cmd.extend(test_ids)
+        
+        try:
+            self._run_pytest(cmd)
+            with open(RESULTS_FILE, "r") as file:
+                report = json.load(file)
+        except Exception as e:
+            print(f"Error running tests: {e}")
+            return {}
+        
+        # Shards must all balance from the same durations; merge_shards records theirs
+        if not self.shard:
+            self._record_durations([report])
+        return {test["nodeid"]: test["outcome"] for test in report.get("tests", [])}
+
+    def _select_shard(self, test_ids: List[str]) -> List[str]:
+        """
+        Pick this machine's shard of the tests, balanced by recorded durations
+        Args:
+            test_ids: Node IDs in collection order; every shard must see the same list
+        Returns:
+            Node IDs of this shard, in collection order
+        """
+        index, count = self.shard
+        durations = self._load_durations()
+        known = [durations[nodeid] for nodeid in test_ids if nodeid in durations]
+        default = sum(known) / len(known) if known else DEFAULT_TEST_DURATION
+        
+        # Longest processing time first: give each test to the least loaded shard
+        loads = [(0.0, shard) for shard in range(count)]
+        assigned: Dict[str, int] = {}
+        for nodeid in sorted(test_ids, key=lambda nodeid: (-durations.get(nodeid, default), nodeid)):
+            load, shard = heapq.heappop(loads)
+            assigned[nodeid] = shard
+            heapq.heappush(loads, (load + durations.get(nodeid, default), shard))
+        
+        selected = [nodeid for nodeid in test_ids if assigned[nodeid] == index - 1]
+        estimate = sum(durations.get(nodeid, default) for nodeid in selected)
+        print(f"Shard {index}/{count}: {len(selected)} of {len(test_ids)} tests (~{estimate:.1f}s)")
+        return selected
+
+    def _load_durations(self) -> Dict[str, float]:
+        """Load recorded test durations, or an empty mapping if none were recorded"""
+        try:
+            with open(DURATIONS_FILE, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _record_durations(self, reports: List[Dict]) -> None:
+        """
+        Update recorded test durations from pytest-json-report results
+        Args:
+            reports: Loaded json reports
+        """
+        durations = self._load_durations()
+        for report in reports:
+            for test in report.get("tests", []):
+                phases = [test.get(when) or {} for when in ("setup", "call", "teardown")]
+                durations[test["nodeid"]] = round(sum(phase.get("duration", 0.0) for phase in phases), 3)
+        os.makedirs(os.path.dirname(DURATIONS_FILE), exist_ok=True)
+        with open(DURATIONS_FILE, "w") as file:
+            json.dump(dict(sorted(durations.items())), file, indent=2)
+
+    def merge_shards(self, shard_dirs: List[str], generate_report: bool = True) -> bool:
+        """
+        Merge the results of sharded runs into one set of reports
+        Args:
+            shard_dirs: Per-shard reports directories holding allure-results/ and suite-results.json
+            generate_report: Generate the Allure report from the merged results
+        Returns:
+            True if every merged test passed
+        """
+        os.makedirs(ALLURE_RESULTS_DIR, exist_ok=True)
+        reports = []
+        for shard_dir in shard_dirs:
+            # Allure names result files by UUID, so shards never collide
+            for path in glob.glob(os.path.join(shard_dir, "allure-results", "*")):
+                if os.path.isfile(path):
+                    shutil.copy2(path, ALLURE_RESULTS_DIR)
+            results_path = os.path.join(shard_dir, os.path.basename(RESULTS_FILE))
+            if os.path.exists(results_path):
+                with open(results_path, "r") as file:
+                    reports.append(json.load(file))
+            else:
+                print(f"[WARNING] No results in {shard_dir}")
+        
+        if not reports:
+            print("[ERROR] No shard results found to merge")
+            return False
+        
+        summary: Dict[str, int] = {}
+        for report in reports:
+            for key, value in report.get("summary", {}).items():
+                if isinstance(value, int):
+                    summary[key] = summary.get(key, 0) + value
+        merged = {
+            "created": max(report.get("created", 0) for report in reports),
+            # Shards run side by side; the slowest one bounds the wall time
+            "duration": max(report.get("duration", 0) for report in reports),
+            "summary": summary,
+            "tests": [test for report in reports for test in report.get("tests", [])]
+        }
+        with open(RESULTS_FILE, "w") as file:
+            json.dump(merged, file, indent=2)
+        self._record_durations(reports)
         
-        # Build pytest command with request/response output
+        failed = [test["nodeid"] for test in merged["tests"] if test["outcome"] not in PASSING_OUTCOMES]
+        print(f"Merged {len(reports)} shards: {len(merged['tests'])} tests, {len(failed)} failed, "
+              f"slowest shard {merged['duration']:.1f}s")
+        for nodeid in failed:
+            print(f"  ❌ {nodeid}")
+        
+        if generate_report:
+            self._generate_report()
+        return not failed
+
+    def _base_command(self) -> List[str]:
+        """Build the pytest command shared by every run (request/response logs go to API_LOG_FILE)"""
         cmd = [
             sys.executable, "-m", "pytest",
             "--tb=no",
-            "-s",
             "--alluredir=reports/allure-results"
         ]
         
+        # Profile a single process: xdist workers would interleave their import logs
+        if self.profile_startup:
+            cmd[1:1] = ["-X", "importtime"]
+            cmd.extend(["-p", "helpers.startup_profiler"])
+        
+        return cmd
+
+    def _run_pytest(self, cmd: List[str]) -> subprocess.CompletedProcess:
+        """
+        Run a pytest command, writing the startup profile when enabled
+        Args:
+            cmd: Command built from _base_command
+        Returns:
+            Completed process
+        """
+        if not self.profile_startup:
+            return subprocess.run(cmd, capture_output=False, text=True)
+        
+        from helpers.startup_profiler import (
+            reset_profile_dir, write_startup_report, PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR
+        )
+        import_log = reset_profile_dir()
+        env = dict(os.environ, **{PROFILE_DIR_ENV: DEFAULT_PROFILE_DIR})
+        with open(import_log, "w") as log_file:
+            result = subprocess.run(cmd, stderr=log_file, text=True, env=env)
+        print(f"Startup profile written to {write_startup_report()}")
+        return result
+
+    def _execute_suite(self, suite: TestSuiteConfig, generate_report: bool = True, open_report: bool = True) -> bool:
+        """Execute a single test suite"""
+        print(f"Running: {suite.name}")
+        
+        cmd = self._base_command()
+        
         # Add markers
         if suite.markers:
             marker_expr = " or ".join(suite.markers)
@@ -226,11 +515,11 @@ class TestSuiteRunner:
             cmd.extend(suite.files)
         
         # Add parallel execution
-        if suite.parallel and suite.thread_count > 1:
+        if suite.parallel and suite.thread_count > 1 and not self.profile_startup:
             cmd.extend(["-n", str(suite.thread_count)])
         
         try:
-            result = subprocess.run(cmd, capture_output=False, text=True)
+            result = self._run_pytest(cmd)
             
             if result.returncode == 0:
                 print(f"{suite.name} completed successfully!")
@@ -243,25 +532,165 @@ class TestSuiteRunner:
             print(f"Error running {suite.name}: {e}")
             return False
 
-    def _generate_report(self):
-        """Generate Allure report"""
+    def run_impacted(self, base_ref: str = "HEAD", list_only: bool = False) -> bool:
+        """
+        Run only the tests affected by changes since a git revision
+        Args:
+            base_ref: Git revision to diff the working tree against
+            list_only: Print the selected test targets instead of running them
+        Returns:
+            True if the selected tests passed
+        """
+        changed = self._changed_files(base_ref)
+        if changed is None:
+            print(f"[WARNING] Could not diff against '{base_ref}', running full suite", file=sys.stderr)
+            affected = None
+        else:
+            affected = self._affected_test_files(changed)
+        
+        if list_only:
+            for target in (affected if affected is not None else ["tests/"]):
+                print(target)
+            return True
+        
+        if affected is None and not self.shard:
+            print("Change affects shared configuration, running all tests")
+            return self._execute_suite(self.test_suites["all"], generate_report=False, open_report=False)
+        if affected is not None and not affected:
+            print(f"No tests affected by changes since {base_ref}")
+            return True
+        
+        if affected is None:
+            print("Change affects shared configuration, running all tests")
+            test_ids = self._select_shard(list(self._collect_tests()))
+        elif self.shard:
+            print(f"Running {len(affected)} affected test files: {', '.join(affected)}")
+            test_ids = self._select_shard([nodeid for nodeid in self._collect_tests()
+                                           if nodeid.split("::")[0] in affected])
+        else:
+            print(f"Running {len(affected)} affected test files: {', '.join(affected)}")
+            test_ids = affected
+        if self.shard and not test_ids:
+            return True
+        outcomes = self._run_test_ids(test_ids)
+        failed = [nodeid for nodeid, outcome in outcomes.items() if outcome not in PASSING_OUTCOMES]
+        print(f"Impacted tests: {len(outcomes)} run, {len(failed)} failed")
+        return bool(outcomes) and not failed
+
+    def _changed_files(self, base_ref: str) -> Optional[List[str]]:
+        """
+        List files changed since a git revision, relative to this directory
+        Args:
+            base_ref: Git revision to diff the working tree against
+        Returns:
+            List of changed paths, or None if git could not compute the diff
+        """
         try:
-            subprocess.run([
-                "allure", "generate",
-                "reports/allure-results",
-                "--clean",
-                "-o", "reports/allure-report"
-            ], check=True, capture_output=True)
+            diff = subprocess.run(["git", "diff", "--name-only", "--relative", base_ref],
+                                  capture_output=True, text=True, check=True)
+            untracked = subprocess.run(["git", "ls-files", "--others", "--exclude-standard"],
+                                       capture_output=True, text=True, check=True)
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return sorted(set(diff.stdout.split()) | set(untracked.stdout.split()))
+
+    def _affected_test_files(self, changed: List[str]) -> Optional[List[str]]:
+        """
+        Map changed files to the test files that depend on them
+        Args:
+            changed: Paths changed, relative to this directory
+        Returns:
+            Sorted list of affected test files, or None if a full run is required
+        """
+        changed_modules = set()
+        for path in changed:
+            if path in FULL_RUN_TRIGGERS or os.path.basename(path) in FULL_RUN_FILE_NAMES:
+                return None
+            for prefix, loader in DATA_DEPENDENCIES.items():
+                if path.startswith(prefix):
+                    changed_modules.add(loader)
+            if path.endswith(".py"):
+                changed_modules.add(path)
+        
+        dependencies = self._module_dependencies()
+        affected = []
+        for module in dependencies:
+            if not os.path.basename(module).startswith("test_"):
+                continue
+            if self._transitive_dependencies(module, dependencies) & changed_modules:
+                affected.append(module)
+        return sorted(affected)
+
+    def _module_dependencies(self) -> Dict[str, Set[str]]:
+        """
+        Build the import graph of the local packages
+        Returns:
+            Dictionary of module path to the local module paths it imports
+        """
+        dependencies = {}
+        for package in LOCAL_PACKAGES:
+            if not os.path.isdir(package):
+                continue
+            for directory, subdirectories, file_names in os.walk(package):
+                subdirectories[:] = sorted(name for name in subdirectories if name != "__pycache__")
+                for file_name in sorted(file_names):
+                    if not file_name.endswith(".py"):
+                        continue
+                    path = os.path.join(directory, file_name).replace(os.sep, "/")
+                    dependencies[path] = self._module_imports(path)
+        return dependencies
+
+    def _module_imports(self, path: str) -> Set[str]:
+        """Return the local module paths a module imports"""
+        with open(path, "r") as file:
+            tree = ast.parse(file.read(), filename=path)
+        
+        imported = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                # "from helpers import validations" may name a submodule
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for name in names:
+                module_path = name.replace(".", "/") + ".py"
+                if os.path.isfile(module_path):
+                    imported.add(module_path)
+        return imported
+
+    def _transitive_dependencies(self, module: str, dependencies: Dict[str, Set[str]]) -> Set[str]:
+        """Return a module together with everything it imports, directly or indirectly"""
+        seen = {module}
+        pending = [module]
+        while pending:
+            for dependency in dependencies.get(pending.pop(), set()):
+                if dependency not in seen:
+                    seen.add(dependency)
+                    pending.append(dependency)
+        return seen
+
+    def _generate_report(self) -> bool:
+        """Generate Allure report, skipping the build if the results are unchanged"""
+        from helpers.report_builder import build_report
+        try:
+            return build_report(ALLURE_RESULTS_DIR)
         except Exception as e:
             print(f"Error generating report: {e}")
+            return False
 
     def _open_report(self):
-        """Open Allure report in browser"""
+        """Open the generated Allure report in browser"""
+        from helpers.report_builder import REPORT_DIR
         try:
+            # Waits for a background build from the session, and is a no-op if it already ran
+            if not self._generate_report():
+                raise RuntimeError("report could not be generated")
             print("Opening report in browser...")
             subprocess.run([
-                "allure", "serve",
-                "reports/allure-results"
+                "allure", "open",
+                REPORT_DIR
             ], check=True)
         except Exception as e:
             print(f"[WARNING] Could not open report automatically: {e}")
@@ -301,9 +730,31 @@ class TestSuiteRunner:
         if suite.parallel:
             print(f"Thread Count: {suite.thread_count}")
 
+def _pop_shard_option() -> Optional[Tuple[int, int]]:
+    """
+    Remove --shard i/N (or --shard=i/N) from the command line
+    Returns:
+        (index, count) with a 1-based index, or None when not sharding
+    """
+    value = pop_option("shard")
+    if value is None:
+        return None
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        index, count = 0, 0
+    if not 1 <= index <= count:
+        print(f"[ERROR] Invalid shard '{value}', expected i/N with 1 <= i <= N")
+        sys.exit(2)
+    return index, count
+
 def main():
     """Main function - Command line interface"""
-    runner = TestSuiteRunner()
+    profile_startup = "--profile-startup" in sys.argv
+    if profile_startup:
+        sys.argv.remove("--profile-startup")
+    shard = _pop_shard_option()
+    runner = TestSuiteRunner(profile_startup=profile_startup, shard=shard)
     
     if len(sys.argv) < 2:
         print("Test Suite Runner")
@@ -314,12 +765,18 @@ def main():
         print("  python test_suite_runner.py <suite1> <suite2> <suite3>      # Run multiple suites")
         print("  python test_suite_runner.py all                             # Run all suites")
         print("  python test_suite_runner.py info <suite_name>               # Get suite info")
+        print("  python test_suite_runner.py impact [base_ref] [--list]      # Run tests affected by changes")
+        print("  python test_suite_runner.py <suite_name> --profile-startup  # Profile imports and fixture setup")
+        print("  python test_suite_runner.py <suite_name> --shard i/N        # Run shard i of N, balanced by duration")
+        print("  python test_suite_runner.py merge <shard_reports_dir> [...] # Merge sharded results into one report")
         print("\nExamples:")
         print("  python test_suite_runner.py smoke")
         print("  python test_suite_runner.py regression")
         print("  python test_suite_runner.py smoke regression")
         print("  python test_suite_runner.py all")
         print("  python test_suite_runner.py info smoke")
+        print("  python test_suite_runner.py impact origin/main")
+        print("  python test_suite_runner.py all --shard 2/4")
         return
 
     command = sys.argv[1]
@@ -327,16 +784,27 @@ def main():
     if command == "info" and len(sys.argv) > 2:
         suite_name = sys.argv[2]
         runner.get_suite_info(suite_name)
+    elif command == "impact":
+        args = [arg for arg in sys.argv[2:] if arg != "--list"]
+        base_ref = args[0] if args else "HEAD"
+        success = runner.run_impacted(base_ref, list_only="--list" in sys.argv[2:])
+        sys.exit(0 if success else 1)
+    elif command == "merge":
+        if len(sys.argv) < 3:
+            print("[ERROR] merge needs at least one shard reports directory")
+            sys.exit(2)
+        success = runner.merge_shards(sys.argv[2:])
+        sys.exit(0 if success else 1)
     elif command == "all":
-        runner.run_all_suites()
+        runner.run_all_suites(generate_report=not shard, open_report=not shard)
     elif len(sys.argv) == 2:
         # Single suite
         suite_name = sys.argv[1]
-        runner.run_suite(suite_name)
+        runner.run_suite(suite_name, open_report=not shard)
     else:
         # Multiple suites
         suite_names = sys.argv[1:]
-        runner.run_multiple_suites(suite_names)
+        runner.run_multiple_suites(suite_names, generate_report=not shard, open_report=not shard)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -2,69 +2,58 @@
 Base test class with common functionality for all API tests
 """
 
-import json
 import pytest
-import allure
+from api_client.json_codec import get_json_codec
+from helpers.lazy_import import lazy_import
+from helpers.log_sink import get_log_sink
 from abc import ABC
 
-
-def print_centered_header(text, width=80):
-    """Print a centered header with equals signs"""
-    print(f"\n{'=' * width}")
-    print(f"{text:^{width}}")
-    print(f"{'=' * width}")
+allure = lazy_import("allure")
 
 
 class BaseAPITest(ABC):
     """Base class for all API tests with common functionality"""
 
     def _log_request(self, method, url, headers=None, payload=None, params=None):
-        """Helper method to log request details"""
-        print_centered_header("REQUEST")
-        print(f"Method: {method}")
-        print(f"URL: {url}")
-        if headers:
-            print(f"Headers:")
-            for key, value in headers.items():
-                print(f"  {key}: {value}")
-        if payload:
-            print(f"Payload:")
-            print(json.dumps(payload, indent=4))
-        if params:
-            print(f"Query Parameters:")
-            for key, value in params.items():
-                print(f"  {key}: {value}")
-        print()
+        """Helper method to log request details to the structured log sink"""
+        sink = get_log_sink()
+        # Sample request and response together so pairs stay complete
+        self._log_sampled = sink.sample()
+        if not self._log_sampled:
+            return
+        record = {"event": "request", "method": method, "url": url, "params": params}
+        if sink.enabled("debug"):
+            record["headers"] = headers
+            if payload is not None:
+                record["body"] = sink.truncate_body(get_json_codec().dumps(payload))
+        sink.emit(record)
 
-    def _log_response(self, response, response_data=None):
-        """Helper method to log response details"""
-        print_centered_header("RESPONSE")
-        print(f"Status Code: {response.status_code}")
-        print(f"Response Time: {response.elapsed.total_seconds():.3f}s")
-        print(f"Headers:")
-        for key, value in dict(response.headers).items():
-            print(f"  {key}: {value}")
-        if response_data:
-            print(f"Response Body:")
-            print(json.dumps(response_data, indent=4))
-        else:
-            print(f"Response Body: {response.text}")
-        print()
+    def _log_response(self, response, response_data=None, performance=False):
+        """Helper method to log response details to the structured log sink"""
+        sink = get_log_sink()
+        # Follow the request's sampling decision; responses without a logged request sample on their own
+        sampled = self._log_sampled if hasattr(self, "_log_sampled") else sink.sample()
+        if not sampled:
+            return
+        record = {
+            "event": "response",
+            "method": response.request.method,
+            "url": response.url,
+            "status_code": response.status_code,
+            "elapsed": response.elapsed.total_seconds(),
+            "body_size": len(response.content),
+            "performance": performance
+        }
+        if sink.enabled("debug"):
+            # Slice the raw bytes instead of re-serialising response_data
+            record["headers"] = dict(response.headers)
+            record["body"] = sink.truncate_body(response.content)
+            record["truncated"] = len(response.content) > sink.body_limit
+        sink.emit(record)
 
     def _log_performance_response(self, response, response_data=None):
         """Helper method to log performance test response details"""
-        print_centered_header("RESPONSE")
-        print(f"Status Code: {response.status_code}")
-        print(f"Response Time: {response.elapsed.total_seconds():.3f}s")
-        print(f"Headers:")
-        for key, value in dict(response.headers).items():
-            print(f"  {key}: {value}")
-        if response_data:
-            print(f"Response Body:")
-            print(json.dumps(response_data, indent=4))
-        else:
-            print(f"Response Body: {response.text}")
-        print()
+        self._log_response(response, response_data, performance=True)
 
     def _validate_basic_response(self, response, expected_status_code, max_response_time=5.0):
         """Helper method to validate basic response properties"""
@@ -5,7 +5,7 @@ Tests the POST /api/equipment endpoint
 
 import pytest
 import json
-import allure
+from helpers.lazy_import import lazy_import
 from api_client.equipment_api import EquipmentAPIClient
 from helpers.test_data import create_equipment_payload, load_test_data
 from helpers.validations import (
@@ -29,6 +29,8 @@ from helpers.constants import (
 )
 from tests.base_test import BaseAPITest
 
+allure = lazy_import("allure")
+
 
 class TestAddEquipment(BaseAPITest):
     """Test cases for adding new equipment"""
@@ -3,7 +3,7 @@ Test cases for getting all equipment
 """
 
 import pytest
-import allure
+from helpers.lazy_import import lazy_import
 import json
 from api_client.equipment_api import EquipmentAPIClient
 
@@ -22,6 +22,8 @@ from helpers.constants import (
 )
 from tests.base_test import BaseAPITest
 
+allure = lazy_import("allure")
+
 
 class TestGetAllEquipment(BaseAPITest):
     """Test cases for getting all equipment"""
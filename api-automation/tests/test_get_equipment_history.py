@@ -4,7 +4,7 @@ Test cases for getting equipment status history
 
 import pytest
 import json
-import allure
+from helpers.lazy_import import lazy_import
 from api_client.equipment_api import EquipmentAPIClient
 
 from helpers.validations import (
@@ -24,6 +24,8 @@ from helpers.constants import (
 )
 from tests.base_test import BaseAPITest
 
+allure = lazy_import("allure")
+
 
 class TestGetEquipmentHistory(BaseAPITest):
     """Test cases for getting equipment status history"""
@@ -3,7 +3,7 @@ Test cases for updating equipment status
 """
 
 import pytest
-import allure
+from helpers.lazy_import import lazy_import
 import json
 from api_client.equipment_api import EquipmentAPIClient
 
@@ -29,6 +29,8 @@ from helpers.constants import (
 )
 from tests.base_test import BaseAPITest
 
+allure = lazy_import("allure")
+
 
 class TestUpdateEquipmentStatus(BaseAPITest):
     """Test cases for updating equipment status"""
@@ -68,7 +70,7 @@ class TestUpdateEquipmentStatus(BaseAPITest):
 
     @pytest.mark.smoke
     @pytest.mark.update_status
-    def test_update_equipment_status_success(self, api_client: EquipmentAPIClient, valid_status_data):
+    def test_update_equipment_status_success(self, api_client: EquipmentAPIClient, expected_state, valid_status_data):
         """Update equipment status successfully"""
         url = f"{api_client.base_url}{UPDATE_STATUS_ENDPOINT.format(id=TEST_EQUIPMENT_ID)}"
         
@@ -83,6 +85,9 @@ class TestUpdateEquipmentStatus(BaseAPITest):
             assert_response_time(response, MAX_RESPONSE_TIME)
             assert_content_type(response, CONTENT_TYPE_JSON)
             validate_equipment_status_update_response(response_data)
+        
+        with allure.step("Validate state consistency against local expectations"):
+            expected_state.assert_consistent()
 
     @pytest.mark.regression
     @pytest.mark.update_status
@@ -0,0 +1,55 @@
+"""
+Offline tests for the command line helpers shared by the runner scripts
+"""
+
+import sys
+
+import pytest
+
+from helpers.cli import known_equipment_ids, pop_option
+
+
+class FakeClient:
+    """Streams equipment records and remembers whether the stream was closed early"""
+
+    def __init__(self, count: int):
+        self.count = count
+        self.closed = False
+
+    def iter_all_equipment(self):
+        try:
+            for index in range(self.count):
+                yield {"id": index + 1}
+        finally:
+            self.closed = True
+
+
+class TestPopOption:
+    """pop_option() removes the option it returns"""
+
+    @pytest.mark.parametrize("argv", [
+        ["runner.py", "--seed", "7", "--no-shrink"],
+        ["runner.py", "--seed=7", "--no-shrink"],
+    ])
+    def test_separate_and_inline_value(self, argv, monkeypatch):
+        monkeypatch.setattr(sys, "argv", list(argv))
+        assert pop_option("seed") == "7"
+        assert sys.argv == ["runner.py", "--no-shrink"]
+
+    def test_absent_and_missing_value(self, monkeypatch):
+        monkeypatch.setattr(sys, "argv", ["runner.py", "--shard"])
+        assert pop_option("seeds", "1") == "1"
+        assert pop_option("shard") == ""
+        assert sys.argv == ["runner.py"]
+
+
+class TestKnownEquipmentIds:
+    """known_equipment_ids() samples a few IDs and releases the stream"""
+
+    def test_stops_at_limit(self):
+        client = FakeClient(1000)
+        assert known_equipment_ids(client, limit=3) == [1, 2, 3]
+        assert client.closed
+
+    def test_empty_fleet(self):
+        assert known_equipment_ids(FakeClient(0)) == []
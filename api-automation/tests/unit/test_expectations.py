@@ -0,0 +1,61 @@
+"""
+Offline tests for the expected state model
+"""
+
+import json
+from types import SimpleNamespace
+
+from api_client.expectations import ExpectedStateModel
+
+BASE_URL = "http://api.test"
+
+
+def _status_update(model: ExpectedStateModel, entry_id: int, previous: str, new: str, timestamp: str) -> None:
+    """Feed the model a successful status update response for equipment 1"""
+    response = SimpleNamespace(
+        url=f"{BASE_URL}/api/equipment/1/status",
+        status_code=200,
+        request=SimpleNamespace(method="POST", body=json.dumps({"status": new}).encode("utf-8"))
+    )
+    model(response, {"success": True, "data": {
+        "equipment": {"id": 1, "name": "Pump", "status": new, "location": "Site", "lastUpdated": timestamp},
+        "historyEntry": {"id": entry_id, "equipmentId": 1, "previousStatus": previous, "newStatus": new,
+                         "timestamp": timestamp, "changedBy": "test"}
+    }})
+
+
+class TestExpectedStateModel:
+    """ExpectedStateModel checks"""
+
+    def test_consecutive_updates_chain(self):
+        """Back-to-back updates with no write in between are consistent"""
+        model = ExpectedStateModel()
+        _status_update(model, 10, "Active", "Idle", "2025-06-01T08:00:00.000Z")
+        _status_update(model, 11, "Idle", "Active", "2025-06-01T08:00:01.000Z")
+        model.assert_consistent()
+
+    def test_broken_chain_without_other_writes(self):
+        """The next entry in sequence must start from the status just set"""
+        model = ExpectedStateModel()
+        _status_update(model, 10, "Active", "Idle", "2025-06-01T08:00:00.000Z")
+        _status_update(model, 11, "Under Maintenance", "Active", "2025-06-01T08:00:01.000Z")
+        assert len(model.violations) == 1
+        assert "previousStatus should be Idle" in model.violations[0]
+
+    def test_other_client_wrote_in_between(self):
+        """A gap in entry IDs means another client updated the equipment; follow the server"""
+        model = ExpectedStateModel()
+        _status_update(model, 10, "Active", "Idle", "2025-06-01T08:00:00.000Z")
+        _status_update(model, 14, "Under Maintenance", "Active", "2025-06-01T08:00:05.000Z")
+        model.assert_consistent()
+
+    def test_timestamps_compared_as_times(self):
+        """A timestamp without milliseconds is not earlier than the same second with them"""
+        model = ExpectedStateModel()
+        _status_update(model, 10, "Active", "Idle", "2025-06-01T08:00:00Z")
+        _status_update(model, 11, "Idle", "Active", "2025-06-01T08:00:00.500Z")
+        model.assert_consistent()
+
+        _status_update(model, 12, "Active", "Idle", "2025-06-01T08:00:00Z")
+        assert len(model.violations) == 2
+        assert all("is earlier than 2025-06-01T08:00:00.500Z" in violation for violation in model.violations)
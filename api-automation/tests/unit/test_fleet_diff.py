@@ -0,0 +1,89 @@
+"""
+Offline tests for incremental fleet diffing
+"""
+
+import pytest
+
+from api_client.fleet_diff import FleetDiffer
+
+PUMP = {"id": 1, "name": "Pump", "status": "Active", "location": "Site A", "lastUpdated": "2025-06-01T08:00:00.000Z"}
+PRESS = {"id": 2, "name": "Press", "status": "Idle", "location": "Site B", "lastUpdated": "2025-06-01T09:00:00.000Z"}
+DRILL = {"id": 3, "name": "Drill", "status": "Active", "location": "Site A", "lastUpdated": "2025-06-01T10:00:00.000Z"}
+
+
+class FakeClient:
+    """Streams each snapshot in turn, repeating the last one"""
+
+    def __init__(self, *snapshots):
+        self.snapshots = list(snapshots)
+        self.polls = 0
+
+    def iter_all_equipment(self):
+        self.polls += 1
+        snapshot = self.snapshots[0] if len(self.snapshots) == 1 else self.snapshots.pop(0)
+        return iter(snapshot)
+
+
+class TestFleetDiffer:
+    """diff(), apply() and polling"""
+
+    def test_added_removed_changed(self):
+        differ = FleetDiffer([PUMP, PRESS])
+        idle_pump = dict(PUMP, status="Idle", lastUpdated="2025-06-01T11:00:00.000Z")
+        diff = differ.diff([idle_pump, DRILL])
+        assert diff.added == [DRILL]
+        assert diff.removed == [2]
+        assert diff.changed == [idle_pump]
+        assert diff.churn == 3 and diff
+
+    def test_unchanged_snapshot(self):
+        differ = FleetDiffer([PUMP, PRESS])
+        diff = differ.diff(iter([dict(PRESS), dict(PUMP)]))
+        assert not diff and diff.churn == 0
+
+    def test_unhashed_fields_are_ignored(self):
+        """Only HASHED_FIELDS count as content"""
+        differ = FleetDiffer([PUMP])
+        assert not differ.diff([dict(PUMP, extra="ignored")])
+
+    def test_diff_does_not_change_state(self):
+        differ = FleetDiffer([PUMP])
+        differ.diff([PRESS])
+        assert differ.records == {1: PUMP} and len(differ) == 1
+
+    @pytest.mark.parametrize("snapshot", [[PRESS, PRESS], [PUMP, PUMP], [dict(PUMP, status="Idle"), PUMP]])
+    def test_duplicate_ids(self, snapshot):
+        differ = FleetDiffer([PUMP])
+        with pytest.raises(ValueError, match="more than once"):
+            differ.diff(snapshot)
+
+    def test_apply_keeps_records_in_sync(self):
+        differ = FleetDiffer([PUMP, PRESS])
+        idle_pump = dict(PUMP, status="Idle")
+        differ.update([idle_pump, DRILL])
+        assert differ.records == {1: idle_pump, 3: DRILL}
+        assert len(differ) == 2
+        # The applied snapshot is the new baseline
+        assert not differ.diff([idle_pump, DRILL])
+        differ.update([])
+        assert differ.records == {} and len(differ) == 0
+
+
+class TestWaitForChange:
+    """Polling a client until the fleet changes"""
+
+    def test_returns_first_change(self):
+        idle_pump = dict(PUMP, status="Idle")
+        client = FakeClient([PUMP], [PUMP], [idle_pump])
+        differ = FleetDiffer([PUMP])
+        diff = differ.wait_for_change(client, timeout=5.0, interval=0.001)
+        assert diff.changed == [idle_pump]
+        assert client.polls == 3
+        assert differ.records == {1: idle_pump}
+
+    def test_times_out(self):
+        client = FakeClient([PUMP])
+        differ = FleetDiffer([PUMP])
+        with pytest.raises(TimeoutError, match="did not change"):
+            differ.wait_for_change(client, timeout=0.05, interval=0.01)
+        assert client.polls >= 2
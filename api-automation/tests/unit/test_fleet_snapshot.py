@@ -0,0 +1,80 @@
+"""
+Offline tests for the columnar fleet snapshot
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api_client.fleet_snapshot import FleetSnapshot
+from api_client.models import ModelValidationError
+
+np = pytest.importorskip("numpy")
+
+NOW = datetime(2025, 6, 2, 12, 0, tzinfo=timezone.utc)
+RECORDS = [
+    {"id": 1, "name": "Pump", "status": "Active", "location": "Site A", "lastUpdated": "2025-06-02T11:00:00.000Z"},
+    {"id": 2, "name": "Press", "status": "Idle", "location": "Site B", "lastUpdated": "2025-05-30T08:00:00.250Z"},
+    {"id": 3, "name": "Drill", "status": "Idle", "location": "Site A", "lastUpdated": "2025-06-01T09:00:00.000Z"},
+    {"id": 4, "name": "Lathe", "status": "Under Maintenance", "location": "Site A",
+     "lastUpdated": "2025-06-02T10:00:00.000Z"},
+]
+
+
+@pytest.fixture
+def snapshot():
+    return FleetSnapshot.from_records(RECORDS)
+
+
+class TestFleetSnapshot:
+    """Building and aggregating snapshots"""
+
+    def test_from_records(self, snapshot):
+        assert len(snapshot) == 4
+        assert snapshot.ids.tolist() == [1, 2, 3, 4]
+        assert snapshot.locations == ["Site A", "Site B"]
+        assert snapshot.location_codes.tolist() == [0, 1, 0, 0]
+        assert snapshot.last_updated[1] == np.datetime64("2025-05-30T08:00:00.250")
+
+    def test_invalid_status(self):
+        with pytest.raises(ModelValidationError, match="Invalid status"):
+            FleetSnapshot.from_records([dict(RECORDS[0], status="active")])
+
+    def test_status_counts_by_location(self, snapshot):
+        assert snapshot.status_counts() == {"Active": 1, "Idle": 2, "Under Maintenance": 1}
+        assert snapshot.status_counts_by_location() == {
+            "Site A": {"Active": 1, "Idle": 1, "Under Maintenance": 1},
+            "Site B": {"Active": 0, "Idle": 1, "Under Maintenance": 0},
+        }
+
+    def test_filtered_location_drops_out(self, snapshot):
+        """Locations with no rows left after filtering are not reported"""
+        assert snapshot.filter(status="Active").status_counts_by_location() == {
+            "Site A": {"Active": 1, "Idle": 0, "Under Maintenance": 0}}
+
+    def test_filter(self, snapshot):
+        assert snapshot.filter(status="Idle", location="Site A").ids.tolist() == [3]
+        assert snapshot.filter(location="Site C").ids.tolist() == []
+        assert snapshot.filter(updated_after=datetime(2025, 6, 2, tzinfo=timezone.utc)).ids.tolist() == [1, 4]
+        with pytest.raises(ValueError):
+            snapshot.mask(status="Retired")
+
+    def test_stale(self, snapshot):
+        assert snapshot.stale(timedelta(hours=12), now=NOW).ids.tolist() == [2, 3]
+        assert snapshot.stale(timedelta(days=30), now=NOW).ids.tolist() == []
+        # Naive datetimes are taken as UTC
+        assert snapshot.stale(timedelta(hours=1, minutes=30), now=NOW.replace(tzinfo=None)).ids.tolist() == [2, 3, 4]
+
+    def test_oldest_update_by_location(self, snapshot):
+        assert snapshot.oldest_update_by_location() == {
+            "Site A": datetime(2025, 6, 1, 9, 0, tzinfo=timezone.utc),
+            "Site B": datetime(2025, 5, 30, 8, 0, 0, 250000, tzinfo=timezone.utc),
+        }
+
+    def test_empty_fleet(self):
+        empty = FleetSnapshot.from_records([])
+        assert len(empty) == 0
+        assert empty.status_counts() == {"Active": 0, "Idle": 0, "Under Maintenance": 0}
+        assert empty.status_counts_by_location() == {}
+        assert empty.oldest_update_by_location() == {}
+        assert len(empty.stale(timedelta(0), now=NOW)) == 0
@@ -0,0 +1,153 @@
+"""
+Offline tests for the fuzzing engine: generation, oracle, deduplication and shrinking
+"""
+
+import json
+
+import pytest
+
+from helpers.fuzzing import (
+    EXPECT_REJECTED, EXPECT_SUCCESS, CaseGenerator, Finding, FuzzCase, FuzzEngine, check, normalize_message,
+    simplifications
+)
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the oracle"""
+
+    def __init__(self, status_code: int, body=None, close_error: Exception = None):
+        self.status_code = status_code
+        self.text = json.dumps(body) if body is not None else ""
+        self.headers = {"content-type": "application/json"}
+        self._close_error = close_error
+
+    def json(self):
+        return json.loads(self.text)
+
+    def close(self):
+        if self._close_error:
+            raise self._close_error
+
+
+class FakeClient:
+    """Answers every request through a handler(case fields) -> FakeResponse"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = 0
+
+    def _make_request(self, method, endpoint, params=None, raw_body=None):
+        self.requests += 1
+        return self.handler(method, endpoint, params, raw_body)
+
+
+def _created(body: bytes) -> dict:
+    payload = json.loads(body)
+    return {"success": True, "data": dict(payload, id=1, lastUpdated="2025-06-01T08:30:15.123Z")}
+
+
+class TestCaseGenerator:
+    """Deterministic case generation"""
+
+    def test_same_seed_and_index_give_same_case(self):
+        """case(index) depends only on (seed, index), not on generation order"""
+        forward = [CaseGenerator(seed=7, known_ids=[3, 4]).case(index).to_dict() for index in range(200)]
+        generator = CaseGenerator(seed=7, known_ids=[3, 4])
+        backward = [generator.case(index).to_dict() for index in reversed(range(200))][::-1]
+        assert forward == backward
+
+    def test_different_seeds_differ(self):
+        first = [CaseGenerator(seed=1).case(index).to_dict() for index in range(50)]
+        second = [CaseGenerator(seed=2).case(index).to_dict() for index in range(50)]
+        assert first != second
+
+    def test_covers_operations_and_mutations(self):
+        """A modest run exercises every operation, valid cases and raw mutations"""
+        cases = [CaseGenerator(seed=3).case(index) for index in range(500)]
+        assert {case.operation for case in cases} == {"add_equipment", "update_status", "get_history"}
+        assert any(case.mutation == "none" for case in cases)
+        assert any(case.mutation.startswith("raw:") for case in cases)
+
+    def test_unknown_operation(self):
+        with pytest.raises(ValueError):
+            CaseGenerator(operations=["delete_equipment"])
+
+
+class TestOracle:
+    """check() and message normalisation"""
+
+    def test_valid_case_accepted(self):
+        case = FuzzCase("add_equipment", payload={"name": "Pump", "status": "Active", "location": "Site"})
+        assert check(case, FakeResponse(201, _created(case.body()))) is None
+
+    def test_server_error(self):
+        case = FuzzCase("add_equipment", payload={"name": "Pump", "status": "Active", "location": "Site"})
+        assert check(case, FakeResponse(500, {"error": "boom"})) == ("server_error", "boom")
+
+    def test_invalid_case_accepted(self):
+        case = FuzzCase("add_equipment", payload={"name": "Pump", "status": "active", "location": "Site"},
+                        mutation="enum:status", expect=EXPECT_REJECTED)
+        assert check(case, FakeResponse(201, _created(case.body()))) == ("accepted_invalid", "enum:status")
+
+    def test_valid_case_rejected(self):
+        case = FuzzCase("add_equipment", payload={"name": "Pump", "status": "Idle", "location": "Site"},
+                        expect=EXPECT_SUCCESS)
+        assert check(case, FakeResponse(400, {"error": "bad"}))[0] == "rejected_valid"
+
+    def test_normalize_message(self):
+        """Values that vary between occurrences of one failure are masked"""
+        assert normalize_message("Equipment 42 'Pump 7' not found") == \
+            normalize_message("Equipment 9 'Press' not found")
+
+
+class TestFuzzEngine:
+    """Running and shrinking against a fake client"""
+
+    def test_errors_do_not_end_the_run(self):
+        """A response that fails to close is recorded as a finding instead of raising"""
+        client = FakeClient(lambda *request: FakeResponse(500, {"error": "boom"}, close_error=RuntimeError("closed")))
+        engine = FuzzEngine(client, CaseGenerator(seed=1), workers=4)
+        findings = engine.run(cases=40, shrink=False)
+        assert engine.sent == 40
+        assert findings and all(finding.signature[1] == "server_error" for finding in findings)
+
+    def test_validator_errors_become_findings(self):
+        """Unexpected exceptions from checking a response are recorded, not raised"""
+        class BrokenResponse(FakeResponse):
+            def json(self):
+                raise RuntimeError("decoder crashed")
+
+        client = FakeClient(lambda *request: BrokenResponse(200, {}))
+        engine = FuzzEngine(client, CaseGenerator(seed=1, operations=["get_history"]), workers=2)
+        findings = engine.run(cases=10, shrink=False)
+        assert {finding.signature[1] for finding in findings} == {"transport_error"}
+
+    def test_shrinker_makes_progress(self):
+        """A failure triggered by a long name shrinks to a much smaller reproducer"""
+        def handler(method, endpoint, params, raw_body):
+            payload = json.loads(raw_body)
+            if len(str(payload.get("name", ""))) > 3:
+                return FakeResponse(500, {"error": "name too long for column"})
+            return FakeResponse(201, _created(raw_body))
+
+        case = FuzzCase("add_equipment", mutation="long:name", expect="any",
+                        payload={"name": "x" * 4096, "status": "Active", "location": "Warehouse 12"})
+        engine = FuzzEngine(FakeClient(handler), CaseGenerator(), shrink_budget=64)
+        signature = engine.signature(case)
+        assert signature is not None
+
+        finding = Finding(signature, case, "name too long for column")
+        minimal = engine.shrink(finding)
+        assert minimal.size() < case.size() // 10
+        assert engine.signature(minimal) == signature
+        assert 3 < len(minimal.payload["name"]) < 64
+
+    def test_simplifications_are_smaller(self):
+        """Every candidate keeps the operation and mutation and drops something"""
+        case = CaseGenerator(seed=5).case(0).replace(raw=b'{"name": "Pump", "status": "Active"}',
+                                                     mutation="raw:truncated")
+        candidates = list(simplifications(case))
+        assert candidates
+        assert all(candidate.operation == case.operation and candidate.mutation == case.mutation
+                   for candidate in candidates)
+        assert all(len(candidate.raw) < len(case.raw) for candidate in candidates if candidate.raw is not None)
@@ -0,0 +1,153 @@
+"""
+Offline tests for the health probe verdict and its cross-process cache
+"""
+
+import json
+from datetime import timedelta
+
+import pytest
+import requests
+
+from api_client.health import FAILURE_TTL_SECONDS, PROBE_ENDPOINT, cached_health_check, probe
+from api_client.json_codec import get_json_codec
+
+BASE_URL = "http://api.test"
+EMPTY_HISTORY = {"success": True, "data": {"equipmentId": 99999, "history": [], "total": 0, "hasMore": False}}
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the probe"""
+
+    def __init__(self, status_code: int, body):
+        self.status_code = status_code
+        self.content = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.elapsed = timedelta(milliseconds=12)
+
+
+class FakeSession:
+    """Answers every request with one response, or raises one exception"""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        return self.answer
+
+
+class FakeClient:
+    """Just enough of EquipmentAPIClient for the probe"""
+
+    def __init__(self, answer, base_url: str = BASE_URL):
+        self.base_url = base_url
+        self.config = {"health_timeout": 2.0, "health_cache_file": "", "health_cache_ttl": 0}
+        self.codec = get_json_codec("json")
+        self.session = FakeSession(answer)
+
+
+class TestProbe:
+    """Verdict rules"""
+
+    def test_healthy(self):
+        client = FakeClient(FakeResponse(200, EMPTY_HISTORY))
+        result = probe(client)
+        assert result and not result.cached
+        assert result.detail == "HTTP 200 in 12 ms"
+        method, url, options = client.session.requests[0]
+        assert (method, url, options["timeout"]) == ("GET", f"{BASE_URL}{PROBE_ENDPOINT}", 2.0)
+
+    def test_json_404_for_unknown_equipment(self):
+        """A backend that starts rejecting the unknown probe ID is still up"""
+        assert probe(FakeClient(FakeResponse(404, {"success": False, "error": "Equipment not found"})))
+
+    @pytest.mark.parametrize("status_code, body, detail", [
+        (500, {"success": False}, "HTTP 500"),
+        (503, b"<html>Bad gateway</html>", "HTTP 503"),
+        (200, b"<html>Login</html>", "without a successful JSON body"),
+        (200, {"success": False}, "without a successful JSON body"),
+        (200, ["success"], "without a successful JSON body"),
+        (404, b"<html>Not Found</html>", "without the API's JSON error body"),
+        (404, {"detail": "Not Found"}, "without the API's JSON error body"),
+    ])
+    def test_unhealthy(self, status_code, body, detail):
+        result = probe(FakeClient(FakeResponse(status_code, body)))
+        assert not result
+        assert detail in result.detail
+
+    def test_connection_error(self):
+        result = probe(FakeClient(requests.exceptions.ConnectionError("refused")))
+        assert not result and result.detail == "ConnectionError: refused"
+
+
+class TestCachedHealthCheck:
+    """TTLs and reuse across processes through the cache file"""
+
+    def _age_entry(self, cache_file: str, seconds: float) -> None:
+        with open(cache_file) as file:
+            cache = json.load(file)
+        for entry in cache.values():
+            entry["checked_at"] -= seconds
+        with open(cache_file, "w") as file:
+            json.dump(cache, file)
+
+    def test_second_process_reuses_verdict(self, tmp_path):
+        """A client in another worker finds the verdict in the file instead of probing"""
+        cache_file = str(tmp_path / ".health.json")
+        first = FakeClient(FakeResponse(200, EMPTY_HISTORY))
+        second = FakeClient(requests.exceptions.ConnectionError("should not be called"))
+        assert cached_health_check(first, cache_file, ttl=60)
+        result = cached_health_check(second, cache_file, ttl=60)
+        assert result and result.cached
+        assert second.session.requests == []
+
+    def test_healthy_verdict_expires_after_ttl(self, tmp_path):
+        cache_file = str(tmp_path / ".health.json")
+        client = FakeClient(FakeResponse(200, EMPTY_HISTORY))
+        cached_health_check(client, cache_file, ttl=60)
+        self._age_entry(cache_file, 30)
+        assert cached_health_check(client, cache_file, ttl=60).cached
+        self._age_entry(cache_file, 31)
+        assert not cached_health_check(client, cache_file, ttl=60).cached
+        assert len(client.session.requests) == 2
+
+    def test_failure_is_reprobed_sooner(self, tmp_path):
+        """An unhealthy verdict is kept for at most FAILURE_TTL_SECONDS, however long the TTL"""
+        cache_file = str(tmp_path / ".health.json")
+        client = FakeClient(FakeResponse(503, b""))
+        assert not cached_health_check(client, cache_file, ttl=600)
+        assert cached_health_check(client, cache_file, ttl=600).cached
+        self._age_entry(cache_file, FAILURE_TTL_SECONDS + 1)
+        client.session.answer = FakeResponse(200, EMPTY_HISTORY)
+        result = cached_health_check(client, cache_file, ttl=600)
+        assert result and not result.cached
+
+    def test_verdicts_are_kept_per_base_url(self, tmp_path):
+        cache_file = str(tmp_path / ".health.json")
+        assert cached_health_check(FakeClient(FakeResponse(200, EMPTY_HISTORY)), cache_file, ttl=60)
+        other = FakeClient(FakeResponse(503, b""), base_url="http://other.test")
+        result = cached_health_check(other, cache_file, ttl=60)
+        assert not result and not result.cached
+
+    def test_clock_going_backwards_reprobes(self, tmp_path):
+        cache_file = str(tmp_path / ".health.json")
+        client = FakeClient(FakeResponse(200, EMPTY_HISTORY))
+        cached_health_check(client, cache_file, ttl=60)
+        self._age_entry(cache_file, -30)
+        assert not cached_health_check(client, cache_file, ttl=60).cached
+
+    @pytest.mark.parametrize("cache_file, ttl", [("", 60), ("cache", 0)])
+    def test_cache_disabled(self, tmp_path, cache_file, ttl):
+        client = FakeClient(FakeResponse(200, EMPTY_HISTORY))
+        path = str(tmp_path / cache_file) if cache_file else ""
+        for _ in range(2):
+            assert not cached_health_check(client, path, ttl=ttl).cached
+        assert len(client.session.requests) == 2
+
+    def test_corrupt_cache_file(self, tmp_path):
+        cache_file = tmp_path / ".health.json"
+        cache_file.write_text("{not json")
+        assert cached_health_check(FakeClient(FakeResponse(200, EMPTY_HISTORY)), str(cache_file), ttl=60)
+        assert json.loads(cache_file.read_text())[BASE_URL]["healthy"] is True
@@ -0,0 +1,69 @@
+"""
+Offline tests for change-based impact selection in the suite runner
+"""
+
+import os
+
+import pytest
+
+import test_suite_runner
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FILES = {
+    "helpers/__init__.py": "",
+    "helpers/shared.py": "import json\n",
+    "helpers/checks.py": "from helpers import shared\n",
+    "api_client/client.py": "from helpers.checks import *\n",
+    "tests/conftest.py": "",
+    "tests/test_api.py": "from api_client.client import *\n",
+    "tests/unit/conftest.py": "",
+    "tests/unit/test_checks.py": "from helpers import checks\n",
+    "tests/unit/deep/test_shared.py": "import helpers.shared\n",
+    "tests/unit/__pycache__/test_stale.py": "from helpers import shared\n",
+    "test_data/equipment.json": "{}\n",
+}
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    """Suite runner working in a small project tree"""
+    for path, source in FILES.items():
+        target = tmp_path / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(source)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(test_suite_runner, "DATA_DEPENDENCIES", {"test_data/": "helpers/shared.py"})
+    return test_suite_runner.TestSuiteRunner()
+
+
+class TestAffectedTestFiles:
+    """_affected_test_files() maps changed paths to test files"""
+
+    def test_nested_test_directories(self, runner):
+        """Tests below tests/, at any depth, are found through direct and indirect imports"""
+        assert runner._affected_test_files(["helpers/shared.py"]) == [
+            "tests/test_api.py", "tests/unit/deep/test_shared.py", "tests/unit/test_checks.py"]
+        assert runner._affected_test_files(["helpers/checks.py"]) == ["tests/test_api.py", "tests/unit/test_checks.py"]
+
+    def test_changed_test_file(self, runner):
+        assert runner._affected_test_files(["tests/unit/deep/test_shared.py"]) == ["tests/unit/deep/test_shared.py"]
+
+    def test_data_files_map_to_their_loader(self, runner):
+        assert "tests/unit/test_checks.py" in runner._affected_test_files(["test_data/equipment.json"])
+
+    @pytest.mark.parametrize("path", ["conftest.py", "tests/conftest.py", "tests/unit/conftest.py",
+                                      "pytest.ini", "requirements.txt"])
+    def test_full_run_triggers(self, runner, path):
+        assert runner._affected_test_files(["helpers/checks.py", path]) is None
+
+    def test_unrelated_change(self, runner):
+        assert runner._affected_test_files(["README.md", "fuzz_runner.py"]) == []
+
+
+def test_unit_tests_are_in_the_import_graph(monkeypatch):
+    """In this project, a change to a helper selects its offline unit tests"""
+    monkeypatch.chdir(PROJECT_DIR)
+    runner = test_suite_runner.TestSuiteRunner()
+    assert runner._affected_test_files(["helpers/cli.py"]) == ["tests/unit/test_cli.py"]
+    assert "tests/unit/test_impact.py" in runner._affected_test_files(["test_suite_runner.py"])
@@ -0,0 +1,58 @@
+"""
+Offline tests for the incremental JSON array parser
+"""
+
+import json
+
+import pytest
+
+from api_client.json_stream import StreamedArray
+
+SAMPLE_BODY = json.dumps({
+    "success": True,
+    "data": [
+        {"id": 1, "name": "Gerät 设备 🚜", "status": "Active", "location": "Site \"A\"",
+         "lastUpdated": "2025-06-01T08:30:15.123Z"},
+        1.5, -2, 1e3, 12.25E-1, 0, -0.0, 3.0e+2, True, False, None, "text", [], {},
+        [1, [2.75, {"deep": -1e-2}]]
+    ],
+    "count": 15
+}, ensure_ascii=False).encode("utf-8")
+EXPECTED = json.loads(SAMPLE_BODY)
+
+
+def _parse(chunks):
+    stream = StreamedArray(chunks, "data")
+    return list(stream), stream
+
+
+class TestStreamedArray:
+    """StreamedArray parsing across chunk boundaries"""
+
+    @pytest.mark.parametrize("offset", range(1, len(SAMPLE_BODY)))
+    def test_split_at_every_offset(self, offset):
+        """Splitting the body into two chunks anywhere gives the same items and envelope"""
+        items, stream = _parse([SAMPLE_BODY[:offset], SAMPLE_BODY[offset:]])
+        assert items == EXPECTED["data"]
+        assert stream.envelope == {"success": True, "count": 15}
+        assert stream.complete
+
+    def test_single_byte_chunks(self):
+        """One byte per chunk, including inside multi-byte UTF-8 characters"""
+        items, _ = _parse([SAMPLE_BODY[index:index + 1] for index in range(len(SAMPLE_BODY))])
+        assert items == EXPECTED["data"]
+
+    @pytest.mark.parametrize("chunks, expected", [
+        ([b'{"data":[1.', b'5,2],"count":2}'], [1.5, 2]),
+        ([b'{"data":[1e', b'3]}'], [1000.0]),
+        ([b'{"data":[1e+', b'3]}'], [1000.0]),
+        ([b'{"data":[-', b'7]}'], [-7]),
+    ])
+    def test_number_cut_by_chunk_edge(self, chunks, expected):
+        """A number cut after its dot, exponent or sign continues in the next chunk"""
+        assert _parse(chunks)[0] == expected
+
+    def test_truncated_stream(self):
+        """A body that ends mid-array is reported as malformed"""
+        with pytest.raises(ValueError):
+            _parse([SAMPLE_BODY[:len(SAMPLE_BODY) // 2]])
@@ -0,0 +1,64 @@
+"""
+Offline tests for the request/response log sink lifecycle
+"""
+
+import json
+import random
+import threading
+
+from helpers import log_sink
+from helpers.log_sink import LogSink, close_log_sink, get_log_sink
+
+
+def _writer_threads() -> int:
+    return sum(1 for thread in threading.enumerate() if thread.name == "log-sink")
+
+
+class TestLogSinkLifecycle:
+    """The process-wide sink can be closed and recreated, as worker_daemon.py does per run"""
+
+    def test_close_log_sink(self, tmp_path, monkeypatch):
+        """Closing writes every record, stops the writer and leaves no atexit entry behind"""
+        monkeypatch.setenv("API_LOG_FILE", str(tmp_path / "api-log.ndjson"))
+        monkeypatch.setenv("API_LOG_LEVEL", "info")
+        close_log_sink()
+        threads = _writer_threads()
+        exit_handlers = []
+        monkeypatch.setattr(log_sink.atexit, "register", exit_handlers.append)
+        monkeypatch.setattr(log_sink.atexit, "unregister", exit_handlers.remove)
+
+        for run in range(3):
+            sink = get_log_sink()
+            sink.emit({"event": "request", "run": run})
+            assert _writer_threads() == threads + 1
+            close_log_sink()
+            assert _writer_threads() == threads
+            assert exit_handlers == []
+            assert get_log_sink() is not sink
+            close_log_sink()
+
+        lines = (tmp_path / "api-log.ndjson").read_text().splitlines()
+        assert [json.loads(line)["run"] for line in lines] == [0, 1, 2]
+
+
+class TestSampling:
+    """Sampling decisions"""
+
+    def test_sampling_leaves_seeded_random_alone(self, tmp_path):
+        """Sampling does not advance the global sequence that seeded test data uses"""
+        sink = LogSink(str(tmp_path / "api-log.ndjson"), sample_rate=0.5)
+        random.seed(7)
+        expected = [random.random() for _ in range(3)]
+        random.seed(7)
+        values = []
+        for _ in range(3):
+            sink.sample()
+            values.append(random.random())
+        assert values == expected
+
+    def test_sample_rate(self, tmp_path):
+        path = str(tmp_path / "api-log.ndjson")
+        assert all(LogSink(path, sample_rate=1.0).sample() for _ in range(100))
+        assert not any(LogSink(path, sample_rate=0.0).sample() for _ in range(100))
+        assert not LogSink(path, level="off").sample()
+        assert 200 < sum(LogSink(path, sample_rate=0.5).sample() for _ in range(1000)) < 800
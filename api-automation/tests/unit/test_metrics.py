@@ -0,0 +1,126 @@
+"""
+Offline tests for the OpenMetrics registry, textfile dump and /metrics endpoint
+"""
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from api_client.metrics import CONTENT_TYPE, MetricsRegistry, _Metric, start_metrics_server, worker_metrics_file
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestRendering:
+    """OpenMetrics text output"""
+
+    def test_counter_total_suffix(self, registry):
+        counter = registry.counter("api_requests", "HTTP requests", ["method", "status"])
+        counter.inc(method="GET", status="200")
+        counter.inc(2, method="GET", status="200")
+        counter.inc(0.5, method="POST", status="500")
+        assert registry.render().splitlines() == [
+            "# TYPE api_requests counter",
+            "# HELP api_requests HTTP requests",
+            'api_requests_total{method="GET",status="200"} 3',
+            'api_requests_total{method="POST",status="500"} 0.5',
+            "# EOF",
+        ]
+        with pytest.raises(ValueError):
+            counter.inc(-1, method="GET", status="200")
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        histogram = registry.histogram("duration_seconds", "Request time", ["method"], buckets=(1.0, 0.1))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, method="GET")
+        assert registry.render().splitlines()[2:] == [
+            'duration_seconds_bucket{method="GET",le="0.1"} 2',
+            'duration_seconds_bucket{method="GET",le="1.0"} 3',
+            'duration_seconds_bucket{method="GET",le="+Inf"} 4',
+            'duration_seconds_count{method="GET"} 4',
+            'duration_seconds_sum{method="GET"} 3.65',
+            "# EOF",
+        ]
+        assert histogram.count(method="GET") == 4
+
+    def test_gauge_without_labels(self, registry):
+        gauge = registry.gauge("in_flight", "Requests in flight")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        assert "in_flight 1" in registry.render().splitlines()
+        gauge.set(7.25)
+        assert gauge.value() == 7.25
+
+    def test_label_and_help_escaping(self, registry):
+        counter = registry.counter("errors", 'Errors with "quotes"\nand newlines', ["error"])
+        counter.inc(error='Bad "value" \\ here\n')
+        lines = registry.render().splitlines()
+        assert lines[1] == '# HELP errors Errors with \\"quotes\\"\\nand newlines'
+        assert lines[2] == 'errors_total{error="Bad \\"value\\" \\\\ here\\n"} 1'
+
+    def test_empty_registry(self, registry):
+        assert registry.render() == "# EOF\n"
+
+    def test_eof_terminates_output(self, registry):
+        registry.counter("a", "A").inc()
+        registry.gauge("b", "B").set(1)
+        rendered = registry.render()
+        assert rendered.endswith("\n# EOF\n") and rendered.count("# EOF") == 1
+
+
+class TestRegistry:
+    """Registration and label checks"""
+
+    def test_reregistering_returns_the_same_family(self, registry):
+        assert registry.counter("a", "A", ["x"]) is registry.counter("a", "A again", ["x"])
+        with pytest.raises(ValueError):
+            registry.gauge("a", "A", ["x"])
+        with pytest.raises(ValueError):
+            registry.counter("a", "A", ["y"])
+
+    def test_labels_must_match(self, registry):
+        counter = registry.counter("a", "A", ["method"])
+        with pytest.raises(ValueError, match="expects labels"):
+            counter.inc(method="GET", status="200")
+
+    def test_metric_is_abstract(self):
+        with pytest.raises(TypeError):
+            _Metric("a", "A")
+
+
+class TestExport:
+    """Textfile dump and the live endpoint"""
+
+    def test_write_textfile(self, registry, tmp_path):
+        registry.counter("a", "A").inc()
+        path = registry.write_textfile(str(tmp_path / "nested" / "metrics.prom"))
+        with open(path) as file:
+            assert file.read() == registry.render()
+        assert [entry.name for entry in (tmp_path / "nested").iterdir()] == ["metrics.prom"]
+
+    def test_worker_metrics_file(self, monkeypatch):
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        assert worker_metrics_file("reports/metrics.prom") == "reports/metrics.prom"
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+        assert worker_metrics_file("reports/metrics.prom") == "reports/metrics-gw3.prom"
+
+    def test_metrics_endpoint(self, registry):
+        registry.counter("api_requests", "HTTP requests").inc()
+        server = start_metrics_server(0, registry)
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(f"{base}/metrics?format=text", timeout=5) as response:
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                assert response.read().decode("utf-8") == registry.render()
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(f"{base}/other", timeout=5)
+            assert error.value.code == 404
+            error.value.close()
+        finally:
+            server.shutdown()
+            server.server_close()
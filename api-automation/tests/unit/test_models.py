@@ -0,0 +1,114 @@
+"""
+Offline tests for the Equipment, HistoryEntry and HistoryPage models
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from api_client.models import (
+    Equipment, EquipmentStatus, HistoryEntry, HistoryPage, ModelValidationError, equipment_list_from_response,
+    parse_timestamp, status_update_from_response
+)
+
+PUMP = {"id": 1, "name": "Pump", "status": "Active", "location": "Site A", "lastUpdated": "2025-06-01T08:30:15.123Z"}
+ENTRY = {"id": 7, "equipmentId": 1, "previousStatus": "Idle", "newStatus": "Active",
+         "timestamp": "2025-06-01T08:30:15.123Z", "changedBy": "tests"}
+
+
+def _without(record: dict, field: str) -> dict:
+    return {key: value for key, value in record.items() if key != field}
+
+
+class TestEquipment:
+    """Equipment.from_dict validation and round-trip"""
+
+    def test_round_trip(self):
+        equipment = Equipment.from_dict(PUMP)
+        assert equipment.status is EquipmentStatus.ACTIVE
+        assert equipment.to_dict() == PUMP
+        assert Equipment.from_dict(equipment.to_dict()) == equipment
+
+    def test_last_updated_is_parsed_lazily(self):
+        equipment = Equipment.from_dict(PUMP)
+        assert equipment._last_updated is None
+        assert equipment.last_updated == datetime(2025, 6, 1, 8, 30, 15, 123000, tzinfo=timezone.utc)
+        assert equipment.last_updated is equipment.last_updated
+
+    def test_from_response(self):
+        assert Equipment.from_response({"success": True, "data": PUMP}).id == 1
+        with pytest.raises(ModelValidationError, match="success true"):
+            Equipment.from_response({"success": False, "data": PUMP})
+
+    @pytest.mark.parametrize("record, message", [
+        (dict(PUMP, status="active"), "status should be one of"),
+        (dict(PUMP, status="Broken"), "status should be one of"),
+        (dict(PUMP, id=True), "id should be int"),
+        (dict(PUMP, id="1"), "id should be int"),
+        (dict(PUMP, id=0), "id should be positive"),
+        (dict(PUMP, name=None), "name should be str"),
+        (dict(PUMP, lastUpdated="2025-06-01 08:30"), "ISO 8601"),
+        (_without(PUMP, "location"), "should have location"),
+        (_without(PUMP, "lastUpdated"), "should have lastUpdated"),
+        ([PUMP], "should be an object"),
+    ])
+    def test_invalid_records(self, record, message):
+        with pytest.raises(ModelValidationError, match=message):
+            Equipment.from_dict(record)
+
+    def test_validation_error_is_an_assertion(self):
+        """Invalid records fail tests like the helpers in helpers/validations.py"""
+        assert issubclass(ModelValidationError, AssertionError)
+
+    def test_equipment_list(self):
+        assert equipment_list_from_response({"success": True, "data": [PUMP], "count": 1}) == [Equipment.from_dict(PUMP)]
+        with pytest.raises(ModelValidationError, match="Count should match"):
+            equipment_list_from_response({"success": True, "data": [PUMP], "count": 2})
+
+
+class TestHistory:
+    """HistoryEntry, HistoryPage and status update responses"""
+
+    def test_entry_round_trip(self):
+        entry = HistoryEntry.from_dict(ENTRY)
+        assert entry.previous_status is EquipmentStatus.IDLE
+        assert entry.to_dict() == ENTRY
+        assert entry.timestamp == parse_timestamp(ENTRY["timestamp"])
+
+    def test_entry_without_changed_by(self):
+        assert HistoryEntry.from_dict(dict(ENTRY, changedBy=None)).changed_by is None
+        with pytest.raises(ModelValidationError, match="should have changedBy"):
+            HistoryEntry.from_dict(_without(ENTRY, "changedBy"))
+
+    @pytest.mark.parametrize("record", [dict(ENTRY, equipmentId=False), dict(ENTRY, newStatus="Retired")])
+    def test_invalid_entry(self, record):
+        with pytest.raises(ModelValidationError):
+            HistoryEntry.from_dict(record)
+
+    def test_history_page(self):
+        response = {"success": True, "data": {
+            "equipmentId": 1, "history": [ENTRY, dict(ENTRY, id=8)], "total": 5,
+            "limit": 2, "offset": None, "hasMore": True}}
+        page = HistoryPage.from_response(response)
+        assert len(page) == 2 and [entry.id for entry in page] == [7, 8]
+        assert (page.equipment_id, page.total, page.limit, page.offset, page.has_more) == (1, 5, 2, None, True)
+
+    @pytest.mark.parametrize("data, message", [
+        ({"equipmentId": 1, "history": {}, "total": 0, "limit": 10, "offset": 0, "hasMore": False}, "history should be list"),
+        ({"equipmentId": 1, "history": [], "total": 0, "limit": 10, "offset": 0}, "should have hasMore"),
+        ({"equipmentId": 1, "history": [dict(ENTRY, id="x")], "total": 1, "limit": 10, "offset": 0,
+          "hasMore": False}, "id should be int"),
+    ])
+    def test_invalid_history_page(self, data, message):
+        with pytest.raises(ModelValidationError, match=message):
+            HistoryPage.from_response({"success": True, "data": data})
+
+    def test_status_update(self):
+        equipment, entry = status_update_from_response({"success": True, "data": {
+            "equipment": dict(PUMP, status="Idle"), "historyEntry": dict(ENTRY, previousStatus="Active", newStatus="Idle")}})
+        assert equipment.status is EquipmentStatus.IDLE
+        assert entry.new_status is EquipmentStatus.IDLE
+
+    def test_status_update_missing_entry(self):
+        with pytest.raises(ModelValidationError, match="should have historyEntry"):
+            status_update_from_response({"success": True, "data": {"equipment": PUMP}})
@@ -0,0 +1,144 @@
+"""
+Offline tests for the token-bucket rate limiter, driven by a fake clock
+"""
+
+import email.utils
+
+import pytest
+
+from api_client.rate_limiter import (
+    GLOBAL_BUCKET, MIN_RATE_FRACTION, RECOVERY_STEP, RateLimiter, parse_endpoint_rates, parse_retry_after
+)
+
+KEY = "GET /api/equipment"
+START = 1_750_000_000.0
+
+
+class FakeClock:
+    """Wall clock that only moves when the limiter sleeps or a test advances it"""
+
+    def __init__(self, now: float = START):
+        self.now = now
+        self.slept = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock: FakeClock, **options) -> RateLimiter:
+    return RateLimiter(clock=clock, sleep=clock.sleep, **options)
+
+
+def _rate(limiter: RateLimiter, bucket: str = GLOBAL_BUCKET) -> float:
+    with limiter._locked_state() as state:
+        return limiter._refill(state, bucket, limiter._clock())["rate"]
+
+
+class TestParsing:
+    """Retry-After and endpoint limit parsing"""
+
+    def test_retry_after_seconds(self):
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(" 1.5 ") == 1.5
+        assert parse_retry_after("-4") == 0.0
+
+    def test_retry_after_http_date(self):
+        header = email.utils.formatdate(START + 30, usegmt=True)
+        assert parse_retry_after(header, now=START) == pytest.approx(30.0)
+        assert parse_retry_after(email.utils.formatdate(START - 30, usegmt=True), now=START) == 0.0
+
+    @pytest.mark.parametrize("value", [None, "", "soon", "Mon, 99 Foo 2025"])
+    def test_retry_after_invalid(self, value):
+        assert parse_retry_after(value) is None
+
+    def test_endpoint_rates(self):
+        assert parse_endpoint_rates("GET  /api/equipment=5, /api/equipment/{id}/status=2") == {
+            "GET /api/equipment": 5.0, "/api/equipment/{id}/status": 2.0}
+        with pytest.raises(ValueError):
+            parse_endpoint_rates("/api/equipment")
+
+
+class TestRateLimiter:
+    """Pacing, backoff, recovery and sharing"""
+
+    def test_paces_to_rate(self):
+        """After the burst, tokens arrive at the configured rate"""
+        clock = FakeClock()
+        limiter = _limiter(clock, rate=2.0, burst=1.0)
+        waits = [limiter.acquire(KEY) for _ in range(5)]
+        assert waits[0] == 0.0
+        assert clock.now - START == pytest.approx(2.0)
+        assert limiter.waited == pytest.approx(2.0)
+
+    def test_endpoint_bucket(self):
+        """An endpoint limit applies only to its own requests"""
+        clock = FakeClock()
+        limiter = _limiter(clock, endpoint_rates={"/api/equipment/{id}/status": 1.0}, burst=1.0)
+        for _ in range(3):
+            limiter.acquire("POST /api/equipment/{id}/status")
+        assert clock.now - START == pytest.approx(2.0)
+        for _ in range(10):
+            limiter.acquire(KEY)
+        assert clock.now - START == pytest.approx(2.0)
+
+    def test_backoff_to_floor(self):
+        """Every 429 halves the rate, but never below the floor"""
+        clock = FakeClock()
+        limiter = _limiter(clock, rate=10.0)
+        rates = []
+        for _ in range(10):
+            assert limiter.record_response(KEY, 429, "0") is True
+            rates.append(_rate(limiter))
+        assert rates[:3] == [5.0, 2.5, 1.25]
+        assert rates[-1] == pytest.approx(10.0 * MIN_RATE_FRACTION)
+        assert limiter.throttled == 10
+
+    def test_recovery(self):
+        """Successful responses win the rate back step by step, up to the limit"""
+        clock = FakeClock()
+        limiter = _limiter(clock, rate=10.0)
+        limiter.record_response(KEY, 429, "0")
+        assert _rate(limiter) == 5.0
+        assert limiter.record_response(KEY, 200) is False
+        assert _rate(limiter) == pytest.approx(5.0 + 10.0 * RECOVERY_STEP)
+        for _ in range(50):
+            limiter.record_response(KEY, 200)
+        assert _rate(limiter) == 10.0
+
+    def test_retry_after_pauses_requests(self):
+        """A Retry-After in seconds or as an HTTP date blocks every request until it passes"""
+        clock = FakeClock()
+        limiter = _limiter(clock, rate=100.0)
+        limiter.record_response(KEY, 429, "3")
+        assert limiter.acquire(KEY) == pytest.approx(3.0)
+
+        limiter.record_response(KEY, 429, email.utils.formatdate(clock.now + 20, usegmt=True))
+        assert limiter.acquire("POST /api/equipment") == pytest.approx(20.0)
+
+    def test_retry_after_without_limits(self):
+        """With no rate configured, a 429 still pauses the next request"""
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        assert not limiter.enabled
+        limiter.record_response(KEY, 429, None)
+        assert limiter.acquire(KEY) == pytest.approx(1.0)
+
+    def test_shared_state_file(self, tmp_path):
+        """Two limiters on one state file, like two xdist workers, share tokens, backoff and pauses"""
+        clock = FakeClock()
+        state_file = str(tmp_path / "rate-limit.json")
+        first = _limiter(clock, rate=1.0, burst=2.0, state_file=state_file)
+        second = _limiter(clock, rate=1.0, burst=2.0, state_file=state_file)
+
+        first.acquire(KEY)
+        first.acquire(KEY)
+        assert second.acquire(KEY) == pytest.approx(1.0)
+
+        first.record_response(KEY, 429, "5")
+        assert _rate(second) == 0.5
+        assert second.acquire(KEY) == pytest.approx(5.0)
+        assert clock.now - START >= 6.0
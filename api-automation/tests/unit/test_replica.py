@@ -0,0 +1,123 @@
+"""
+Offline tests for the local SQLite replica, fed through EquipmentAPIClient.attach_replica()
+"""
+
+import json
+from types import SimpleNamespace
+from urllib.parse import urlparse
+
+import pytest
+
+from api_client.equipment_api import EquipmentAPIClient
+from api_client.metrics import MetricsRegistry
+
+PUMP = {"id": 1, "name": "Pump", "status": "Active", "location": "Site A", "lastUpdated": "2025-06-01T08:00:00.000Z"}
+PRESS = {"id": 2, "name": "Press", "status": "Idle", "location": "Site B", "lastUpdated": "2025-06-01T09:00:00.000Z"}
+DRILL = {"id": 3, "name": "Drill", "status": "Active", "location": "Site A", "lastUpdated": "2025-06-01T07:00:00.000Z"}
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the client and the replica"""
+
+    def __init__(self, method: str, url: str, status_code: int, body):
+        self.request = SimpleNamespace(method=method)
+        self.url = url
+        self.status_code = status_code
+        self.content = json.dumps(body).encode("utf-8")
+        self.text = self.content.decode("utf-8")
+        self.headers = {"content-type": "application/json"}
+
+
+class FakeSession:
+    """Answers each (method, path) with a canned status code and body"""
+
+    def __init__(self, routes):
+        self.headers = {}
+        self.routes = routes
+
+    def request(self, method, url, **kwargs):
+        status_code, body = self.routes[(method, urlparse(url).path)]
+        return FakeResponse(method, url, status_code, body)
+
+
+def _history_entry(entry_id: int, equipment_id: int, previous: str, new: str, timestamp: str) -> dict:
+    return {"id": entry_id, "equipmentId": equipment_id, "previousStatus": previous, "newStatus": new,
+            "timestamp": timestamp, "changedBy": "tests"}
+
+
+@pytest.fixture
+def client_and_replica():
+    """Client answering from canned routes, with a replica attached"""
+    updated = dict(PUMP, status="Under Maintenance", lastUpdated="2025-06-01T10:00:00.000Z")
+    routes = {
+        ("GET", "/api/equipment"): (200, {"success": True, "data": [PUMP, PRESS], "count": 2}),
+        ("POST", "/api/equipment"): (201, {"success": True, "data": DRILL}),
+        ("POST", "/api/equipment/1/status"): (200, {"success": True, "data": {
+            "equipment": updated,
+            "historyEntry": _history_entry(12, 1, "Active", "Under Maintenance", "2025-06-01T10:00:00.000Z")}}),
+        ("GET", "/api/equipment/1/history"): (200, {"success": True, "data": {"history": [
+            _history_entry(11, 1, "Idle", "Active", "2025-06-01T08:00:00.000Z"),
+            _history_entry(10, 1, None, "Idle", "2025-05-31T08:00:00.000Z")]}}),
+        ("GET", "/api/equipment/9/history"): (200, {"success": False, "error": "not found"}),
+    }
+    client = EquipmentAPIClient(session=FakeSession(routes), metrics=MetricsRegistry())
+    client.rate_limiter = None
+    replica = client.attach_replica()
+    yield client, replica
+    replica.close()
+
+
+class TestReplicaFeeding:
+    """Responses passing through the client are upserted into the replica"""
+
+    def test_list_and_add(self, client_and_replica):
+        client, replica = client_and_replica
+        client.get_all_equipment()
+        client.add_equipment({"name": "Drill", "status": "Active", "location": "Site A"})
+        assert replica.get_equipment(2) == {"id": 2, "name": "Press", "status": "Idle", "location": "Site B",
+                                            "last_updated": "2025-06-01T09:00:00.000Z"}
+        assert [row["id"] for row in replica.equipment_by_location("Site A")] == [1, 3]
+        assert replica.get_equipment(4) is None
+
+    def test_status_update_replaces_equipment(self, client_and_replica):
+        client, replica = client_and_replica
+        client.get_all_equipment()
+        client.update_equipment_status(1, "Under Maintenance")
+        assert replica.get_equipment(1)["status"] == "Under Maintenance"
+        assert [row["id"] for row in replica.equipment_by_status("Active")] == []
+        assert replica.last_history_entry(1)["id"] == 12
+
+    def test_history_pages(self, client_and_replica):
+        """History is ordered by timestamp whatever order it arrived in, and re-reads do not duplicate"""
+        client, replica = client_and_replica
+        client.update_equipment_status(1, "Under Maintenance")
+        client.get_equipment_history(1)
+        client.get_equipment_history(1)
+        assert [row["id"] for row in replica.history(1)] == [10, 11, 12]
+        assert replica.last_history_entry(1) == {
+            "id": 12, "equipment_id": 1, "previous_status": "Active", "new_status": "Under Maintenance",
+            "timestamp": "2025-06-01T10:00:00.000Z", "changed_by": "tests"}
+        assert replica.history(2) == [] and replica.last_history_entry(2) is None
+
+    def test_unsuccessful_responses_are_ignored(self, client_and_replica):
+        client, replica = client_and_replica
+        client.get_equipment_history(9)
+        assert replica.history(9) == []
+
+    def test_updated_before(self, client_and_replica):
+        client, replica = client_and_replica
+        client.get_all_equipment()
+        client.add_equipment({"name": "Drill", "status": "Active", "location": "Site A"})
+        assert [row["id"] for row in replica.equipment_updated_before("2025-06-01T08:30:00.000Z")] == [3, 1]
+
+
+class TestReplicaRecords:
+    """Direct upserts"""
+
+    def test_partial_records(self, client_and_replica):
+        """Missing fields are stored as NULL and records without IDs are skipped"""
+        _, replica = client_and_replica
+        replica.record_equipment([{"id": 5, "name": "Lathe"}, {"name": "no id"}])
+        replica.record_history([{"id": 1, "equipmentId": 5}, {"id": 2}])
+        assert replica.get_equipment(5)["status"] is None
+        assert len(replica.history(5)) == 1
@@ -0,0 +1,110 @@
+"""
+Offline tests for soak leak detection on synthetic samples
+"""
+
+import queue
+from types import SimpleNamespace
+
+import pytest
+
+from helpers.resource_monitor import MIN_SLOPE_SAMPLES, ResourceMonitor, correlation, fit_slope, pool_stats
+
+MB = 1024 * 1024
+
+
+def _sample(elapsed: float, rss_mb: float = 100.0, fds: int = 10, connections: int = 2,
+            latency: float = 20.0, requests: int = 50) -> dict:
+    return {"elapsed": elapsed, "rss_bytes": rss_mb * MB, "open_fds": fds, "connections": connections,
+            "latency_p95_ms": latency, "requests": requests}
+
+
+def _monitor(samples, warmup: float = 0.0) -> ResourceMonitor:
+    monitor = ResourceMonitor(client=None, warmup=warmup, trace_allocations=False)
+    monitor.samples = list(samples)
+    return monitor
+
+
+class TestFitting:
+    """Least-squares slope and correlation"""
+
+    def test_fit_slope(self):
+        assert fit_slope([(0, 1), (1, 3), (2, 5), (3, 7)]) == pytest.approx(2.0)
+        assert fit_slope([(0, 5), (1, 4), (2, 5), (3, 4)]) == pytest.approx(-0.2)
+
+    @pytest.mark.parametrize("points", [[], [(1, 2)], [(1, 2), (1, 5)]])
+    def test_fit_slope_degenerate(self, points):
+        assert fit_slope(points) == 0.0
+
+    def test_correlation(self):
+        assert correlation([(1, 2), (2, 4), (3, 6)]) == pytest.approx(1.0)
+        assert correlation([(1, 6), (2, 4), (3, 2)]) == pytest.approx(-1.0)
+        assert correlation([(1, 5), (2, 5), (3, 5)]) is None
+        assert correlation([(1, 5)]) is None
+
+
+class TestSlopes:
+    """Growth per hour after warm-up, and threshold checks"""
+
+    def test_growth_per_hour(self):
+        """RSS growing 1 MB per minute is 60 MB/hour; flat resources fit to zero"""
+        monitor = _monitor(_sample(minute * 60.0, rss_mb=100 + minute) for minute in range(10))
+        slopes = monitor.slopes()
+        assert slopes["rss_mb_per_hour"] == pytest.approx(60.0)
+        assert slopes["fds_per_hour"] == 0.0
+        assert "traced_mb_per_hour" not in slopes
+
+    def test_warmup_samples_are_ignored(self):
+        """Start-up growth before the warm-up ends does not count as a leak"""
+        samples = [_sample(0.0, rss_mb=10), _sample(30.0, rss_mb=80)]
+        samples += [_sample(60.0 + index * 60.0, rss_mb=100) for index in range(5)]
+        assert _monitor(samples, warmup=60.0).slopes()["rss_mb_per_hour"] == pytest.approx(0.0)
+        assert _monitor(samples, warmup=0.0).slopes()["rss_mb_per_hour"] > 0
+
+    def test_too_few_samples(self):
+        samples = [_sample(index * 60.0, rss_mb=100 + index) for index in range(MIN_SLOPE_SAMPLES - 1)]
+        assert _monitor(samples).slopes() == {}
+
+    def test_latency_needs_requests(self):
+        """Idle samples report no latency and are left out of its slope"""
+        samples = [_sample(index * 60.0, latency=20 + index) for index in range(5)]
+        samples += [_sample(300.0 + index * 60.0, latency=0, requests=0) for index in range(5)]
+        assert _monitor(samples).slopes()["latency_p95_ms_per_hour"] == pytest.approx(60.0)
+
+    def test_check_thresholds(self):
+        """Only enabled thresholds that are exceeded are reported"""
+        monitor = _monitor(_sample(minute * 60.0, rss_mb=100 + minute, fds=10 + minute)
+                           for minute in range(10))
+        violations = monitor.check({"rss_mb_per_hour": 50, "fds_per_hour": 0, "connections_per_hour": 1})
+        assert violations == ["rss_bytes grows 60.00 MB/hour (limit 50)"]
+        assert monitor.check({"rss_mb_per_hour": 60.5}) == []
+
+    def test_latency_correlations(self):
+        monitor = _monitor(_sample(minute * 60.0, rss_mb=100 + minute, latency=20 + 2 * minute)
+                           for minute in range(10))
+        correlations = monitor.latency_correlations()
+        assert correlations["rss_bytes"] == pytest.approx(1.0)
+        assert correlations["open_fds"] is None
+
+
+class TestPoolStats:
+    """Connection counts from requests and HTTP/2 sessions"""
+
+    def test_requests_pools(self):
+        """Idle connections wait in the pool queue; checked-out ones are missing from it"""
+        pool_queue = queue.LifoQueue(maxsize=4)
+        for connection in (None, None, SimpleNamespace(sock=object()), SimpleNamespace(sock=None)):
+            pool_queue.put(connection)
+        pool_queue.get()
+        manager = SimpleNamespace(pools={"host": SimpleNamespace(pool=pool_queue)})
+        session = SimpleNamespace(adapters={"https://": SimpleNamespace(poolmanager=manager),
+                                            "http://": SimpleNamespace()})
+        assert pool_stats(session) == {"pools": 1, "connections": 2, "idle": 1}
+
+    def test_http2_pool(self):
+        connections = [SimpleNamespace(is_idle=lambda: True), SimpleNamespace(is_idle=lambda: False)]
+        transport = SimpleNamespace(_pool=SimpleNamespace(connections=connections))
+        session = SimpleNamespace(_client=SimpleNamespace(_transport=transport))
+        assert pool_stats(session) == {"pools": 1, "connections": 2, "idle": 1}
+
+    def test_unknown_session(self):
+        assert pool_stats(object()) == {"pools": 0, "connections": 0, "idle": 0}
@@ -0,0 +1,198 @@
+"""
+Offline tests for the report server: byte ranges, ETags, encodings and If-Range
+"""
+
+import gzip
+import http.client
+import http.server
+import threading
+from functools import partial
+
+import pytest
+
+import serve_report
+from serve_report import AssetCache, ReportRequestHandler, parse_range
+
+# Large enough to be compressed, and not named like a hashed asset
+SCRIPT = b"".join(b"console.log(%d);\n" % number for number in range(200))
+HASHED_NAME = "app.0123456789abcdef0123.js"
+
+
+@pytest.fixture(scope="module")
+def report_dir(tmp_path_factory):
+    report_dir = tmp_path_factory.mktemp("report")
+    (report_dir / "app.js").write_bytes(SCRIPT)
+    (report_dir / HASHED_NAME).write_bytes(SCRIPT)
+    (report_dir / "logo.png").write_bytes(bytes(range(256)) * 8)
+    (report_dir / "index.html").write_bytes(b"<html>report</html>")
+    return report_dir
+
+
+@pytest.fixture(scope="module")
+def report_server(report_dir):
+    """Report server on the temporary directory, with a cache of its own"""
+    class Handler(ReportRequestHandler):
+        cache = AssetCache()
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), partial(Handler, directory=str(report_dir)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def get(report_server):
+    """Send one request and return the response with its body read"""
+
+    def request(path: str, method: str = "GET", **headers):
+        connection = http.client.HTTPConnection("127.0.0.1", report_server, timeout=5)
+        try:
+            connection.request(method, path, headers={name.replace("_", "-"): value for name, value in headers.items()})
+            response = connection.getresponse()
+            response.body = response.read()
+            return response
+        finally:
+            connection.close()
+
+    return request
+
+
+class TestParseRange:
+    """Single byte ranges against a 100-byte body"""
+
+    @pytest.mark.parametrize("header, expected", [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=90-", (90, 99)),
+        ("bytes=90-500", (90, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=-500", (0, 99)),
+        (" bytes=99-99 ", (99, 99)),
+    ])
+    def test_satisfiable(self, header, expected):
+        assert parse_range(header, 100) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=100-", "bytes=100-200", "bytes=10-5", "bytes=-0"])
+    def test_unsatisfiable(self, header):
+        assert parse_range(header, 100) is None
+
+    @pytest.mark.parametrize("header", ["bytes=-", "bytes=0-1,5-9", "items=0-9", "bytes=a-b", ""])
+    def test_ignored(self, header):
+        with pytest.raises(ValueError):
+            parse_range(header, 100)
+
+
+class TestEncoding:
+    """Accept-Encoding negotiation and q-values"""
+
+    @pytest.fixture(autouse=True)
+    def without_brotli(self, monkeypatch):
+        monkeypatch.setattr(serve_report, "brotli", None)
+
+    @pytest.mark.parametrize("accept, encoding", [
+        ("gzip", "gzip"),
+        ("deflate, gzip;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("gzip;q=bad", None),
+        ("br", None),
+        ("br, gzip", "gzip"),
+        ("identity", None),
+        ("", None),
+    ])
+    def test_negotiation(self, get, accept, encoding):
+        response = get("/app.js", Accept_Encoding=accept)
+        assert response.status == 200
+        assert response.getheader("Content-Encoding") == encoding
+        assert response.getheader("Vary") == "Accept-Encoding"
+        body = gzip.decompress(response.body) if encoding == "gzip" else response.body
+        assert body == SCRIPT
+
+    def test_brotli_preferred_when_available(self, get, monkeypatch):
+        brotli = pytest.importorskip("brotli")
+        monkeypatch.setattr(serve_report, "brotli", brotli)
+        response = get("/app.js", Accept_Encoding="gzip, br")
+        assert response.getheader("Content-Encoding") == "br"
+        assert brotli.decompress(response.body) == SCRIPT
+
+    def test_binary_is_not_compressed(self, get):
+        response = get("/logo.png", Accept_Encoding="gzip")
+        assert response.getheader("Content-Encoding") is None
+        assert response.getheader("Vary") is None
+
+    def test_head_has_no_body(self, get):
+        response = get("/app.js", method="HEAD", Accept_Encoding="gzip")
+        assert response.status == 200 and response.body == b""
+        assert int(response.getheader("Content-Length")) == len(gzip.compress(SCRIPT, compresslevel=6, mtime=0))
+
+
+class TestCaching:
+    """ETags, 304 and Cache-Control"""
+
+    def test_not_modified(self, get):
+        etag = get("/app.js").getheader("ETag")
+        response = get("/app.js", If_None_Match=etag)
+        assert response.status == 304 and response.body == b""
+        assert response.getheader("ETag") == etag
+        assert get("/app.js", If_None_Match=f'"other", W/{etag}').status == 304
+        assert get("/app.js", If_None_Match="*").status == 304
+        assert get("/app.js", If_None_Match='"other"').status == 200
+
+    def test_etag_per_encoding(self, get):
+        """A gzip body must not revalidate an identity one"""
+        identity = get("/app.js").getheader("ETag")
+        gzipped = get("/app.js", Accept_Encoding="gzip").getheader("ETag")
+        assert gzipped == f'{identity[:-1]}-gzip"'
+        assert get("/app.js", If_None_Match=identity).status == 304
+        assert get("/app.js", Accept_Encoding="gzip", If_None_Match=identity).status == 200
+
+    def test_cache_control(self, get):
+        assert get("/app.js").getheader("Cache-Control") == serve_report.REVALIDATE
+        assert get(f"/{HASHED_NAME}").getheader("Cache-Control") == serve_report.IMMUTABLE
+
+    def test_changed_file_gets_new_etag(self, get, report_dir):
+        first = get("/")
+        assert first.body == b"<html>report</html>"
+        (report_dir / "index.html").write_bytes(b"<html>rebuilt report</html>")
+        second = get("/", If_None_Match=first.getheader("ETag"))
+        assert second.status == 200 and second.body == b"<html>rebuilt report</html>"
+
+    def test_missing_file(self, get):
+        assert get("/missing.js").status == 404
+
+
+class TestRanges:
+    """206, 416 and If-Range, from memory and from disk"""
+
+    @pytest.fixture(params=["cached", "disk"])
+    def source(self, request, monkeypatch):
+        if request.param == "disk":
+            monkeypatch.setattr(serve_report, "MAX_CACHED_FILE", 0)
+        return request.param
+
+    def test_partial_content(self, get, source):
+        response = get("/app.js", Range="bytes=10-19", Accept_Encoding="gzip")
+        assert response.status == 206
+        assert response.body == SCRIPT[10:20]
+        assert response.getheader("Content-Range") == f"bytes 10-19/{len(SCRIPT)}"
+        assert response.getheader("Content-Encoding") is None
+
+    def test_suffix_range(self, get, source):
+        response = get("/app.js", Range="bytes=-5")
+        assert response.status == 206 and response.body == SCRIPT[-5:]
+
+    def test_unsatisfiable(self, get, source):
+        response = get("/app.js", Range=f"bytes={len(SCRIPT)}-")
+        assert response.status == 416
+        assert response.getheader("Content-Range") == f"bytes */{len(SCRIPT)}"
+
+    def test_malformed_range_sends_everything(self, get, source):
+        response = get("/app.js", Range="bytes=0-1,5-9")
+        assert response.status == 200 and response.body == SCRIPT
+
+    def test_if_range(self, get, source):
+        etag = get("/app.js").getheader("ETag")
+        matching = get("/app.js", Range="bytes=0-4", If_Range=etag)
+        assert matching.status == 206 and matching.body == SCRIPT[:5]
+        stale = get("/app.js", Range="bytes=0-4", If_Range='"stale"')
+        assert stale.status == 200 and stale.body == SCRIPT
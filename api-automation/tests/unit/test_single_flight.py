@@ -0,0 +1,151 @@
+"""
+Offline tests for single-flight coalescing of identical concurrent GETs
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api_client.equipment_api import EquipmentAPIClient
+from api_client.metrics import MetricsRegistry
+from api_client.single_flight import SingleFlight
+from config.endpoints import get_config
+
+FOLLOWERS = 4
+WAIT_SECONDS = 5.0
+
+
+def _wait_for_waiters(flight: SingleFlight, key, waiters: int) -> None:
+    """Block until the in-flight call for key has the given number of callers waiting on it"""
+    deadline = time.monotonic() + WAIT_SECONDS
+    while time.monotonic() < deadline:
+        call = flight._calls.get(key)
+        if call is not None and call.waiters >= waiters:
+            return
+        time.sleep(0.001)
+    raise AssertionError(f"{waiters} callers never joined {key!r}")
+
+
+def _run_coalesced(flight: SingleFlight, key, call, release: threading.Event):
+    """Start one leader and FOLLOWERS joining callers of call(), then let the leader finish"""
+    def caller():
+        try:
+            return call()
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(FOLLOWERS + 1) as pool:
+        leader = pool.submit(caller)
+        _wait_for_waiters(flight, key, 0)
+        followers = [pool.submit(caller) for _ in range(FOLLOWERS)]
+        _wait_for_waiters(flight, key, FOLLOWERS)
+        release.set()
+        return leader.result(WAIT_SECONDS), [future.result(WAIT_SECONDS) for future in followers]
+
+
+class TestSingleFlight:
+    """SingleFlight.do() sharing, errors and key cleanup"""
+
+    def test_followers_share_the_result(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def function():
+            calls.append(1)
+            release.wait(WAIT_SECONDS)
+            return object()
+
+        (result, shared), followers = _run_coalesced(flight, "key", lambda: flight.do("key", function), release)
+        assert calls == [1]
+        assert shared is False
+        assert followers == [(result, True)] * FOLLOWERS
+        assert flight.in_flight == 0
+
+    def test_leader_error_reaches_followers(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        error = RuntimeError("connection reset")
+
+        def function():
+            release.wait(WAIT_SECONDS)
+            raise error
+
+        leader, followers = _run_coalesced(flight, "key", lambda: flight.do("key", function), release)
+        assert leader is error
+        assert all(follower is error for follower in followers)
+        assert flight.in_flight == 0
+
+    def test_key_is_released(self):
+        """Completed calls, successful or not, are not cached"""
+        flight = SingleFlight()
+        assert flight.do("key", lambda: 1) == (1, False)
+        with pytest.raises(ValueError):
+            flight.do("key", lambda: int("x"))
+        assert flight.do("key", lambda: 2) == (2, False)
+        assert flight.in_flight == 0
+
+    def test_different_keys_do_not_share(self):
+        flight = SingleFlight()
+        assert flight.do("a", lambda: 1) == (1, False)
+        assert flight.do("b", lambda: 2) == (2, False)
+
+
+class FakeResponse:
+    """Just enough of requests.Response for get_all_equipment"""
+
+    status_code = 200
+    headers = {}
+    content = b'{"success": true, "data": [], "count": 0}'
+
+
+class FakeSession:
+    """Session whose requests block until released"""
+
+    def __init__(self):
+        self.headers = {}
+        self.requests = []
+        self.release = threading.Event()
+
+    def request(self, **kwargs):
+        self.requests.append(kwargs)
+        self.release.wait(WAIT_SECONDS)
+        return FakeResponse()
+
+
+class TestClientCoalescing:
+    """EquipmentAPIClient sends one GET for identical concurrent callers"""
+
+    def _client(self, coalesce: bool):
+        session = FakeSession()
+        client = EquipmentAPIClient(session=session, metrics=MetricsRegistry())
+        client.rate_limiter = None
+        client.coalesce_gets = coalesce
+        return client, session
+
+    def test_concurrent_gets_share_one_request(self):
+        client, session = self._client(coalesce=True)
+        key = (f"{client.base_url}/api/equipment", ())
+        leader, followers = _run_coalesced(
+            client._single_flight, key, lambda: client.get_all_equipment_with_response()[0], session.release)
+        assert len(session.requests) == 1
+        assert all(response is leader for response in followers)
+        assert client._coalesced_requests.value(method="GET", endpoint="/api/equipment") == FOLLOWERS
+        assert client._single_flight.in_flight == 0
+
+    def test_off_sends_every_request(self):
+        client, session = self._client(coalesce=False)
+        session.release.set()
+        with ThreadPoolExecutor(FOLLOWERS) as pool:
+            list(pool.map(lambda _: client.get_all_equipment(), range(FOLLOWERS)))
+        assert len(session.requests) == FOLLOWERS
+        assert client._coalesced_requests.value(method="GET", endpoint="/api/equipment") == 0
+
+    def test_off_by_default(self, monkeypatch):
+        """Shared responses would carry the first caller's elapsed time, so tests opt in"""
+        monkeypatch.delenv("API_COALESCE_GETS", raising=False)
+        assert get_config()["coalesce_gets"] is False
+        monkeypatch.setenv("API_COALESCE_GETS", "true")
+        assert get_config()["coalesce_gets"] is True
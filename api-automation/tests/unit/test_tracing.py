@@ -0,0 +1,146 @@
+"""
+Offline tests for span tracing
+"""
+
+import json
+import os
+import random
+import threading
+
+import pytest
+
+from config.endpoints import get_config
+from helpers.tracing import (
+    SPAN_KIND_CLIENT, SPAN_KIND_INTERNAL, STATUS_ERROR, STATUS_OK, Tracer, clear_worker_traces, merge_worker_traces
+)
+
+
+def _record(tracer: Tracer) -> None:
+    """A test span around a fixture span and a failing request span"""
+    with tracer.span("tests/test_x.py::test_x", "test", **{"test.name": "test_x"}):
+        with tracer.span("fixture api_client", "fixture", scope="session"):
+            pass
+        with pytest.raises(ConnectionError):
+            with tracer.span("GET /api/equipment", "http", **{"http.status_code": 200, "retry": False}):
+                raise ConnectionError("reset")
+
+
+class TestSpanIds:
+    """Trace and span IDs do not depend on the global random module"""
+
+    def test_seeded_random_does_not_repeat_ids(self):
+        """Workers that seed random the same way still get distinct IDs"""
+        ids = set()
+        for _ in range(2):
+            random.seed(1234)
+            tracer = Tracer(enabled=True)
+            with tracer.span("test", "test") as outer:
+                with tracer.span("request", "http") as inner:
+                    pass
+            ids.update({outer.trace_id, outer.span_id, inner.span_id})
+        assert len(ids) == 6
+
+    def test_ids_do_not_consume_seeded_sequence(self):
+        """Creating spans leaves the seeded test-data sequence untouched"""
+        random.seed(99)
+        expected = [random.random() for _ in range(3)]
+
+        random.seed(99)
+        tracer = Tracer(enabled=True)
+        values = []
+        for _ in range(3):
+            with tracer.span("step", "test"):
+                values.append(random.random())
+        assert values == expected
+
+
+class TestSpans:
+    """Nesting, errors and the disabled tracer"""
+
+    def test_nesting_and_parent_ids(self):
+        tracer = Tracer(enabled=True)
+        _record(tracer)
+        fixture, request, test = tracer.spans
+        assert [span.name for span in (fixture, request, test)] == [
+            "fixture api_client", "GET /api/equipment", "tests/test_x.py::test_x"]
+        assert test.parent_id == ""
+        assert fixture.parent_id == request.parent_id == test.span_id
+        assert fixture.trace_id == request.trace_id == test.trace_id
+        assert len(test.trace_id) == 32 and len(test.span_id) == 16
+        assert request.error == "ConnectionError: reset" and test.error is None
+        assert tracer.current() is None
+
+    def test_threads_have_their_own_stack(self):
+        """A span opened on another thread starts its own trace"""
+        tracer = Tracer(enabled=True)
+        def work():
+            with tracer.span("worker", "internal"):
+                pass
+
+        with tracer.span("test", "test") as outer:
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        worker = next(span for span in tracer.spans if span.name == "worker")
+        assert worker.parent_id == "" and worker.trace_id != outer.trace_id
+
+    def test_disabled_records_nothing(self):
+        tracer = Tracer()
+        with tracer.span("test", "test") as span:
+            span.set_attribute("ignored", True)
+        assert tracer.spans == [] and tracer.current() is None
+
+    def test_off_by_default(self, monkeypatch):
+        monkeypatch.delenv("API_TRACE_DIR", raising=False)
+        assert get_config()["trace_dir"] == ""
+
+
+class TestExport:
+    """Chrome trace and OTLP documents, and merging xdist worker files"""
+
+    def test_chrome_trace(self):
+        tracer = Tracer(enabled=True)
+        _record(tracer)
+        events = tracer.chrome_trace("pytest gw0")["traceEvents"]
+        metadata = [event for event in events if event["ph"] == "M"]
+        complete = [event for event in events if event["ph"] == "X"]
+        assert metadata[0]["args"] == {"name": "pytest gw0"}
+        assert [event["cat"] for event in complete] == ["fixture", "http", "test"]
+        request = complete[1]
+        assert request["args"] == {"http.status_code": 200, "retry": False, "error": "ConnectionError: reset"}
+        test = complete[2]
+        assert test["ts"] <= request["ts"] and request["ts"] + request["dur"] <= test["ts"] + test["dur"]
+        assert {event["tid"] for event in complete} == {1}
+
+    def test_otlp_trace(self):
+        tracer = Tracer(enabled=True)
+        _record(tracer)
+        document = tracer.otlp_trace("pytest")
+        resource = document["resourceSpans"][0]["resource"]["attributes"]
+        assert {"key": "service.name", "value": {"stringValue": "api-automation"}} in resource
+        fixture, request, test = document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert request["parentSpanId"] == test["spanId"] and test["parentSpanId"] == ""
+        assert request["kind"] == SPAN_KIND_CLIENT and fixture["kind"] == SPAN_KIND_INTERNAL
+        assert request["status"] == {"code": STATUS_ERROR, "message": "ConnectionError: reset"}
+        assert test["status"] == {"code": STATUS_OK}
+        assert int(request["endTimeUnixNano"]) >= int(request["startTimeUnixNano"])
+        assert {"key": "http.status_code", "value": {"intValue": "200"}} in request["attributes"]
+        assert {"key": "retry", "value": {"boolValue": False}} in request["attributes"]
+        assert {"key": "category", "value": {"stringValue": "http"}} in request["attributes"]
+
+    def test_merge_and_clear_worker_traces(self, tmp_path):
+        directory = str(tmp_path)
+        for worker in ("gw0", "gw1"):
+            tracer = Tracer(enabled=True)
+            _record(tracer)
+            tracer.export(directory, suffix=f"-{worker}", process_name=f"pytest {worker}")
+        chrome, otlp = merge_worker_traces(directory)
+        assert chrome == os.path.join(directory, "trace.json")
+        with open(chrome) as file:
+            assert sum(event["ph"] == "X" for event in json.load(file)["traceEvents"]) == 6
+        with open(otlp) as file:
+            assert len(json.load(file)["resourceSpans"]) == 2
+
+        clear_worker_traces(directory)
+        assert sorted(os.listdir(directory)) == ["trace.json", "trace.otlp.json"]
+        assert merge_worker_traces(directory) == []
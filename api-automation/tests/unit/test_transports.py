@@ -0,0 +1,63 @@
+"""
+Offline tests for the HTTP transports, against a local HTTP/1.1 server
+"""
+
+import http.server
+import json
+import threading
+
+import pytest
+
+from api_client.transports import Http2Session
+
+httpx = pytest.importorskip("httpx")
+
+BODY = json.dumps({"success": True, "data": [], "count": 0}).encode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def local_server():
+    """Keep-alive server answering every GET with BODY"""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class TestHttp2Session:
+    """Http2Session responses behave like requests.Response"""
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_response_can_be_closed(self, local_server, stream):
+        """close() works whether or not the body was streamed, before and after reading it"""
+        with Http2Session() as session:
+            response = session.request("GET", f"{local_server}/api/equipment", stream=stream)
+            response.close()
+            response = session.request("GET", f"{local_server}/api/equipment", stream=stream)
+            assert response.json() == json.loads(BODY)
+            response.close()
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_response_content(self, local_server, stream):
+        """Status, headers and body come through in both modes"""
+        with Http2Session() as session:
+            response = session.request("GET", f"{local_server}/api/equipment", stream=stream)
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/json"
+            assert b"".join(response.iter_content(chunk_size=7)) == BODY
+            assert response.elapsed.total_seconds() >= 0
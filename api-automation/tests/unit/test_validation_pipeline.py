@@ -0,0 +1,96 @@
+"""
+Offline tests for the response validation pipeline
+"""
+
+import json
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from helpers.validation_pipeline import ValidationPipeline
+
+VALID_EQUIPMENT = json.dumps({"success": True, "data": {
+    "id": 1, "name": "Pump 1", "status": "Active", "location": "Site 1",
+    "lastUpdated": "2025-06-01T08:30:15.123Z"
+}}).encode("utf-8")
+
+
+def _raise(result):
+    raise RuntimeError("callback broke")
+
+
+class BrokenExecutor:
+    """Executor whose pool has died"""
+
+    def submit(self, *args):
+        raise BrokenProcessPool("A child process terminated abruptly")
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class InlineExecutor(BrokenExecutor):
+    """Executor running each validation on the calling thread"""
+
+    def submit(self, function, *args):
+        future = Future()
+        future.set_result(function(*args))
+        return future
+
+
+def _run_with_timeout(target, seconds: float = 30.0) -> None:
+    """Run target on a thread and fail if it has not returned in time"""
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "pipeline hung"
+
+
+class TestValidationPipeline:
+    """ValidationPipeline bookkeeping"""
+
+    @pytest.mark.parametrize("workers", [0, 1])
+    def test_results(self, workers):
+        """Valid and invalid bodies are recorded as passed and failed"""
+        with ValidationPipeline(workers=workers) as pipeline:
+            pipeline.submit("equipment", VALID_EQUIPMENT, "valid")
+            pipeline.submit("equipment", b"not json", "invalid")
+            results = {result.label: result for result in pipeline.wait()}
+        assert results["valid"].passed
+        assert "not valid JSON" in results["invalid"].error
+
+    @pytest.mark.parametrize("workers", [0, 1])
+    def test_raising_callback_does_not_stall(self, workers):
+        """A failing on_result callback frees its slot and is reported as a failure"""
+        pipeline = ValidationPipeline(workers=workers, max_pending=1, on_result=_raise)
+
+        def submit_and_close():
+            pipeline.submit("equipment", VALID_EQUIPMENT, "first")
+            pipeline.submit("equipment", VALID_EQUIPMENT, "second")
+            pipeline.close()
+
+        _run_with_timeout(submit_and_close)
+        callback_failures = [result for result in pipeline.failures if "callback failed" in result.error]
+        assert [result.label for result in callback_failures] == ["first", "second"]
+        with pytest.raises(AssertionError):
+            pipeline.assert_all_passed()
+
+    def test_failed_submit_releases_its_slot(self):
+        """Submitting to a broken pool raises every time instead of blocking once the slots run out"""
+        pipeline = ValidationPipeline(workers=1, max_pending=2)
+        pipeline._executor.shutdown()
+        pipeline._executor = BrokenExecutor()
+
+        def submit_to_broken_then_healthy_pool():
+            for _ in range(5):
+                with pytest.raises(BrokenProcessPool):
+                    pipeline.submit("equipment", VALID_EQUIPMENT, "broken")
+            pipeline._executor = InlineExecutor()
+            for _ in range(3):
+                pipeline.submit("equipment", VALID_EQUIPMENT, "healthy")
+            pipeline.close()
+
+        _run_with_timeout(submit_to_broken_then_healthy_pool)
+        assert [result.label for result in pipeline.results] == ["healthy"] * 3
@@ -0,0 +1,63 @@
+"""
+Offline tests for the worker daemon's socket path and start-up checks
+"""
+
+import os
+import socket
+
+import pytest
+
+import worker_daemon
+from worker_daemon import claim_socket, serve, socket_path
+
+pytestmark = pytest.mark.skipif(not worker_daemon.HAS_UNIX_SOCKETS, reason="needs Unix domain sockets")
+
+
+@pytest.fixture
+def sock_file(tmp_path, monkeypatch):
+    # Short name: Unix socket paths are limited to about 100 bytes
+    path = str(tmp_path / "w.sock")
+    monkeypatch.setenv("WORKER_SOCKET", path)
+    return path
+
+
+class TestSocketPath:
+    """Per-user default and WORKER_SOCKET override"""
+
+    def test_override(self, sock_file):
+        assert socket_path() == sock_file
+
+    def test_falls_back_to_user_name(self, monkeypatch):
+        """Windows has no os.getuid()"""
+        monkeypatch.delenv("WORKER_SOCKET", raising=False)
+        monkeypatch.delattr(os, "getuid", raising=False)
+        monkeypatch.setattr(worker_daemon.getpass, "getuser", lambda: "tester")
+        assert socket_path().endswith("equipment-api-worker-tester.sock")
+
+
+class TestClaimSocket:
+    """Stale sockets are removed, live ones are left alone"""
+
+    def test_missing(self, sock_file):
+        assert claim_socket(sock_file)
+
+    def test_stale(self, sock_file):
+        dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        dead.bind(sock_file)
+        dead.close()
+        assert os.path.exists(sock_file)
+        assert claim_socket(sock_file)
+        assert not os.path.exists(sock_file)
+
+    def test_live_worker_is_not_orphaned(self, sock_file, monkeypatch, capsys):
+        def fail(path):
+            raise AssertionError("a second worker should not start")
+
+        monkeypatch.setattr(worker_daemon, "WorkerServer", fail)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as live:
+            live.bind(sock_file)
+            live.listen(1)
+            assert not claim_socket(sock_file)
+            assert serve() == 2
+            assert os.path.exists(sock_file)
+        assert "already listening" in capsys.readouterr().out
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Warm worker daemon for fast repeat test runs
+Keeps pytest, requests, jsonschema and allure imported and the API session's
+connection pool open, and runs requested test IDs in-process over a Unix socket
+"""
+
+import getpass
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+# Local packages are re-imported for every run so edits are picked up
+PROJECT_MODULES = ("api_client", "config", "helpers", "tests", "conftest")
+# Windows builds of Python have no Unix sockets; main() says so instead of failing at import
+HAS_UNIX_SOCKETS = hasattr(socket, "AF_UNIX")
+_ServerBase = socketserver.UnixStreamServer if HAS_UNIX_SOCKETS else socketserver.BaseServer
+
+
+def socket_path() -> str:
+    """
+    Socket the daemon listens on, one per user unless WORKER_SOCKET is set
+    Returns:
+        Socket file path
+    """
+    configured = os.getenv("WORKER_SOCKET")
+    if configured:
+        return configured
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    return os.path.join(tempfile.gettempdir(), f"equipment-api-worker-{user}.sock")
+
+
+class WarmWorkerPlugin:
+    """Pytest plugin that shares the warm session and streams test results"""
+
+    def __init__(self, session, send):
+        # Registered under this name so conftest can find the warm session
+        self.__name__ = "warm_worker"
+        self.session = session
+        self.send = send
+
+    def pytest_runtest_logreport(self, report):
+        """Stream the verdict of each test as soon as it is known"""
+        if report.when == "call" or report.outcome != "passed":
+            outcome = report.outcome
+            if report.when != "call" and report.failed:
+                outcome = "error"
+            self.send({
+                "event": "result",
+                "nodeid": report.nodeid,
+                "when": report.when,
+                "outcome": outcome,
+                "duration": round(report.duration, 3),
+                "longrepr": str(report.longrepr) if report.failed else None
+            })
+
+
+class WorkerRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON command per connection and stream JSON lines back"""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = json.loads(line)
+
+        if request.get("command") == "stop":
+            self._send({"event": "stopped"})
+            self.server.stopping = True
+        elif request.get("command") == "run":
+            started = time.perf_counter()
+            exit_code = self.server.run_tests(request.get("args", []), self._send)
+            self._send({
+                "event": "done",
+                "exit_code": exit_code,
+                "duration": round(time.perf_counter() - started, 3)
+            })
+        else:
+            self._send({"event": "error", "message": f"Unknown command: {request.get('command')}"})
+
+    def _send(self, message: Dict[str, Any]):
+        self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+
+class WorkerServer(_ServerBase):
+    """Single-threaded server; pytest sessions must not overlap in one process"""
+
+    def __init__(self, socket_path: str):
+        # Pay for the heavy imports once, before the first request arrives
+        import pytest
+        import requests
+        import jsonschema
+        import allure
+        from api_client.equipment_api import EquipmentAPIClient
+
+        self.pytest = pytest
+        self.session = EquipmentAPIClient().session
+        self.stopping = False
+        super().__init__(socket_path, WorkerRequestHandler)
+
+    def run_tests(self, args: List[str], send) -> int:
+        """
+        Run a pytest session in-process
+        Args:
+            args: Test IDs and pytest options
+            send: Callback streaming a message to the client
+        Returns:
+            pytest exit code
+        """
+        for name in list(sys.modules):
+            if name.split(".")[0] in PROJECT_MODULES:
+                del sys.modules[name]
+
+        plugin = WarmWorkerPlugin(self.session, send)
+        return int(self.pytest.main(["-p", "no:cacheprovider", "--tb=short", *args], plugins=[plugin]))
+
+    def serve_until_stopped(self):
+        while not self.stopping:
+            self.handle_request()
+
+
+def claim_socket(path: str) -> bool:
+    """
+    Remove the socket file left behind by a worker that died
+    Args:
+        path: Socket file path
+    Returns:
+        False if a worker is still listening on the path
+    """
+    if not os.path.exists(path):
+        return True
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.remove(path)
+        return True
+    finally:
+        probe.close()
+    return False
+
+
+def serve() -> int:
+    """
+    Start the worker daemon in the foreground
+    Returns:
+        Process exit code
+    """
+    path = socket_path()
+    if not claim_socket(path):
+        print(f"[ERROR] A worker is already listening on {path}")
+        print("[INFO] Stop it first with: python worker_daemon.py stop")
+        return 2
+
+    print("Warming up worker...")
+    server = WorkerServer(path)
+    print(f"Worker ready on {path}")
+    print("Press Ctrl+C to stop")
+    try:
+        server.serve_until_stopped()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(path)
+        print("\nWorker stopped")
+    return 0
+
+
+def send_command(request: Dict[str, Any]) -> int:
+    """
+    Send a command to the running daemon and print its streamed replies
+    Args:
+        request: Command message
+    Returns:
+        Process exit code
+    """
+    path = socket_path()
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(path)
+    except OSError:
+        print(f"[ERROR] No worker listening on {path}")
+        print("[INFO] Start one with: python worker_daemon.py serve")
+        return 2
+
+    with client, client.makefile("rwb") as stream:
+        stream.write((json.dumps(request) + "\n").encode("utf-8"))
+        stream.flush()
+
+        exit_code = 0
+        for line in stream:
+            message = json.loads(line)
+            if message["event"] == "result":
+                print(f"{message['outcome'].upper():8} {message['nodeid']} ({message['duration']}s)")
+                if message["longrepr"]:
+                    print(message["longrepr"])
+            elif message["event"] == "done":
+                print(f"Finished in {message['duration']}s")
+                exit_code = message["exit_code"]
+            elif message["event"] == "error":
+                print(f"[ERROR] {message['message']}")
+                exit_code = 2
+        return exit_code
+
+
+def main():
+    """Main function - Command line interface"""
+    if len(sys.argv) < 2 or sys.argv[1] not in ("serve", "run", "stop"):
+        print("Usage:")
+        print("  python worker_daemon.py serve                   # Start the warm worker")
+        print("  python worker_daemon.py run <test_id> [...]     # Run tests on the worker")
+        print("  python worker_daemon.py stop                    # Stop the worker")
+        sys.exit(2)
+
+    if not HAS_UNIX_SOCKETS:
+        print("[ERROR] The worker daemon needs Unix domain sockets, which this Python build lacks")
+        sys.exit(2)
+
+    command = sys.argv[1]
+    if command == "serve":
+        sys.exit(serve())
+    elif command == "run":
+        sys.exit(send_command({"command": "run", "args": sys.argv[2:]}))
+    else:
+        sys.exit(send_command({"command": "stop"}))
+
+
+if __name__ == "__main__":
+    main()